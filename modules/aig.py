@@ -0,0 +1,444 @@
+from array import array
+from modules.bool_circ import bool_circ
+from modules.node import node
+
+
+class aig:
+    """
+    An and-inverter graph: a boolean circuit made of two-input and gates and
+    of negated edges, stored in arrays.
+
+    A signal is a literal: the literal 2 * v is the variable v and the
+    literal 2 * v + 1 is its negation. The variable 0 is the constant false,
+    so the literal 0 is false and the literal 1 is true. The other variables
+    are the inputs and the and gates, which are created after their fanins:
+    the variables are in topological order.
+
+    Attributes
+    ----------
+    inputs : int array
+        The variables of the inputs, in order.
+    outputs : int array
+        The literals of the outputs, in order.
+    fanin0 : int array
+        The first fanin literal of each variable, 0 if it is not an and gate.
+    fanin1 : int array
+        The second fanin literal of each variable, 0 if it is not an and
+        gate.
+    table : int * int -> int dict
+        The variable of each and gate from its fanins (structural hashing).
+    """
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, n_inputs=0):
+        """
+        Construct an and-inverter graph without gates nor outputs.
+
+        Parameters
+        ----------
+        n_inputs : int, optional
+            The number of inputs.
+        """
+        self.inputs = array('q')
+        self.outputs = array('q')
+        self.fanin0 = array('q', [0])
+        self.fanin1 = array('q', [0])
+        self.table = {}
+        for _ in range(n_inputs):
+            self.add_input()
+
+    def __len__(self):
+        """
+        Get the number of variables, the constant included.
+        """
+        return len(self.fanin0)
+
+    def n_ands(self):
+        """
+        Get the number of and gates.
+
+        Returns
+        -------
+        int
+            The number of and gates.
+        """
+        return len(self.fanin0) - len(self.inputs) - 1
+
+    @staticmethod
+    def negate(lit):
+        """
+        Negate a literal.
+
+        Parameters
+        ----------
+        lit : int
+            A literal.
+
+        Returns
+        -------
+        int
+            The negation of [lit].
+        """
+        return lit ^ 1
+
+    def is_and(self, var):
+        """
+        Test if a variable is an and gate.
+
+        Parameters
+        ----------
+        var : int
+            A variable.
+
+        Returns
+        -------
+        bool
+            True if [var] is an and gate.
+        """
+        return self.fanin0[var] != self.fanin1[var]
+
+    def _check_literals(self, *lits):
+        """
+        Raise a ValueError if one of [lits] is not a literal of the graph.
+        """
+        for lit in lits:
+            if not (isinstance(lit, int) and 0 <= lit < 2 * len(self.fanin0)):
+                raise ValueError(f"{lit} is not a valid literal.")
+
+    def add_input(self):
+        """
+        Add an input.
+
+        Returns
+        -------
+        int
+            The literal of the new input.
+        """
+        var = len(self.fanin0)
+        self.fanin0.append(0)
+        self.fanin1.append(0)
+        self.inputs.append(var)
+        return 2 * var
+
+    def add_and(self, a, b):
+        """
+        Get the conjunction of two literals. The trivial cases are
+        simplified, and an existing gate is returned if it has the same
+        fanins.
+
+        Parameters
+        ----------
+        a : int
+            A literal.
+        b : int
+            A literal.
+
+        Returns
+        -------
+        int
+            The literal of the conjunction.
+
+        Raises
+        ------
+        ValueError
+            If [a] or [b] is not a valid literal.
+        """
+        self._check_literals(a, b)
+        if a > b:
+            a, b = b, a
+        if a == self.FALSE or a == b ^ 1:
+            return self.FALSE
+        if a == self.TRUE or a == b:
+            return b
+        var = self.table.get((a, b))
+        if var is None:
+            var = len(self.fanin0)
+            self.fanin0.append(a)
+            self.fanin1.append(b)
+            self.table[(a, b)] = var
+        return 2 * var
+
+    def add_or(self, a, b):
+        """
+        Get the disjunction of two literals.
+
+        Parameters
+        ----------
+        a : int
+            A literal.
+        b : int
+            A literal.
+
+        Returns
+        -------
+        int
+            The literal of the disjunction.
+
+        Raises
+        ------
+        ValueError
+            If [a] or [b] is not a valid literal.
+        """
+        return self.add_and(a ^ 1, b ^ 1) ^ 1
+
+    def add_xor(self, a, b):
+        """
+        Get the exclusive disjunction of two literals.
+
+        Parameters
+        ----------
+        a : int
+            A literal.
+        b : int
+            A literal.
+
+        Returns
+        -------
+        int
+            The literal of the exclusive disjunction.
+
+        Raises
+        ------
+        ValueError
+            If [a] or [b] is not a valid literal.
+        """
+        return self.add_or(self.add_and(a, b ^ 1), self.add_and(a ^ 1, b))
+
+    def add_output(self, lit):
+        """
+        Add an output.
+
+        Parameters
+        ----------
+        lit : int
+            The literal of the output.
+
+        Raises
+        ------
+        ValueError
+            If [lit] is not a valid literal.
+        """
+        self._check_literals(lit)
+        self.outputs.append(lit)
+
+    def simulate(self, patterns, width=None):
+        """
+        Simulate the graph on several input vectors at once: the k-th bit of
+        each integer is the value of the signal for the k-th vector.
+
+        Parameters
+        ----------
+        patterns : int list
+            The values of the inputs, one integer per input.
+        width : int, optional
+            The number of vectors. By default, the number of bits of the
+            largest pattern.
+
+        Returns
+        -------
+        int list
+            The values of the outputs, one integer per output.
+
+        Raises
+        ------
+        ValueError
+            If the number of patterns is not the number of inputs.
+        """
+        if len(patterns) != len(self.inputs):
+            raise ValueError(f"{len(patterns)} patterns given for "
+                             f"{len(self.inputs)} inputs.")
+        if width is None:
+            width = max([p.bit_length() for p in patterns] + [1])
+        mask = (1 << width) - 1
+        values = [0] * len(self.fanin0)
+        for var, pattern in zip(self.inputs, patterns):
+            values[var] = pattern & mask
+        fanin0, fanin1 = self.fanin0, self.fanin1
+        for var in range(1, len(fanin0)):
+            a, b = fanin0[var], fanin1[var]
+            if a != b:
+                values[var] = ((values[a >> 1] ^ (mask if a & 1 else 0))
+                               & (values[b >> 1] ^ (mask if b & 1 else 0)))
+        return [values[o >> 1] ^ (mask if o & 1 else 0) for o in self.outputs]
+
+    def evaluate(self, input_bits):
+        """
+        Evaluate the graph on one input vector.
+
+        Parameters
+        ----------
+        input_bits : str
+            The bits of the inputs.
+
+        Returns
+        -------
+        str
+            The bits of the outputs.
+        """
+        return "".join(str(v) for v in self.simulate([int(c) for c in input_bits], 1))
+
+    def levels(self):
+        """
+        Compute the level of each variable: 0 for the inputs and the
+        constant, one more than the highest level of its fanins for an and
+        gate.
+
+        Returns
+        -------
+        int array
+            The level of each variable.
+        """
+        levels = array('q', [0]) * len(self.fanin0)
+        fanin0, fanin1 = self.fanin0, self.fanin1
+        for var in range(1, len(fanin0)):
+            if fanin0[var] != fanin1[var]:
+                levels[var] = 1 + max(levels[fanin0[var] >> 1], levels[fanin1[var] >> 1])
+        return levels
+
+    def depth(self):
+        """
+        Get the highest level of an output.
+
+        Returns
+        -------
+        int
+            The depth of the graph.
+        """
+        levels = self.levels()
+        return max([levels[o >> 1] for o in self.outputs] + [0])
+
+    @classmethod
+    def from_bool_circ(cls, circuit):
+        """
+        Convert a boolean circuit, keeping the order of the inputs and of
+        the outputs. The gates with more than two inputs are decomposed into
+        balanced trees.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A well formed boolean circuit. The labels of the inputs are
+            ignored.
+
+        Returns
+        -------
+        aig
+            The and-inverter graph of the circuit.
+
+        Raises
+        ------
+        ValueError
+            If a node has a label or a number of parents which has no
+            meaning.
+        """
+        g = cls()
+        lits = {id: g.add_input() for id in circuit.get_input_ids()}
+        nodes = circuit.get_id_node_map()
+        ops = {bool_circ.AND: (g.add_and, cls.TRUE),
+               bool_circ.OR: (g.add_or, cls.FALSE),
+               bool_circ.XOR: (g.add_xor, cls.FALSE)}
+
+        for id in circuit.topological_order():
+            if id in lits:
+                continue
+            n = nodes[id]
+            label = n.get_label()
+            fanins = [lits[p] for p, m in n.parents.items() for _ in range(m)]
+            if label in bool_circ.VALUES and len(fanins) == 0:
+                lits[id] = int(label)
+            elif label == bool_circ.COPY and len(fanins) == 1:
+                lits[id] = fanins[0]
+            elif label == bool_circ.NOT and len(fanins) == 1:
+                lits[id] = fanins[0] ^ 1
+            elif label in ops:
+                op, neutral = ops[label]
+                while len(fanins) > 1:
+                    fanins = ([op(fanins[i], fanins[i + 1]) for i in range(0, len(fanins) - 1, 2)]
+                              + fanins[len(fanins) - len(fanins) % 2:])
+                lits[id] = fanins[0] if fanins else neutral
+            else:
+                raise ValueError(f"The node {id} with label '{label}' and "
+                                 f"{len(fanins)} parents cannot be converted.")
+
+        for id in circuit.get_output_ids():
+            g.add_output(lits[id])
+        return g
+
+    def to_bool_circ(self):
+        """
+        Convert the graph into a well formed boolean circuit, keeping the
+        order of the inputs and of the outputs. Only the gates which an
+        output depends on are converted.
+
+        Returns
+        -------
+        bool_circ
+            The boolean circuit.
+        """
+        fanin0, fanin1 = self.fanin0, self.fanin1
+        used = bytearray(len(fanin0))
+        for o in self.outputs:
+            used[o >> 1] = 1
+        for var in range(len(fanin0) - 1, 0, -1):
+            if used[var] and fanin0[var] != fanin1[var]:
+                used[fanin0[var] >> 1] = 1
+                used[fanin1[var] >> 1] = 1
+
+        nodes = []
+        copies = {}
+
+        def new(label):
+            nodes.append(node(len(nodes), label, {}, {}))
+            return len(nodes) - 1
+
+        def link(src, tgt):
+            nodes[src].children[tgt] = nodes[src].children.get(tgt, 0) + 1
+            nodes[tgt].parents[src] = nodes[tgt].parents.get(src, 0) + 1
+
+        def take(id):
+            # A gate has a single child: a copy node is inserted after it
+            # when it gets a second one.
+            if id in copies:
+                return copies[id]
+            children = nodes[id].children
+            if len(children) == 0:
+                return id
+            child = next(iter(children))
+            copy = new(bool_circ.COPY)
+            del children[child]
+            del nodes[child].parents[id]
+            link(id, copy)
+            link(copy, child)
+            copies[id] = copy
+            return copy
+
+        positive, negative = {}, {}
+
+        def signal(lit):
+            var = lit >> 1
+            if var == 0 and var not in positive:
+                positive[var] = new(bool_circ.ZERO)
+            if lit & 1 == 0:
+                return take(positive[var])
+            if var not in negative:
+                negative[var] = new(bool_circ.NOT)
+                link(take(positive[var]), negative[var])
+            return take(negative[var])
+
+        inputs = []
+        for var in self.inputs:
+            inputs.append(new(bool_circ.COPY))
+            positive[var] = new(bool_circ.COPY)
+            copies[positive[var]] = positive[var]
+            link(inputs[-1], positive[var])
+        for var in range(1, len(fanin0)):
+            if used[var] and fanin0[var] != fanin1[var]:
+                positive[var] = new(bool_circ.AND)
+                link(signal(fanin0[var]), positive[var])
+                link(signal(fanin1[var]), positive[var])
+        outputs = []
+        for o in self.outputs:
+            outputs.append(new(bool_circ.COPY))
+            link(signal(o), outputs[-1])
+        return bool_circ(inputs, outputs, nodes, not_cyclic=True)
@@ -0,0 +1,248 @@
+from collections import deque
+from modules.utils import iter_bits
+
+
+class ancestry_index:
+    """
+    An index of the ancestors of each node of a directed acyclic graph.
+
+    The ancestors of a node are stored as a bitset over a topological order
+    of the graph, so that common ancestors are computed with a single
+    intersection instead of two graph traversals.
+
+    Attributes
+    ----------
+    order : int list
+        The IDs of the nodes in topological order. The position of a node in
+        this list is its bit in the bitsets.
+    position : int -> int dict
+        The position of each node in [order].
+    cones : int -> int dict
+        The bitset of each node and all its ancestors.
+    parents : int -> int list
+        The IDs of the parents of each node. The distances to the ancestors
+        of a node are computed from them when the node is queried, so that
+        the index takes a memory linear in the size of the graph, apart from
+        the bitsets.
+    """
+    def __init__(self, graph):
+        """
+        Build the index of a graph. The graph is not modified, and the index
+        is not updated if the graph is later modified.
+
+        Parameters
+        ----------
+        graph : open_digraph
+            A directed acyclic graph.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        self.order = graph.topological_order()
+        self.position = {id: i for i, id in enumerate(self.order)}
+        self.cones = {}
+        self.parents = {}
+
+        for i, id in enumerate(self.order):
+            cone = 1 << i
+            self.parents[id] = graph.get_node_by_id(id).get_parent_ids()
+            for parent in self.parents[id]:
+                cone |= self.cones[parent]
+            self.cones[id] = cone
+
+    def _check_ids(self, *ids):
+        """
+        Raise a ValueError if one of [ids] is not indexed.
+        """
+        for id in ids:
+            if id not in self.position:
+                raise ValueError(f"{id} is not a valid node ID.")
+
+    def _ids(self, bits):
+        """
+        Convert a bitset into the list of the corresponding node IDs.
+        """
+        return [self.order[i] for i in iter_bits(bits)]
+
+    def _distances(self, id, cache=None):
+        """
+        Get the distance from a node to each of its ancestors (and itself)
+        when going up the parents, by a breadth-first search of its cone.
+        The distances are kept in [cache] if it is given.
+        """
+        if cache is not None and id in cache:
+            return cache[id]
+        dist = {id: 0}
+        queue = deque([id])
+        while queue:
+            n = queue.popleft()
+            for parent in self.parents[n]:
+                if parent not in dist:
+                    dist[parent] = dist[n] + 1
+                    queue.append(parent)
+        if cache is not None:
+            cache[id] = dist
+        return dist
+
+    def _strict(self, id):
+        """
+        Get the bitset of the ancestors of a node, the node itself excluded.
+        """
+        return self.cones[id] & ~(1 << self.position[id])
+
+    def _common(self, n0, n1):
+        """
+        Get the bitset of the common ancestors of two nodes, following the
+        convention of [open_digraph.common_ancestry].
+        """
+        if n0 == n1:
+            return self.cones[n0]
+        return self._strict(n0) & self._strict(n1)
+
+    def ancestors(self, id):
+        """
+        Get the ancestors of a node, the node itself excluded.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node.
+
+        Returns
+        -------
+        int list
+            The IDs of the ancestors, in topological order.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID.
+        """
+        self._check_ids(id)
+        return self._ids(self._strict(id))
+
+    def is_ancestor(self, foo, bar):
+        """
+        Test if a node is an ancestor of another node.
+
+        Parameters
+        ----------
+        foo : int
+            The ID of the supposed ancestor.
+        bar : int
+            The ID of the supposed descendant.
+
+        Returns
+        -------
+        bool
+            True if [foo] is an ancestor of [bar], distinct from [bar].
+
+        Raises
+        ------
+        ValueError
+            If [foo] or [bar] is not a valid node ID.
+        """
+        self._check_ids(foo, bar)
+        return foo != bar and (self.cones[bar] >> self.position[foo]) & 1 == 1
+
+    def common_ancestry(self, n0, n1, cache=None):
+        """
+        Compute common ancestry between two nodes. The result is the same as
+        the one of [open_digraph.common_ancestry].
+
+        Parameters
+        ----------
+        n0 : int
+            The ID of the first node.
+        n1 : int
+            The ID of the second node.
+        cache : int -> (int -> int dict) dict, optional
+            The distances to the ancestors of the nodes already queried,
+            completed in place.
+
+        Returns
+        -------
+        int -> int * int
+            Keys representing common ancestry. And values are the respectives
+            distances.
+
+        Raises
+        ------
+        ValueError
+            If [n0] or [n1] is not a valid node ID.
+        """
+        self._check_ids(n0, n1)
+        d0, d1 = self._distances(n0, cache), self._distances(n1, cache)
+        return {n: (d0[n], d1[n]) for n in self._ids(self._common(n0, n1))}
+
+    def nearest_common_ancestors(self, n0, n1, cache=None):
+        """
+        Compute the nearest common ancestors of two nodes, that is the common
+        ancestors which are not an ancestor of another common ancestor.
+
+        Parameters
+        ----------
+        n0 : int
+            The ID of the first node.
+        n1 : int
+            The ID of the second node.
+        cache : int -> (int -> int dict) dict, optional
+            The distances to the ancestors of the nodes already queried,
+            completed in place.
+
+        Returns
+        -------
+        int -> int * int
+            Keys are the nearest common ancestors. And values are the
+            respectives distances.
+
+        Raises
+        ------
+        ValueError
+            If [n0] or [n1] is not a valid node ID.
+        """
+        self._check_ids(n0, n1)
+        common = self._common(n0, n1)
+        above = 0
+        for i in iter_bits(common):
+            above |= self._strict(self.order[i])
+        d0, d1 = self._distances(n0, cache), self._distances(n1, cache)
+        return {n: (d0[n], d1[n]) for n in self._ids(common & ~above)}
+
+    def common_ancestry_batch(self, pairs):
+        """
+        Compute common ancestry for several pairs of nodes, computing the
+        distances of each queried node once.
+
+        Parameters
+        ----------
+        pairs : (int * int) iter
+            The pairs of node IDs.
+
+        Returns
+        -------
+        (int -> int * int) list
+            The common ancestry of each pair, in the same order.
+        """
+        cache = {}
+        return [self.common_ancestry(n0, n1, cache) for n0, n1 in pairs]
+
+    def nearest_common_ancestors_batch(self, pairs):
+        """
+        Compute the nearest common ancestors for several pairs of nodes,
+        computing the distances of each queried node once.
+
+        Parameters
+        ----------
+        pairs : (int * int) iter
+            The pairs of node IDs.
+
+        Returns
+        -------
+        (int -> int * int) list
+            The nearest common ancestors of each pair, in the same order.
+        """
+        cache = {}
+        return [self.nearest_common_ancestors(n0, n1, cache) for n0, n1 in pairs]
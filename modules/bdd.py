@@ -0,0 +1,716 @@
+from modules.aig import aig
+from modules.bool_circ import bool_circ
+
+
+class bdd:
+    """
+    A manager of reduced ordered binary decision diagrams (ROBDD) sharing
+    their nodes.
+
+    A node is an integer. The nodes 0 and 1 are the terminals false and true,
+    any other node u tests the variable var[u] and goes to low[u] if it is
+    false, to high[u] otherwise. The variables are tested in the order of
+    their levels, and no two nodes have the same variable and children (the
+    unique table), so each function has a single node.
+
+    The nodes are reference counted: a node is referenced by its parents
+    and by the calls to [ref]. The nodes without references are freed by
+    [gc] and by the reordering, and their IDs are reused.
+
+    Attributes
+    ----------
+    num_vars : int
+        The number of variables.
+    order : int list
+        The variable at each level.
+    level : int list
+        The level of each variable.
+    var : int list
+        The variable of each node, -1 for the terminals and the free nodes.
+    low : int list
+        The child of each node when its variable is false.
+    high : int list
+        The child of each node when its variable is true.
+    refs : int list
+        The number of references to each node.
+    unique : (int * int -> int dict) list
+        For each variable, the node with given low and high children.
+    cache : list
+        The computed table of [ite], direct-mapped: a new result replaces
+        the one with the same slot.
+    """
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, num_vars=0, order=None, cache_size=1 << 14):
+        """
+        Construct a manager without nodes except the terminals.
+
+        Parameters
+        ----------
+        num_vars : int, optional
+            The number of variables.
+        order : int list, optional
+            The variable at each level. By default, the variable i is at
+            level i.
+        cache_size : int, optional
+            The number of slots of the computed table, a power of 2.
+
+        Raises
+        ------
+        ValueError
+            If [cache_size] is not a power of 2.
+        ValueError
+            If [order] is not a permutation of the variables.
+        """
+        if cache_size <= 0 or cache_size & (cache_size - 1) != 0:
+            raise ValueError(f"cache_size = {cache_size} is not a power of 2.")
+        self.num_vars = 0
+        self.order = []
+        self.level = []
+        self.var = [-1, -1]
+        self.low = [0, 1]
+        self.high = [0, 1]
+        self.refs = [1, 1]
+        self.unique = []
+        self.free = []
+        self.cache = [None] * cache_size
+        for _ in range(num_vars):
+            self.add_var()
+        if order is not None:
+            self.set_order(order)
+
+    def __len__(self):
+        """
+        Get the number of allocated nodes, the terminals excluded.
+        """
+        return len(self.var) - 2 - len(self.free)
+
+    def _check_nodes(self, *us):
+        """
+        Raise a ValueError if one of [us] is not a node of the manager.
+        """
+        for u in us:
+            if not (isinstance(u, int) and 0 <= u < len(self.var)
+                    and (u < 2 or self.var[u] >= 0)):
+                raise ValueError(f"{u} is not a valid node.")
+
+    def _check_vars(self, *vs):
+        """
+        Raise a ValueError if one of [vs] is not a variable of the manager.
+        """
+        for v in vs:
+            if not (isinstance(v, int) and 0 <= v < self.num_vars):
+                raise ValueError(f"{v} is not a valid variable.")
+
+    def _level(self, u):
+        """
+        Get the level of the variable of a node, the terminals being below
+        every variable.
+        """
+        return self.level[self.var[u]] if u > 1 else self.num_vars
+
+    def _make(self, v, lo, hi):
+        """
+        Get the node testing a variable with given children, creating it if
+        it does not exist yet.
+        """
+        if lo == hi:
+            return lo
+        table = self.unique[v]
+        u = table.get((lo, hi))
+        if u is None:
+            if self.free:
+                u = self.free.pop()
+                self.var[u], self.low[u], self.high[u], self.refs[u] = v, lo, hi, 0
+            else:
+                u = len(self.var)
+                self.var.append(v)
+                self.low.append(lo)
+                self.high.append(hi)
+                self.refs.append(0)
+            table[(lo, hi)] = u
+            self.refs[lo] += 1
+            self.refs[hi] += 1
+        return u
+
+    def _release(self, stack):
+        """
+        Free the nodes of [stack] without references, then their children
+        which lose their last reference.
+
+        Returns
+        -------
+        int
+            The number of freed nodes.
+        """
+        freed = 0
+        while stack:
+            u = stack.pop()
+            if u < 2 or self.var[u] < 0 or self.refs[u] != 0:
+                continue
+            lo, hi = self.low[u], self.high[u]
+            del self.unique[self.var[u]][(lo, hi)]
+            self.var[u] = -1
+            self.free.append(u)
+            freed += 1
+            for child in (lo, hi):
+                self.refs[child] -= 1
+                if self.refs[child] == 0:
+                    stack.append(child)
+        return freed
+
+    def _clear_cache(self):
+        """
+        Empty the computed table, whose entries are invalid once nodes are
+        freed or moved.
+        """
+        self.cache = [None] * len(self.cache)
+
+    def add_var(self):
+        """
+        Add a variable below all the others.
+
+        Returns
+        -------
+        int
+            The new variable.
+        """
+        v = self.num_vars
+        self.num_vars += 1
+        self.order.append(v)
+        self.level.append(v)
+        self.unique.append({})
+        return v
+
+    def variable(self, v):
+        """
+        Get the node of the function equal to a variable.
+
+        Parameters
+        ----------
+        v : int
+            A variable.
+
+        Returns
+        -------
+        int
+            The node.
+
+        Raises
+        ------
+        ValueError
+            If [v] is not a valid variable.
+        """
+        self._check_vars(v)
+        return self._make(v, self.FALSE, self.TRUE)
+
+    def ref(self, u):
+        """
+        Add a reference to a node, so that it is not freed.
+
+        Parameters
+        ----------
+        u : int
+            A node.
+
+        Returns
+        -------
+        int
+            The node [u].
+
+        Raises
+        ------
+        ValueError
+            If [u] is not a valid node.
+        """
+        self._check_nodes(u)
+        self.refs[u] += 1
+        return u
+
+    def deref(self, u):
+        """
+        Remove a reference to a node. The node is freed by the next garbage
+        collection if it has no references left.
+
+        Parameters
+        ----------
+        u : int
+            A node.
+
+        Raises
+        ------
+        ValueError
+            If [u] is not a valid node or has no reference.
+        """
+        self._check_nodes(u)
+        if u > 1:
+            if self.refs[u] <= 0:
+                raise ValueError(f"The node {u} has no reference.")
+            self.refs[u] -= 1
+
+    def gc(self):
+        """
+        Free all the nodes without references. The results of the
+        operations which must be kept are to be referenced with [ref]
+        before.
+
+        Returns
+        -------
+        int
+            The number of freed nodes.
+        """
+        freed = self._release([u for u in range(2, len(self.var))
+                               if self.var[u] >= 0 and self.refs[u] == 0])
+        if freed > 0:
+            self._clear_cache()
+        return freed
+
+    def ite(self, f, g, h):
+        """
+        Compute the function "if [f] then [g] else [h]".
+
+        Parameters
+        ----------
+        f : int
+            A node.
+        g : int
+            A node.
+        h : int
+            A node.
+
+        Returns
+        -------
+        int
+            The node of the result.
+
+        Raises
+        ------
+        ValueError
+            If [f], [g] or [h] is not a valid node.
+        """
+        self._check_nodes(f, g, h)
+        return self._ite(f, g, h)
+
+    def _ite(self, f, g, h):
+        """
+        Compute "if [f] then [g] else [h]" without checking the nodes.
+        """
+        if f == self.TRUE:
+            return g
+        if f == self.FALSE or g == h:
+            return h
+        if g == self.TRUE and h == self.FALSE:
+            return f
+        key = (f, g, h)
+        slot = hash(key) & (len(self.cache) - 1)
+        entry = self.cache[slot]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        v = self.order[min(self._level(f), self._level(g), self._level(h))]
+        cofactors = []
+        for u in key:
+            if u > 1 and self.var[u] == v:
+                cofactors.append((self.low[u], self.high[u]))
+            else:
+                cofactors.append((u, u))
+        (f0, f1), (g0, g1), (h0, h1) = cofactors
+        result = self._make(v, self._ite(f0, g0, h0), self._ite(f1, g1, h1))
+        self.cache[slot] = (key, result)
+        return result
+
+    def apply_not(self, f):
+        """
+        Compute the negation of a function.
+        """
+        return self.ite(f, self.FALSE, self.TRUE)
+
+    def apply_and(self, f, g):
+        """
+        Compute the conjunction of two functions.
+        """
+        return self.ite(f, g, self.FALSE)
+
+    def apply_or(self, f, g):
+        """
+        Compute the disjunction of two functions.
+        """
+        return self.ite(f, self.TRUE, g)
+
+    def apply_xor(self, f, g):
+        """
+        Compute the exclusive disjunction of two functions.
+        """
+        return self.ite(f, self.apply_not(g), g)
+
+    def restrict(self, f, v, value):
+        """
+        Compute the function obtained by fixing the value of a variable.
+
+        Parameters
+        ----------
+        f : int
+            A node.
+        v : int
+            A variable.
+        value : bool
+            The value of [v].
+
+        Returns
+        -------
+        int
+            The node of the restricted function.
+
+        Raises
+        ------
+        ValueError
+            If [f] is not a valid node or [v] is not a valid variable.
+        """
+        self._check_nodes(f)
+        self._check_vars(v)
+        memo = {}
+
+        def restrict(u):
+            if self._level(u) > self.level[v]:
+                return u
+            if u not in memo:
+                if self.var[u] == v:
+                    memo[u] = self.high[u] if value else self.low[u]
+                else:
+                    memo[u] = self._make(self.var[u], restrict(self.low[u]),
+                                         restrict(self.high[u]))
+            return memo[u]
+
+        return restrict(f)
+
+    def evaluate(self, f, values):
+        """
+        Evaluate a function.
+
+        Parameters
+        ----------
+        f : int
+            A node.
+        values : bool list or str
+            The value of each variable, as booleans or as a bit string.
+
+        Returns
+        -------
+        bool
+            The value of the function.
+        """
+        self._check_nodes(f)
+        while f > 1:
+            value = values[self.var[f]]
+            f = self.high[f] if value and value != '0' else self.low[f]
+        return f == self.TRUE
+
+    def sat_count(self, f):
+        """
+        Count the assignments of all the variables which satisfy a function.
+
+        Parameters
+        ----------
+        f : int
+            A node.
+
+        Returns
+        -------
+        int
+            The number of satisfying assignments.
+        """
+        self._check_nodes(f)
+        memo = {self.FALSE: 0, self.TRUE: 1}
+
+        def count(u):
+            # Number of satisfying assignments of the variables from the
+            # level of [u].
+            if u not in memo:
+                level = self._level(u)
+                lo, hi = self.low[u], self.high[u]
+                memo[u] = ((count(lo) << (self._level(lo) - level - 1))
+                           + (count(hi) << (self._level(hi) - level - 1)))
+            return memo[u]
+
+        return count(f) << self._level(f)
+
+    def size(self, *fs):
+        """
+        Count the nodes of some functions, the terminals excluded.
+
+        Parameters
+        ----------
+        *fs : int
+            Nodes.
+
+        Returns
+        -------
+        int
+            The number of nodes reachable from [fs].
+        """
+        self._check_nodes(*fs)
+        seen = set()
+        stack = [u for u in fs if u > 1]
+        while stack:
+            u = stack.pop()
+            if u not in seen:
+                seen.add(u)
+                stack.extend(c for c in (self.low[u], self.high[u]) if c > 1)
+        return len(seen)
+
+    def swap(self, l):
+        """
+        Exchange the variables at two adjacent levels, in place: every node
+        keeps its function.
+
+        Parameters
+        ----------
+        l : int
+            The upper level.
+
+        Raises
+        ------
+        ValueError
+            If [l] and [l] + 1 are not valid levels.
+        """
+        if not 0 <= l < self.num_vars - 1:
+            raise ValueError(f"l = {l} is not a valid level to swap.")
+        x, y = self.order[l], self.order[l + 1]
+        moved = []
+        for (f0, f1), u in list(self.unique[x].items()):
+            if self.var[f0] == y or self.var[f1] == y:
+                del self.unique[x][(f0, f1)]
+                moved.append(u)
+        self.order[l], self.order[l + 1] = y, x
+        self.level[x], self.level[y] = l + 1, l
+
+        for u in moved:
+            f0, f1 = self.low[u], self.high[u]
+            f00, f01 = (self.low[f0], self.high[f0]) if self.var[f0] == y else (f0, f0)
+            f10, f11 = (self.low[f1], self.high[f1]) if self.var[f1] == y else (f1, f1)
+            lo, hi = self._make(x, f00, f10), self._make(x, f01, f11)
+            self.refs[lo] += 1
+            self.refs[hi] += 1
+            self.var[u], self.low[u], self.high[u] = y, lo, hi
+            self.unique[y][(lo, hi)] = u
+            for child in (f0, f1):
+                self.refs[child] -= 1
+                if self.refs[child] == 0:
+                    self._release([child])
+        self._clear_cache()
+
+    def set_order(self, order):
+        """
+        Reorder the variables with adjacent swaps.
+
+        Parameters
+        ----------
+        order : int list
+            The variable at each level.
+
+        Raises
+        ------
+        ValueError
+            If [order] is not a permutation of the variables.
+        """
+        if sorted(order) != list(range(self.num_vars)):
+            raise ValueError(f"order = {order} is not a permutation of the variables.")
+        for l, v in enumerate(order):
+            while self.level[v] > l:
+                self.swap(self.level[v] - 1)
+
+    def sift(self, max_growth=1.2):
+        """
+        Reorder the variables with Rudell's sifting: each variable, from the
+        most used one, is moved through all the levels and left where the
+        number of nodes is the smallest. The nodes without references are
+        freed first.
+
+        Parameters
+        ----------
+        max_growth : float, optional
+            A variable stops moving in a direction when the number of nodes
+            exceeds [max_growth] times the number before it moved.
+
+        Returns
+        -------
+        int
+            The number of nodes after the reordering.
+        """
+        self.gc()
+        for v in sorted(range(self.num_vars), key=lambda v: -len(self.unique[v])):
+            best_size, best = len(self), self.level[v]
+            limit = best_size * max_growth
+            for step in (1, -1):
+                while 0 <= self.level[v] + step < self.num_vars:
+                    self.swap(min(self.level[v], self.level[v] + step))
+                    if len(self) < best_size:
+                        best_size, best = len(self), self.level[v]
+                    if len(self) > limit:
+                        break
+            while self.level[v] < best:
+                self.swap(self.level[v])
+            while self.level[v] > best:
+                self.swap(self.level[v] - 1)
+        return len(self)
+
+    @staticmethod
+    def circuit_order(circuit):
+        """
+        Compute a variable order from the topology of a circuit: the inputs
+        are ordered as they are reached by a depth-first search from the
+        outputs, so that the inputs of a same gate are close.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+
+        Returns
+        -------
+        int list
+            The index of the input at each level.
+        """
+        index = {id: k for k, id in enumerate(circuit.get_input_ids())}
+        nodes = circuit.get_id_node_map()
+        order, seen = [], set()
+        for output in circuit.get_output_ids():
+            stack = [output]
+            while stack:
+                id = stack.pop()
+                if id in seen:
+                    continue
+                seen.add(id)
+                if id in index:
+                    order.append(index[id])
+                stack.extend(reversed(nodes[id].get_parent_ids()))
+        return order + [k for k in range(len(index)) if k not in set(order)]
+
+    @classmethod
+    def from_bool_circ(cls, circuit, order=None, reorder=False, cache_size=1 << 14):
+        """
+        Build the BDDs of the outputs of a circuit. The variable k is the
+        k-th input. The BDDs of the nodes are freed once all their children
+        are built.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A well formed boolean circuit. The labels of the inputs are
+            ignored.
+        order : int list, optional
+            The variable at each level, by default [circuit_order].
+        reorder : bool, optional
+            Sift the variables once the BDDs are built.
+        cache_size : int, optional
+            The number of slots of the computed table, a power of 2.
+
+        Returns
+        -------
+        bdd
+            The manager.
+        int list
+            The node of each output, referenced.
+
+        Raises
+        ------
+        ValueError
+            If a node has a label or a number of parents which has no
+            meaning.
+        """
+        inputs = circuit.get_input_ids()
+        m = cls(len(inputs), cls.circuit_order(circuit) if order is None else order,
+                cache_size)
+        nodes = circuit.get_id_node_map()
+        values = {id: m.ref(m.variable(k)) for k, id in enumerate(inputs)}
+        pending = {id: len(n.children) for id, n in nodes.items()}
+        ops = {bool_circ.AND: (m.apply_and, cls.TRUE),
+               bool_circ.OR: (m.apply_or, cls.FALSE),
+               bool_circ.XOR: (m.apply_xor, cls.FALSE)}
+        threshold = 1 << 12
+
+        for id in circuit.topological_order():
+            if id in values:
+                continue
+            n = nodes[id]
+            label = n.get_label()
+            fanins = [values[p] for p, k in n.parents.items() for _ in range(k)]
+            if label in bool_circ.VALUES and len(fanins) == 0:
+                result = int(label)
+            elif label == bool_circ.COPY and len(fanins) == 1:
+                result = fanins[0]
+            elif label == bool_circ.NOT and len(fanins) == 1:
+                result = m.apply_not(fanins[0])
+            elif label in ops:
+                op, result = ops[label]
+                for f in fanins:
+                    result = op(result, f)
+            else:
+                raise ValueError(f"The node {id} with label '{label}' and "
+                                 f"{len(fanins)} parents cannot be converted.")
+            values[id] = m.ref(result)
+            for p in n.parents:
+                pending[p] -= 1
+                if pending[p] == 0:
+                    m.deref(values.pop(p))
+            if len(m) > threshold:
+                m.gc()
+                threshold = max(threshold, 2 * len(m))
+
+        roots = [values[id] for id in circuit.get_output_ids()]
+        if reorder:
+            m.sift()
+        return m, roots
+
+    def to_aig(self, roots):
+        """
+        Convert functions into an and-inverter graph, each node becoming a
+        multiplexer. The input k is the variable k.
+
+        Parameters
+        ----------
+        roots : int list
+            The nodes of the outputs.
+
+        Returns
+        -------
+        aig
+            The and-inverter graph.
+        """
+        self._check_nodes(*roots)
+        g = aig(self.num_vars)
+        lits = {self.FALSE: aig.FALSE, self.TRUE: aig.TRUE}
+        for root in roots:
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if u in lits:
+                    stack.pop()
+                    continue
+                lo, hi = self.low[u], self.high[u]
+                if lo in lits and hi in lits:
+                    x = 2 * g.inputs[self.var[u]]
+                    lits[u] = g.add_or(g.add_and(x, lits[hi]), g.add_and(x ^ 1, lits[lo]))
+                    stack.pop()
+                else:
+                    stack.extend(c for c in (lo, hi) if c not in lits)
+            g.add_output(lits[root])
+        return g
+
+    def to_bool_circ(self, roots):
+        """
+        Convert functions into a boolean circuit made of multiplexers, one
+        per node. The input k is the variable k.
+
+        Parameters
+        ----------
+        roots : int list
+            The nodes of the outputs.
+
+        Returns
+        -------
+        bool_circ
+            The boolean circuit.
+        """
+        return self.to_aig(roots).to_bool_circ()
@@ -1,5 +1,15 @@
-from random import choice
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from heapq import heappop, heappush
+from random import Random, choice
+from threading import Lock
+from .circuit_template import circuit_template
+from .input_binding import input_binding
+from .node import node
 from .open_digraph import open_digraph
+from .rewrite_rule import rewrite_rule, pattern_index
+from .utils import sum_of_products
 
 
 class bool_circ(open_digraph):
@@ -21,7 +31,39 @@ class bool_circ(open_digraph):
 
     ALL_SYMBOLS = VALUES + UNARY + BINARY
 
-    def __init__(self, inputs, outputs, nodes, not_cyclic=False):
+    ASSO_XOR = rewrite_rule('asso_xor', [XOR], [XOR], '_asso_xor',
+                            root_degree=(None, 1))
+    ASSO_COPIE = rewrite_rule('asso_copie', [COPY], [COPY], '_asso_copie',
+                              root_degree=(1, None), neighbour_degree=(1, None))
+    INVO_XOR = rewrite_rule('invo_xor', [COPY], [XOR], '_invo_xor',
+                            root_degree=(1, None), multiplicity=2)
+    EFFACEMENT = rewrite_rule('effacement', [COPY], ALL_SYMBOLS, '_effacement',
+                              direction=-1, root_degree=(1, 0),
+                              neighbour_degree=(None, 1))
+    INVO_NO = rewrite_rule('invo_no', [NOT], [NOT], '_invo_no',
+                           root_degree=(1, 1), neighbour_degree=(1, 1))
+    NO_TRAVERS_XOR = rewrite_rule('no_travers_xor', [NOT], [XOR], '_no_travers_xor',
+                                  root_degree=(1, 1), neighbour_degree=(None, 1))
+    NO_TRAVERS_COPIE = rewrite_rule('no_travers_copie', [NOT], [COPY], '_no_travers_copie',
+                                    root_degree=(1, 1), neighbour_degree=(1, None))
+    CONSTANT = rewrite_rule('constant', VALUES, UNARY + BINARY, '_fold_constant',
+                            root_degree=(0, 1), internal=False)
+    NEUTRAL = rewrite_rule('neutral', BINARY, ALL_SYMBOLS, '_fold_constant',
+                           root_degree=(0, 1), internal=False)
+
+    REWRITE_RULES = [ASSO_COPIE, ASSO_XOR, INVO_XOR, INVO_NO, EFFACEMENT,
+                     NO_TRAVERS_XOR, NO_TRAVERS_COPIE]
+    TRANSFORM_RULES = [CONSTANT, NEUTRAL]
+
+    ADDER_STYLES = ['ripple', 'carry_lookahead', 'kogge_stone', 'brent_kung',
+                    'sklansky']
+    MULTIPLIER_STYLES = ['array', 'wallace', 'dadda']
+
+    # The bindings of the circuits of [add] and [mul] are shared by all the
+    # calls, which rebind them under this lock, see [_binding].
+    _BINDINGS_LOCK = Lock()
+
+    def __init__(self, inputs, outputs, nodes, not_cyclic=False, strash=False):
         """
         Construct a boolean circuit from given nodes. The nodes must
         not form a cycle.
@@ -36,6 +78,8 @@ class bool_circ(open_digraph):
             The nodes of the graph.
         not_cyclic : bool, optional
             If the given graph is not already cyclic.
+        strash : bool, optional
+            Enable the structural hashing mode, see [set_strash].
 
         Raises
         ------
@@ -47,8 +91,13 @@ class bool_circ(open_digraph):
         if not not_cyclic and self.is_cyclic():
             raise ValueError("The boolean circuit is cyclic.")
 
+        self.strash = False
+        self.strash_table = {}
+        if strash:
+            self.set_strash(True)
+
     @classmethod
-    def from_open_digraph(cls, g, not_cyclic=False):
+    def from_open_digraph(cls, g, not_cyclic=False, strash=False):
         """
         Create a boolean circuit from an open directed graph.
 
@@ -58,6 +107,8 @@ class bool_circ(open_digraph):
             A graph.
         not_cyclic : bool, optional
             If the given graph is not already cyclic.
+        strash : bool, optional
+            Enable the structural hashing mode, see [set_strash].
 
         Returns
         -------
@@ -65,7 +116,7 @@ class bool_circ(open_digraph):
             The boolean circuit.
         """
         return cls(g.get_input_ids(), g.get_output_ids(), g.get_nodes(),
-                   not_cyclic)
+                   not_cyclic, strash)
 
     @classmethod
     def empty(cls):
@@ -76,12 +127,202 @@ class bool_circ(open_digraph):
 
     def copy(self):
         """
-        Construct a copy of the current binary circuit.
+        Construct a copy of the current binary circuit. The copy keeps the
+        structural hashing mode.
+        """
+        g = bool_circ.from_open_digraph(super().copy(), not_cyclic=True)
+        g.strash = self.strash
+        g.strash_table = dict(self.strash_table)
+        return g
+
+    def replicate(self, k):
+        """
+        Construct the parallel composition of [k] copies of the circuit, in
+        time linear in its size (see [circuit_template]).
+
+        Parameters
+        ----------
+        k : int
+            The number of copies.
+
+        Returns
+        -------
+        bool_circ
+            The circuit whose inputs and outputs are the ones of each copy
+            in turn.
+
+        Raises
+        ------
+        ValueError
+            If [k] is negative.
+        """
+        return circuit_template(self).replicate(k)
+
+    def _strash_source(self, id):
+        """
+        Get the node whose value is carried by a node, going up the copy
+        nodes.
+        """
+        node = self.get_node_by_id(id)
+        while node.get_label() == self.COPY and node.indegree() == 1:
+            id = node.get_parent_ids()[0]
+            node = self.get_node_by_id(id)
+        return id
+
+    def _strash_key(self, label, parents):
+        """
+        Compute the key of a gate in the structural hashing table. The
+        parents are replaced by their sources and sorted, since the gates
+        are commutative.
+
+        Parameters
+        ----------
+        label : str
+            The label of the gate.
+        parents : int -> int dict
+            The multiplicity of each parent of the gate.
+
+        Returns
+        -------
+        str * int tuple
+            The key of the gate.
+        """
+        sources = []
+        for p, m in parents.items():
+            sources += [self._strash_source(p)] * m
+        return (label, tuple(sorted(sources)))
+
+    def _strash_lookup(self, key):
+        """
+        Get the gate registered under a key, or None if there is none or if
+        the circuit was modified since.
         """
-        return bool_circ.from_open_digraph(super().copy(), not_cyclic=True)
+        id = self.strash_table.get(key)
+        if id is None or id not in self.get_id_node_map():
+            return None
+        node = self.get_node_by_id(id)
+        if node.get_label() != key[0] or self._strash_key(key[0], node.parents) != key:
+            return None
+        return id
+
+    def _fanout(self, id):
+        """
+        Get a node carrying the value of a gate which can take one more
+        child, inserting a copy node after the gate if needed.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the gate.
+
+        Returns
+        -------
+        int
+            The ID of the gate, or of a copy node after it.
+        """
+        node = self.get_node_by_id(id)
+        if node.outdegree() == 0:
+            return id
+        if node.outdegree() == 1:
+            child = node.get_children_ids()[0]
+            if (self.get_node_by_id(child).get_label() == self.COPY
+                    and child not in self.get_output_ids()):
+                return child
+        children = list(node.children.items())
+        for child, _ in children:
+            self.remove_parallel_edges((id, child))
+        copy = super().add_node(self.COPY, [id])
+        for child, m in children:
+            for _ in range(m):
+                self.add_edge(copy, child)
+        return copy
+
+    def add_node(self, label='', parents=[], children=[]):
+        """
+        Add a new node in the circuit, then links it with its parent and its
+        child nodes.
+
+        In structural hashing mode, a not or binary gate given with parents
+        and without children is not created if an identical gate already
+        exists: the existing gate (or a copy node after it) is returned.
+
+        Parameters
+        ----------
+        label : str, optional
+            The label of the new node.
+        parents : int list, optional
+            The list of the IDs of parent nodes.
+        children : int list, optional
+            The list of the IDs of child nodes.
+
+        Returns
+        -------
+        int
+            The ID of the new node, or of the node carrying the value of the
+            identical gate.
+
+        Raises
+        ------
+        ValueError
+            See [open_digraph.add_node].
+        """
+        if (self.strash and len(parents) > 0 and len(children) == 0
+                and (label == self.NOT or label in self.BINARY)):
+            key = self._strash_key(label, dict.fromkeys(parents, 1))
+            id = self._strash_lookup(key)
+            if id is not None:
+                return self._fanout(id)
+            id = super().add_node(label, parents, children)
+            self.strash_table[key] = id
+            return id
+        return super().add_node(label, parents, children)
+
+    def set_strash(self, strash):
+        """
+        Enable or disable the structural hashing mode. When it is enabled,
+        the gates of the circuit are hashed in topological order and the
+        duplicate gates, with the same label and the same parents up to copy
+        nodes and order, are merged.
+
+        Parameters
+        ----------
+        strash : bool
+            True to enable the mode.
+
+        Returns
+        -------
+        int
+            The number of merged gates.
+        """
+        self.strash = strash
+        self.strash_table = {}
+        if not strash:
+            return 0
+
+        nodes = self.get_id_node_map()
+        boundary = set(self.get_input_ids()) | set(self.get_output_ids())
+        merged = 0
+        for id in self.topological_order():
+            node = nodes[id]
+            label = node.get_label()
+            if (id in boundary or node.indegree() == 0
+                    or (label != self.NOT and label not in self.BINARY)):
+                continue
+            key = self._strash_key(label, node.parents)
+            other = self._strash_lookup(key)
+            if other is None:
+                self.strash_table[key] = id
+                continue
+            children = list(node.children.items())
+            self.remove_node_by_id(id)
+            for child, m in children:
+                for _ in range(m):
+                    self.add_edge(self._fanout(other), child)
+            merged += 1
+        return merged
 
     @classmethod
-    def from_formula(cls, *args):
+    def from_formula(cls, *args, strash=False):
         """
         Construct a binary circuit from a propositional formula.
 
@@ -97,6 +338,9 @@ class bool_circ(open_digraph):
         ----------
         *args
             Propositional formulas
+        strash : bool, optional
+            Merge the duplicate gates and keep the circuit in structural
+            hashing mode, see [set_strash].
 
         Returns
         -------
@@ -144,8 +388,10 @@ class bool_circ(open_digraph):
         for s2 in labels:
             for i in range(1, len(labels[s2])):
                 g.merge_nodes_by_id(labels[s2][0], labels[s2][i])
-        for s2 in list(sorted(labels)):
+        for s2 in sorted(labels, key=lambda s2: (len(s2), s2)):
             g.add_input_node(labels[s2][0])
+        if strash:
+            g.set_strash(True)
         return g
 
     def is_well_formed(self):
@@ -181,15 +427,51 @@ class bool_circ(open_digraph):
 
         return super().is_well_formed(lonely_outputs=True)
 
+    @staticmethod
+    def _truth_table_size(bit_string):
+        """
+        Get the number of variables of a truth table.
+
+        Raises
+        ------
+        ValueError
+            If the length of [bit_string] is not a power of 2.
+        ValueError
+            If [bit_string] is not composed of bits.
+        """
+        not_pow2 = f"bit_string = {bit_string} is not a power of 2."
+        if len(bit_string) == 0:
+            raise ValueError("Empty bit_string.")
+        for c in bit_string:
+            if c != '0' and c != '1':
+                raise ValueError(f"bit_string = {bit_string} is not entirely composed of bits.")
+        if bin(len(bit_string))[2] == '0':
+            raise ValueError(not_pow2)
+        for c in bin(len(bit_string))[3:]:
+            if c == '1':
+                raise ValueError(not_pow2)
+        return len(bin(len(bit_string))) - 3
+
     @classmethod
-    def from_binary(cls, bit_string):
+    def from_binary(cls, bit_string, strash=False, minimize=False):
         """
         Construct a boolean circuit from given binary numbers.
 
+        The circuit is the disjunction of one conjunction per 1 in the truth
+        table, or per product of a minimal sum of products if [minimize].
+        The bit at index i is the output for the inputs whose bits, the
+        first input being the most significant, are the binary writing of i.
+
         Parameters
         ----------
         bit_string : string
             A bit string of the truth table output.
+        strash : bool, optional
+            Build the circuit in structural hashing mode, sharing the
+            negated inputs.
+        minimize : bool, optional
+            Build the circuit from the sum of products given by
+            [utils.sum_of_products] instead of the minterms.
 
         Returns
         -------
@@ -203,37 +485,117 @@ class bool_circ(open_digraph):
         ValueError
             If bit_string is not composed of bit.
         """
-        not_pow2 = f"bit_string = {bit_string} is not a power of 2."
-        if len(bit_string) == 0:
-            raise ValueError("Empty bit_string.")
-        for c in bit_string:
-            if c != '0' and c != '1':
-                raise ValueError(f"bit_string = {bit_string} is not entirely composed of bits.")
-        if bin(len(bit_string))[2] == '0':
-            raise ValueError(not_pow2)
-        for c in bin(len(bit_string))[3:]:
-            if c == '1':
-                raise ValueError(not_pow2)
-        g = cls.from_open_digraph(open_digraph.empty())
-        n = len(bin(len(bit_string))) - 3
-        oid = g.add_node('|')
+        n = cls._truth_table_size(bit_string)
+        g = cls.from_open_digraph(open_digraph.empty(), strash=strash)
+        vars = []
+        for i in range(n):
+            pid = g.add_node()
+            g.add_input_node(pid)
+            vars.append(pid)
+        if minimize:
+            cubes = sum_of_products(bit_string)
+        else:
+            cubes = [format(i, f"0{n}b") if n > 0 else ""
+                     for i, k in enumerate(bit_string) if k == '1']
+        minterms = []
+        for cube in cubes:
+            literals = []
+            for j, c in enumerate(cube):
+                if c == '1':
+                    literals.append(vars[j])
+                elif c == '0':
+                    literals.append(g.add_node('~', [vars[j]]))
+            minterms.append(g.add_node('&', literals))
+        oid = g.add_node('|', minterms)
         g.add_output_node(oid)
-        vars = {}
+        return g
+
+    @classmethod
+    def from_binary_mux(cls, bit_string):
+        """
+        Construct a boolean circuit from a truth table by Shannon
+        decomposition: the function is a multiplexer on its first variable
+        between the functions given by the two halves of the table, built
+        recursively.
+
+        Identical sub-tables are built once, and so are complementary ones
+        (through a not gate). A multiplexer between a constant and another
+        function is simplified into an and or an or gate, one between
+        complementary functions into a xor gate, and one between identical
+        functions is skipped. The circuit has O(2^n / n) gates for n
+        variables.
+
+        Parameters
+        ----------
+        bit_string : string
+            A bit string of the truth table output, with the same convention
+            as [from_binary].
+
+        Returns
+        -------
+        bool_circ
+            The boolean circuit representing the bit string.
+
+        Raises
+        ------
+        ValueError
+            If the length of the argument bit_string is not a power of 2.
+        ValueError
+            If bit_string is not composed of bit.
+        """
+        n = cls._truth_table_size(bit_string)
+        g = cls.from_open_digraph(open_digraph.empty())
+        vars = []
         for i in range(n):
             pid = g.add_node()
             g.add_input_node(pid)
-            vars[i] = pid
-        for i, k in enumerate(bit_string):
-            if k == '1':
-                a = g.add_node('&')
-                g.add_edge(a, oid)
-                for j in bin(int(k))[3:]:
-                    if j == '0':
-                        g.add_edge(vars[i % n], a)
-                    else:
-                        id = g.add_node('~')
-                        g.add_edge(vars[i % n], id)
-                        g.add_edge(id, a)
+            vars.append(pid)
+        negations = {}
+        built = {}
+        inverse = str.maketrans('01', '10')
+
+        def signal(id):
+            # A node which can take one more child and carries the value of
+            # [id].
+            return id if g.get_node_by_id(id).get_label() == cls.COPY else g._fanout(id)
+
+        def negation(j):
+            if j not in negations:
+                negations[j] = g.add_node(cls.NOT, [vars[j]])
+            return signal(negations[j])
+
+        def build(table):
+            if table in built:
+                return signal(built[table])
+            complement = table.translate(inverse)
+            if '1' not in table or '0' not in table:
+                id = g.add_node(table[0])
+            elif complement in built:
+                id = g.add_node(cls.NOT, [signal(built[complement])])
+            else:
+                j = n - (len(table).bit_length() - 1)
+                half = len(table) // 2
+                f0, f1 = table[:half], table[half:]
+                if f0 == f1:
+                    return build(f0)
+                x = vars[j]
+                if '1' not in f0:
+                    id = g.add_node(cls.AND, [x, build(f1)]) if '0' in f1 else x
+                elif '0' not in f0:
+                    id = g.add_node(cls.OR, [negation(j), build(f1)])
+                elif '1' not in f1:
+                    id = g.add_node(cls.AND, [negation(j), build(f0)])
+                elif '0' not in f1:
+                    id = g.add_node(cls.OR, [x, build(f0)])
+                elif f0 == f1.translate(inverse):
+                    id = g.add_node(cls.XOR, [x, build(f0)])
+                else:
+                    id = g.add_node(cls.OR, [g.add_node(cls.AND, [x, build(f1)]),
+                                             g.add_node(cls.AND, [negation(j), build(f0)])])
+            built[table] = id
+            return id
+
+        g.add_output_node(build(bit_string))
         return g
 
     @classmethod
@@ -268,15 +630,26 @@ class bool_circ(open_digraph):
         return g
 
     @classmethod
-    def adder(cls, n):
+    def adder(cls, n, style='ripple'):
         """
         Construct an adder circuit for registers of size 2 ** n
 
+        The inputs are the bits of the first register, the bits of the
+        second one (most significant bit first) and the carry in. The
+        outputs are the carry out and the bits of the sum.
+
         Parameters
         ----------
         n: int
             Number of 2 ** n bits for the registers that the adder circuit
             is designed for.
+        style: str, optional
+            The structure of the circuit, one of [ADDER_STYLES]: 'ripple'
+            chains full adders, with a depth linear in the size of the
+            registers; 'carry_lookahead' computes each carry with one
+            two-level formula, with a constant depth but a quadratic size;
+            'kogge_stone', 'brent_kung' and 'sklansky' compute the carries
+            with a parallel prefix network, with a logarithmic depth.
 
         Returns
         -------
@@ -287,68 +660,256 @@ class bool_circ(open_digraph):
         ------
         ValueError
             If [n] is not positive.
+        ValueError
+            If [style] is not an adder style.
         """
         if n < 0:
             raise ValueError(f"n = {n} must be positive.")
-        if n == 0:
-            g = cls.empty()
-            x0 = g.add_node('')
-            x1 = g.add_node('')
-            x2 = g.add_node('')
-            g.add_input_node(x0)
-            g.add_input_node(x1)
-            g.add_input_node(x2)
-            xor1 = g.add_node('^')
-            g.add_edge(x0, xor1)
-            g.add_edge(x1, xor1)
-            copie1 = g.add_node('')
-            g.add_edge(xor1, copie1)
-            and1 = g.add_node('&')
-            and2 = g.add_node('&')
-            xor2 = g.add_node('^')
-            g.add_edge(x0, and1)
-            g.add_edge(x1, and1)
-            g.add_edge(copie1, and2)
-            g.add_edge(x2, and2)
-            g.add_edge(copie1, xor2)
-            g.add_edge(x2, xor2)
-            or1 = g.add_node('|')
-            g.add_edge(and1, or1)
-            g.add_edge(and2, or1)
-            g.add_output_node(or1)
-            g.add_output_node(xor2)
-            return g
+        return cls.adder_of_width(2 ** n, style)
+
+    @classmethod
+    def adder_of_width(cls, width, style='ripple'):
+        """
+        Construct an adder circuit for registers of any size, see [adder].
+
+        Parameters
+        ----------
+        width: int
+            Number of bits of the registers that the adder circuit is
+            designed for.
+        style: str, optional
+            The structure of the circuit, see [adder].
+
+        Returns
+        -------
+        bool_circ
+            An adder circuit.
+
+        Raises
+        ------
+        ValueError
+            If [width] is not strictly positive.
+        ValueError
+            If [style] is not an adder style.
+        """
+        if width < 1:
+            raise ValueError(f"width = {width} must be strictly positive.")
+        if style not in cls.ADDER_STYLES:
+            raise ValueError(f"'{style}' is not an adder style.")
+        if style == 'ripple':
+            return cls._ripple_adder(width)
+        return cls._prefix_adder(width, style)
+
+    @classmethod
+    def _full_adder(cls):
+        """
+        Construct a full adder circuit, with the inputs a, b and the carry
+        in and the outputs the carry out and the sum.
+        """
+        g = cls.empty()
+        x0 = g.add_node('')
+        x1 = g.add_node('')
+        x2 = g.add_node('')
+        g.add_input_node(x0)
+        g.add_input_node(x1)
+        g.add_input_node(x2)
+        xor1 = g.add_node('^')
+        g.add_edge(x0, xor1)
+        g.add_edge(x1, xor1)
+        copie1 = g.add_node('')
+        g.add_edge(xor1, copie1)
+        and1 = g.add_node('&')
+        and2 = g.add_node('&')
+        xor2 = g.add_node('^')
+        g.add_edge(x0, and1)
+        g.add_edge(x1, and1)
+        g.add_edge(copie1, and2)
+        g.add_edge(x2, and2)
+        g.add_edge(copie1, xor2)
+        g.add_edge(x2, xor2)
+        or1 = g.add_node('|')
+        g.add_edge(and1, or1)
+        g.add_edge(and2, or1)
+        g.add_output_node(or1)
+        g.add_output_node(xor2)
+        return g
+
+    @classmethod
+    def _ripple_adder(cls, width):
+        """
+        Construct an adder circuit for registers of size [width] chaining
+        full adders, see [adder]. The full adders are stamped from a
+        template, the carry out of each one being linked to the carry in of
+        the next one.
+        """
+        template = circuit_template(cls._full_adder())
+        g = cls.empty()
+        # The first full adder takes the most significant bits.
+        cells = [template.stamp(g) for _ in range(width)]
+        nodes = g.get_id_node_map()
+        for (inputs, _), (_, outputs) in zip(cells, cells[1:]):
+            nodes[outputs[0]].children[inputs[2]] = 1
+            nodes[inputs[2]].parents[outputs[0]] = 1
+        a = [inputs[0] for inputs, _ in cells]
+        b = [inputs[1] for inputs, _ in cells]
+        g.set_input_ids(a + b + [cells[-1][0][2]])
+        g.set_output_ids([cells[0][1][0]] + [outputs[1] for _, outputs in cells])
+        return g
+
+    @staticmethod
+    def _prefix_network(w, style):
+        """
+        Get the levels of a parallel prefix network on [w] positions. A
+        pair (i, j) of a level combines the value at the position i with the
+        one at the position j < i, both being read before the level.
+
+        Parameters
+        ----------
+        w : int
+            The number of positions.
+        style : str
+            'ripple' (a serial chain), 'kogge_stone', 'brent_kung' or
+            'sklansky'.
+
+        Returns
+        -------
+        (int * int) list list
+            The pairs of each level.
+        """
+        levels = []
+        if style == 'ripple':
+            levels = [[(i, i - 1)] for i in range(1, w)]
+        elif style == 'kogge_stone':
+            d = 1
+            while d < w:
+                levels.append([(i, i - d) for i in range(d, w)])
+                d *= 2
+        elif style == 'sklansky':
+            d = 1
+            while d < w:
+                levels.append([(i, i // (2 * d) * (2 * d) + d - 1)
+                               for i in range(w) if i & d])
+                d *= 2
+        else:
+            d = 1
+            while d < w:
+                levels.append([(i, i - d) for i in range(2 * d - 1, w, 2 * d)])
+                d *= 2
+            # The positions 2 ** k - 1 hold their prefix after the up-sweep.
+            d = 1 << (w.bit_length() - 2) if w > 1 else 0
+            while d >= 1:
+                levels.append([(i, i - d) for i in range(3 * d - 1, w, 2 * d)])
+                d //= 2
+        return [level for level in levels if level]
+
+    def _signal(self, id):
+        """
+        Get a node carrying the value of a node which can take one more
+        child: the node itself if it is a copy node, see [_fanout]
+        otherwise.
+        """
+        return id if self.get_node_by_id(id).get_label() == self.COPY else self._fanout(id)
+
+    def _add_gate(self, label, ids):
+        """
+        Add a gate whose parents are the given nodes, going through a copy
+        node after the ones which are not copy nodes.
+
+        Parameters
+        ----------
+        label : str
+            The label of the gate.
+        ids : int list
+            The IDs of the parents.
+
+        Returns
+        -------
+        int
+            The ID of the gate.
+        """
+        return self.add_node(label, [self._signal(id) for id in ids])
+
+    def _add_signals(self, a, b, c, style):
+        """
+        Add the gates of an adder of two signals of the circuit. The gates
+        computing propagate signals which are not needed are left without
+        children.
+
+        Parameters
+        ----------
+        a : int list
+            The IDs of the nodes carrying the bits of the first signal, least
+            significant bit first.
+        b : int list
+            The IDs of the nodes carrying the bits of the second signal,
+            with the same size as [a].
+        c : int or None
+            The ID of the node carrying the carry in, if any.
+        style : str
+            The structure of the adder, see [adder].
+
+        Returns
+        -------
+        int list
+            The IDs of the bits of the sum, least significant bit first.
+        int
+            The ID of the carry out.
+        """
+        w = len(a)
+        gate = self._add_gate
+        gen = [gate(self.AND, [a[i], b[i]]) for i in range(w)]
+        prop = [gate(self.XOR, [a[i], b[i]]) for i in range(w)]
+        if style == 'carry_lookahead':
+            # The carry out of the bit i is the disjunction, for j from i down
+            # to the carry in, of g_j and the propagate signals above j.
+            carries = [c]
+            for i in range(w):
+                terms = [gen[i]] + [gate(self.AND, prop[j + 1:i + 1] + [gen[j]])
+                                    for j in range(i)]
+                if c is not None:
+                    terms.append(gate(self.AND, prop[:i + 1] + [c]))
+                carries.append(terms[0] if len(terms) == 1 else gate(self.OR, terms))
         else:
-            adder = cls.parallel([cls.adder(n - 1), cls.adder(n - 1)])
-            adder_inputs = adder.get_input_ids()
-            adder_outputs = adder.get_output_ids()
-
-            k = 2 ** (n - 1)
-            adder1_a = adder_inputs[:k]
-            adder1_b = adder_inputs[k:2*k]
-            adder1_c = adder_inputs[2*k]
-            adder1_cprime = adder_outputs[0]
-            adder1_r = adder_outputs[1:k+1]
-
-            adder2_a = adder_inputs[2*k+1:3*k+1]
-            adder2_b = adder_inputs[3*k+1:4*k+1]
-            adder2_c = adder_inputs[4*k+1]
-            adder2_cprime = adder_outputs[k+1]
-            adder2_r = adder_outputs[k+2:]
-
-            a = adder1_a + adder2_a
-            b = adder1_b + adder2_b
-            c = adder2_c
-            cprime = adder1_cprime
-            r = adder1_r + adder2_r
-
-            adder.set_input_ids(a + b + [c])
-            adder.set_output_ids([cprime] + r)
-            adder.add_edge(adder2_cprime, adder1_c)
-            return adder
+            # The carry in is folded in the generate signal of the first bit.
+            G = list(gen)
+            if c is not None:
+                G[0] = gate(self.OR, [gen[0], gate(self.AND, [prop[0], c])])
+            P = list(prop)
+            for level in self._prefix_network(w, style):
+                combined = [(i, gate(self.OR, [G[i], gate(self.AND, [P[i], G[j]])]),
+                             gate(self.AND, [P[i], P[j]])) for i, j in level]
+                for i, Gi, Pi in combined:
+                    G[i], P[i] = Gi, Pi
+            carries = [c] + G
+        sums = [prop[i] if carries[i] is None else gate(self.XOR, [prop[i], carries[i]])
+                for i in range(w)]
+        return sums, carries[w]
+
+    @classmethod
+    def _prefix_adder(cls, w, style):
+        """
+        Construct an adder circuit for registers of size [w] computing the
+        carries from the generate and propagate signals of the bits, see
+        [adder].
+        """
+        g = cls.empty()
+        inputs = []
+        for _ in range(2 * w + 1):
+            x = g.add_node()
+            g.add_input_node(x)
+            inputs.append(x)
+        # Least significant bit first.
+        sums, carry = g._add_signals(inputs[w - 1::-1], inputs[2 * w - 1:w - 1:-1],
+                                     inputs[-1], style)
+        g.add_output_node(carry)
+        for id in reversed(sums):
+            g.add_output_node(id)
+        # The propagate signals of the prefixes which are not needed.
+        g.clean_up()
+        return g
 
     @classmethod
-    def half_adder(cls, n):
+    def half_adder(cls, n, style='ripple'):
         """
         Construct an half-adder circuit for registers of size 2 ** n
 
@@ -357,6 +918,8 @@ class bool_circ(open_digraph):
         n: int
             Number of 2 ** n bits for the registers that the half-adder circuit
             is designed for.
+        style: str, optional
+            The structure of the circuit, see [adder].
 
         Returns
         -------
@@ -367,13 +930,170 @@ class bool_circ(open_digraph):
         ------
         ValueError
             If [n] is not positive.
+        ValueError
+            If [style] is not an adder style.
+        """
+        if n < 0:
+            raise ValueError(f"n = {n} must be positive.")
+        return cls.half_adder_of_width(2 ** n, style)
+
+    @classmethod
+    def half_adder_of_width(cls, width, style='ripple'):
+        """
+        Construct an half-adder circuit for registers of any size, see
+        [half_adder].
+
+        Parameters
+        ----------
+        width: int
+            Number of bits of the registers that the half-adder circuit is
+            designed for.
+        style: str, optional
+            The structure of the circuit, see [adder].
+
+        Returns
+        -------
+        bool_circ
+            An half-adder circuit.
+
+        Raises
+        ------
+        ValueError
+            If [width] is not strictly positive.
+        ValueError
+            If [style] is not an adder style.
         """
-        g = cls.adder(n)
+        g = cls.adder_of_width(width, style)
         inputs = g.get_input_ids()
         g.get_node_by_id(inputs[-1]).set_label('0')
         g.set_input_ids(inputs[:-1])
         return g
 
+    def _full_adder_signals(self, bits):
+        """
+        Add the gates of a full adder, or of a half adder, of signals of
+        the circuit.
+
+        Parameters
+        ----------
+        bits : int list
+            The IDs of the two or three nodes carrying the bits to add.
+
+        Returns
+        -------
+        int
+            The ID of the sum bit.
+        int
+            The ID of the carry bit.
+        """
+        gate = self._add_gate
+        if len(bits) == 2:
+            return gate(self.XOR, bits), gate(self.AND, bits)
+        x, y, z = bits
+        p = gate(self.XOR, [x, y])
+        return (gate(self.XOR, [p, z]),
+                gate(self.OR, [gate(self.AND, [x, y]), gate(self.AND, [p, z])]))
+
+    @classmethod
+    def multiplier(cls, width, style='array'):
+        """
+        Construct a multiplier circuit for registers of size [width].
+
+        The inputs are the bits of the first register and the bits of the
+        second one, most significant bit first. The outputs are the 2 *
+        [width] bits of the product.
+
+        Parameters
+        ----------
+        width: int
+            Number of bits of the registers that the multiplier circuit is
+            designed for.
+        style: str, optional
+            The structure of the circuit, one of [MULTIPLIER_STYLES]:
+            'array' adds the partial products one row after the other with
+            ripple adders, with a depth linear in [width]; 'wallace' and
+            'dadda' reduce the columns of partial products with a tree of
+            full and half adders, as soon as possible for 'wallace' and as
+            late as possible for 'dadda', then add the two rows left with a
+            Kogge-Stone adder, with a logarithmic depth.
+
+        Returns
+        -------
+        bool_circ
+            A multiplier circuit.
+
+        Raises
+        ------
+        ValueError
+            If [width] is not strictly positive.
+        ValueError
+            If [style] is not a multiplier style.
+        """
+        if width < 1:
+            raise ValueError(f"width = {width} must be strictly positive.")
+        if style not in cls.MULTIPLIER_STYLES:
+            raise ValueError(f"'{style}' is not a multiplier style.")
+        g = cls.empty()
+        inputs = []
+        for _ in range(2 * width):
+            x = g.add_node()
+            g.add_input_node(x)
+            inputs.append(x)
+        # Least significant bit first.
+        a, b = inputs[width - 1::-1], inputs[2 * width - 1:width - 1:-1]
+        # The partial products of weight k.
+        columns = [[] for _ in range(2 * width)]
+        for i in range(width):
+            for j in range(width):
+                columns[i + j].append(g._add_gate(cls.AND, [a[i], b[j]]))
+
+        if style == 'array':
+            product = []
+            acc = [columns[k].pop() for k in range(width)]
+            for i in range(1, width):
+                product.append(acc[0])
+                row = [columns[i + j].pop() for j in range(width)]
+                high = acc[1:] + [g.add_node(cls.ZERO)] if i == 1 else acc[1:]
+                acc, carry = g._add_signals(high, row, None, 'ripple')
+                acc.append(carry)
+            product += acc if width > 1 else acc + [g.add_node(cls.ZERO)]
+        else:
+            heights = [2]
+            while heights[-1] < width:
+                heights.append(heights[-1] * 3 // 2)
+            while max(len(column) for column in columns) > 2:
+                target = heights.pop() if style == 'dadda' else 2
+                if style == 'dadda' and target >= max(len(column) for column in columns):
+                    continue
+                reduced = [[] for _ in range(2 * width + 1)]
+                for k, column in enumerate(columns):
+                    column = list(column)
+                    while column:
+                        height = len(column) + len(reduced[k])
+                        if style == 'wallace':
+                            n = min(3, len(column))
+                        elif height > target:
+                            n = 3 if height > target + 1 and len(column) >= 3 else 2
+                        else:
+                            n = 1
+                        if n == 1:
+                            reduced[k] += column
+                            break
+                        bits, column = column[:n], column[n:]
+                        bit, carry = g._full_adder_signals(bits)
+                        reduced[k].append(bit)
+                        reduced[k + 1].append(carry)
+                columns = reduced[:2 * width]
+            rows = [[column[r] if r < len(column) else g.add_node(cls.ZERO)
+                     for column in columns] for r in range(2)]
+            product, _ = g._add_signals(rows[0], rows[1], None, 'kogge_stone')
+        for id in reversed(product):
+            g.add_output_node(id)
+        # The constants, and the carry out and the propagate signals of the
+        # final adders, which are not needed.
+        g.sweep()
+        return g
+
     @classmethod
     def register(cls, n, value):
         """
@@ -446,6 +1166,18 @@ class bool_circ(open_digraph):
         return "".join([self.get_node_by_id(id).get_label()
                         for id in self.get_input_ids()])
 
+    def dependency_matrix(self):
+        """
+        Get which outputs of the boolean circuit depend on which inputs.
+
+        Returns
+        -------
+        list list int
+            The matrix M where M[i][j] is 1 if the j-th output depends on the
+            i-th input, 0 otherwise.
+        """
+        return self.build_reachability_index().dependency_matrix()
+
     def _trans_copy_one(self, id):
         """
         Transform a node according the COPY rule.
@@ -468,9 +1200,10 @@ class bool_circ(open_digraph):
                     if child.outdegree() <= 1:
                         child.set_label(label)
                     else:
-                        for grandchild_id in child.get_children_ids():
-                            new_id = self.add_node(label=label)
-                            self.add_edge(new_id, grandchild_id)
+                        for grandchild_id, m in child.children.items():
+                            for _ in range(m):
+                                new_id = self.add_node(label=label)
+                                self.add_edge(new_id, grandchild_id)
                         self.remove_node_by_id(child.get_id())
                     self.remove_node_by_id(id)
 
@@ -705,12 +1438,122 @@ class bool_circ(open_digraph):
 
     def clean_up(self):
         """
-        Remove all extinct nodes.
+        Remove all extinct nodes, and the nodes which become extinct, in
+        linear time. As in [sweep], the inputs which are not constants are
+        kept, with a copy node without children if they are not used
+        anymore, so that the circuit keeps its inputs.
+        """
+        nodes = self.get_id_node_map()
+        outputs = set(self.get_output_ids())
+        inputs = {id for id in self.inputs if nodes[id].get_label() not in self.VALUES}
+        extinct = [id for id in self.get_extinct_nodes() if id not in inputs]
+        removed = set()
+        while extinct:
+            id = extinct.pop()
+            removed.add(id)
+            for parent in nodes[id].parents:
+                pnode = nodes[parent]
+                del pnode.children[id]
+                if len(pnode.children) == 0 and parent not in outputs and parent not in inputs:
+                    extinct.append(parent)
+            del nodes[id]
+        if removed:
+            self.inputs[:] = [id for id in self.inputs if id not in removed]
+        for id in inputs:
+            if len(nodes[id].children) == 0:
+                super().add_node(self.COPY, [id])
+
+    def sweep(self):
+        """
+        Propagate the constants and remove the dead logic in time linear in
+        the size of the circuit.
+
+        The nodes are first visited once in topological order. A node
+        without parents labelled 0 or 1 (such as an input whose bit is set)
+        is a constant, and the constants are folded through the copy, not,
+        and, or and xor nodes. An output whose value is known is labelled
+        with it. Then the nodes from which no output can be reached are
+        removed, going up from the outputs. The inputs which are not
+        constants are kept, with a copy node without children if they are
+        not used anymore.
+
+        Returns
+        -------
+        int
+            The number of removed nodes.
         """
-        extinct = self.get_extinct_nodes()
-        while len(extinct) > 0:
-            self.remove_nodes_by_id(extinct)
-            extinct = self.get_extinct_nodes()
+        nodes = self.get_id_node_map()
+        size = len(nodes)
+        outputs = set(self.get_output_ids())
+        neutral = {self.AND: 1, self.OR: 0, self.XOR: 0}
+        values = {}
+
+        for id in self.topological_order():
+            node = nodes[id]
+            label = node.get_label()
+            parents = node.parents
+            if id in outputs:
+                if len(parents) == 1:
+                    parent = next(iter(parents))
+                    if values.get(parent) is not None:
+                        node.set_label(str(values[parent]))
+                        del nodes[parent].children[id]
+                        node.parents = {}
+                continue
+            if label in self.VALUES and len(parents) == 0:
+                values[id] = int(label)
+            elif label == self.COPY and len(parents) == 1:
+                values[id] = values.get(next(iter(parents)))
+            elif label == self.NOT and len(parents) == 1:
+                value = values.get(next(iter(parents)))
+                values[id] = None if value is None else 1 - value
+            elif label in self.BINARY:
+                constants = [p for p in parents if values.get(p) is not None]
+                if label == self.XOR:
+                    parity = sum(values[p] * parents[p] for p in constants) % 2
+                elif any(values[p] != neutral[label] for p in constants):
+                    values[id] = 1 - neutral[label]
+                    continue
+                else:
+                    parity = 0
+                if len(constants) == len(parents):
+                    values[id] = parity ^ neutral[label]
+                    continue
+                for p in constants:
+                    del nodes[p].children[id]
+                    del parents[p]
+                if node.indegree() == 1:
+                    node.set_label(self.NOT if parity else self.COPY)
+                elif parity and node.outdegree() > 0:
+                    children = node.children
+                    node.children = {}
+                    no = super().add_node(self.NOT, [id])
+                    nodes[no].children = children
+                    for child in children:
+                        cnode = nodes[child]
+                        cnode.parents[no] = cnode.parents.pop(id)
+
+        live = set(outputs)
+        work = list(outputs)
+        while work:
+            for parent in nodes[work.pop()].parents:
+                if parent not in live:
+                    live.add(parent)
+                    work.append(parent)
+        kept = [id for id in self.get_input_ids()
+                if id in live or nodes[id].get_label() not in self.VALUES]
+        live.update(kept)
+
+        for id in [id for id in nodes if id not in live]:
+            for parent in nodes[id].parents:
+                if parent in live:
+                    del nodes[parent].children[id]
+            del nodes[id]
+        self.inputs[:] = kept
+        for id in kept:
+            if len(nodes[id].children) == 0:
+                super().add_node(self.COPY, [id])
+        return size - len(nodes)
 
     def transform(self, ids):
         """
@@ -774,55 +1617,349 @@ class bool_circ(open_digraph):
             Calculated result of the boolean circuit.
         """
         g = self.copy()
-        g.transform_full()
+        g.sweep()
 
         return "".join([g.get_node_by_id(out_id).get_label()
                         for out_id in g.get_output_ids()])
 
-    @classmethod
-    def add(cls, a, b):
+    def simulate(self, patterns, width):
         """
-        Add two positive integers together using an adder circuit.
-        
+        Evaluate the circuit on several input vectors at once: the k-th bit
+        of each integer is the value of the signal for the k-th vector. The
+        labels of the inputs are ignored.
+
         Parameters
         ----------
-        a: int
-            A positive integer
-        b: int
-            A positive integer
+        patterns : int list
+            The values of the inputs, one integer per input.
+        width : int
+            The number of vectors.
 
         Returns
         -------
-        sum: int
-            The calculated sum of a and b, modulo the size of the sum register
-        carry: bool
-            True if the sum register is overflowed, False otherwise.
-        final_bits: int
-            Size of sum register
+        int list
+            The values of the outputs, one integer per output.
+
+        Raises
+        ------
+        ValueError
+            If the number of patterns is not the number of inputs.
+        ValueError
+            If a node has a label or a number of parents which has no
+            meaning.
+        """
+        inputs = self.get_input_ids()
+        if len(patterns) != len(inputs):
+            raise ValueError(f"{len(patterns)} patterns given for "
+                             f"{len(inputs)} inputs.")
+        mask = (1 << width) - 1
+        words = {id: p & mask for id, p in zip(inputs, patterns)}
+        self._simulate_words(words, self.topological_order(), mask)
+        return [words[id] for id in self.get_output_ids()]
+
+    def _simulate_words(self, words, order, mask):
+        """
+        Compute the values of nodes from the values of their parents, see
+        [simulate].
+
+        Parameters
+        ----------
+        words : int -> int dict
+            The values of the nodes, completed in place.
+        order : int list
+            The IDs of the nodes to compute, in topological order. The
+            nodes which already have a value are skipped.
+        mask : int
+            The value of a signal which is true for every vector.
+
+        Raises
+        ------
+        ValueError
+            If a node has a label or a number of parents which has no
+            meaning.
+        """
+        for id in order:
+            if id in words:
+                continue
+            n = self.nodes[id]
+            label = n.get_label()
+            fanins = [words[p] for p, k in n.parents.items() for _ in range(k)]
+            if label in self.VALUES and len(fanins) == 0:
+                words[id] = mask if label == self.ONE else 0
+            elif label == self.COPY and len(fanins) == 1:
+                words[id] = fanins[0]
+            elif label == self.NOT and len(fanins) == 1:
+                words[id] = fanins[0] ^ mask
+            elif label == self.AND:
+                words[id] = mask
+                for w in fanins:
+                    words[id] &= w
+            elif label == self.OR:
+                words[id] = 0
+                for w in fanins:
+                    words[id] |= w
+            elif label == self.XOR:
+                words[id] = 0
+                for w in fanins:
+                    words[id] ^= w
+            else:
+                raise ValueError(f"The node {id} with label '{label}' and "
+                                 f"{len(fanins)} parents cannot be simulated.")
+
+    def bind(self, bits="", start=0):
+        """
+        Bind constant values to consecutive inputs of the circuit, without
+        modifying or copying it, see [input_binding].
+
+        Parameters
+        ----------
+        bits : str or int list, optional
+            The values, as '0' and '1' or as integers.
+        start : int, optional
+            The index of the first input to bind.
+
+        Returns
+        -------
+        input_binding
+            The binding of the circuit.
+
+        Raises
+        ------
+        ValueError
+            See [input_binding.bind].
+        """
+        return input_binding(self).bind(bits, start)
+
+    def signature(self, k=64, seed=0):
+        """
+        Compute a fingerprint of the function of the circuit by simulating
+        it on [k] pseudorandom input vectors drawn from [seed]. Equivalent
+        circuits have the same signature, so different signatures prove
+        that circuits are not equivalent; equal signatures only make it
+        likely. The signature does not depend on the Python process.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of input vectors.
+        seed : int, optional
+            The seed of the input vectors.
+
+        Returns
+        -------
+        int
+            A 64 bits signature.
+        """
+        rng = Random(seed)
+        n = len(self.get_input_ids())
+        words = self.simulate([rng.getrandbits(k) for _ in range(n)], k)
+        h = blake2b(digest_size=8)
+        h.update(f"{n} {k} {seed}".encode())
+        for w in words:
+            h.update(w.to_bytes((k + 7) // 8, 'big'))
+        return int.from_bytes(h.digest(), 'big')
+
+    def miter(self, other):
+        """
+        Build the miter of two circuits: the k-th input feeds the k-th input
+        of both circuits, their k-th outputs are compared with a xor gate,
+        and the single output is the disjunction of the comparisons. The
+        circuits are equivalent if and only if the miter is always 0.
+
+        Parameters
+        ----------
+        other : bool_circ
+            A boolean circuit with as many inputs and outputs.
+
+        Returns
+        -------
+        bool_circ
+            The miter.
+
+        Raises
+        ------
+        ValueError
+            If the circuits do not have the same number of inputs or of
+            outputs.
+        """
+        n, m = len(self.get_input_ids()), len(self.get_output_ids())
+        if n != len(other.get_input_ids()) or m != len(other.get_output_ids()):
+            raise ValueError("The circuits do not have the same number of "
+                             "inputs and outputs.")
+        g = self.copy()
+        g.set_strash(False)
+        g.iparallel([other.copy()])
+
+        inputs = list(g.get_input_ids())
+        for x, y in zip(inputs[:n], inputs[n:]):
+            targets = [(c, k) for i in (x, y)
+                       for c, k in g.get_node_by_id(i).children.items()]
+            g.remove_nodes_by_id([y])
+            g.remove_parallel_edges(*[(x, c) for c, _ in targets])
+            copy = g.add_node(self.COPY, [x])
+            for c, k in targets:
+                for _ in range(k):
+                    g.add_edge(copy, c)
+
+        # Each output node feeds its comparison: as a copy of its parent,
+        # or as a constant if it was folded to its value.
+        outputs = list(g.get_output_ids())
+        g.set_output_ids([])
+        xors = [g.add_node(self.XOR, [x, y])
+                for x, y in zip(outputs[:m], outputs[m:])]
+        g.add_output_node(g.add_node(self.OR, xors))
+        return g
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _binding(cls, construct, bits, style):
+        """
+        Get the binding of the circuit constructed by [construct] for
+        registers of [bits] bits, see [input_binding]. The bindings of the
+        32 last used circuits are cached, so that each circuit is
+        constructed and sorted once and then only rebound to new operands.
+
+        A cached binding is shared: it must be rebound and evaluated while
+        holding [_BINDINGS_LOCK].
+
+        Parameters
+        ----------
+        construct : int * str -> bool_circ
+            A constructor of circuits, such as [half_adder_of_width].
+        bits : int
+            The size of the registers.
+        style : str
+            The structure of the circuit.
+
+        Returns
+        -------
+        input_binding
+            The binding of the circuit, with the values of its previous use.
+        """
+        return input_binding(construct(bits, style))
+
+    @classmethod
+    def add(cls, a, b, style='ripple'):
+        """
+        Add two positive integers together using an adder circuit, on
+        registers with as many bits as the largest integer.
+        
+        Parameters
+        ----------
+        a: int
+            A positive integer
+        b: int
+            A positive integer
+        style: str, optional
+            The structure of the adder circuit, see [adder].
+
+        Returns
+        -------
+        sum: int
+            The calculated sum of a and b, modulo the size of the sum register
+        carry: bool
+            True if the sum register is overflowed, False otherwise.
+        final_bits: int
+            Size of sum register
 
         Raises
         ------
         ValueError
             If a or b are not positive.
+        ValueError
+            If [style] is not an adder style.
         """
         if a < 0 or b < 0:
             raise ValueError(f"a = {a} and b = {b} must be positive.")
-        a_bits = len(bin(a)[2:])
-        b_bits = len(bin(b)[2:])
-        bits = max(a_bits, b_bits)
-        n = len(bin(bits)[2:])
-        r1 = bool_circ.register(2 ** n, a)
-        r2 = bool_circ.register(2 ** n, b)
-        r = bool_circ.parallel([r1, r2])
-        HA = bool_circ.half_adder(n)
-        g = r.compose(HA)
-        res = g.evaluate()
+        bits = max(a.bit_length(), b.bit_length(), 1)
+        binding = cls._binding(cls.half_adder_of_width, bits, style)
+        with cls._BINDINGS_LOCK:
+            res = binding.bind_integer(a, 0, bits).bind_integer(b, bits, bits).evaluate()
 
         sum = int(res[1:], 2)
-        carry = res[0] == 0
-        final_bits = 2 ** n
+        carry = res[0] == '1'
+        final_bits = bits
         return sum, carry, final_bits
 
+    @classmethod
+    def mul(cls, a, b, style='array'):
+        """
+        Multiply two positive integers together using a multiplier circuit,
+        on registers with as many bits as the largest integer.
+
+        Parameters
+        ----------
+        a: int
+            A positive integer
+        b: int
+            A positive integer
+        style: str, optional
+            The structure of the multiplier circuit, see [multiplier].
+
+        Returns
+        -------
+        product: int
+            The calculated product of a and b.
+        final_bits: int
+            Size of product register
+
+        Raises
+        ------
+        ValueError
+            If a or b are not positive.
+        ValueError
+            If [style] is not a multiplier style.
+        """
+        if a < 0 or b < 0:
+            raise ValueError(f"a = {a} and b = {b} must be positive.")
+        bits = max(a.bit_length(), b.bit_length(), 1)
+        binding = cls._binding(cls.multiplier, bits, style)
+        with cls._BINDINGS_LOCK:
+            binding.bind_integer(a, 0, bits).bind_integer(b, bits, bits)
+            return int(binding.evaluate(), 2), 2 * bits
+
+    @classmethod
+    def mul_batch(cls, pairs, style='array'):
+        """
+        Multiply several pairs of positive integers together using a single
+        multiplier circuit, simulated on all the pairs at once (see
+        [simulate]).
+
+        Parameters
+        ----------
+        pairs: (int * int) list
+            The pairs of positive integers.
+        style: str, optional
+            The structure of the multiplier circuit, see [multiplier].
+
+        Returns
+        -------
+        int list
+            The calculated product of each pair.
+
+        Raises
+        ------
+        ValueError
+            If an integer is not positive.
+        ValueError
+            If [style] is not a multiplier style.
+        """
+        if any(a < 0 or b < 0 for a, b in pairs):
+            raise ValueError("The integers must be positive.")
+        if not pairs:
+            return []
+        bits = max(max(a.bit_length(), b.bit_length()) for a, b in pairs) or 1
+        # The pattern of an input bit has the bit of the k-th pair at the
+        # k-th position.
+        patterns = []
+        for index in [0, 1]:
+            for i in range(bits - 1, -1, -1):
+                patterns.append(sum(((pair[index] >> i) & 1) << k
+                                    for k, pair in enumerate(pairs)))
+        words = cls.multiplier(bits, style).simulate(patterns, len(pairs))
+        return [sum(((w >> k) & 1) << (len(words) - 1 - i) for i, w in enumerate(words))
+                for k in range(len(pairs))]
+
     @classmethod
     def encoder(cls):
         """
@@ -946,194 +2083,711 @@ class bool_circ(open_digraph):
         graph.add_output_node(xor3_dec)
         return graph
 
+    def _parity_bits(self, bits, r):
+        """
+        Add the gates computing, for each k < [r], the parity of the bits
+        at the positions with the k-th bit set. The positions are split on
+        their most significant bit, the parities of the two halves being
+        computed recursively and shared by all the parity bits, so that
+        each parity is a balanced xor tree of depth at most [r]. The xor
+        gates which are not needed are left without children.
+
+        Parameters
+        ----------
+        bits : (int or None) list
+            The IDs of the nodes carrying the bit at each position, None for
+            the positions without bit, with 2 ** [r] positions.
+        r : int
+            The number of bits of the positions.
+
+        Returns
+        -------
+        (int or None) list
+            The IDs of the parity bits, None for an empty parity.
+        """
+        def xor(x, y):
+            if x is None or y is None:
+                return y if x is None else x
+            return self._add_gate(self.XOR, [x, y])
+
+        def parities(start, m):
+            # The parities of the m lower bits and the parity of all the
+            # positions from start to start + 2 ** m.
+            if m == 0:
+                return [], bits[start]
+            low, low_total = parities(start, m - 1)
+            high, high_total = parities(start + 2 ** (m - 1), m - 1)
+            return ([xor(x, y) for x, y in zip(low, high)] + [high_total],
+                    xor(low_total, high_total))
+
+        return parities(0, r)[0]
+
+    @classmethod
+    def hamming_encoder(cls, r):
+        """
+        Construct an encoder of the Hamming(2 ** r - 1, 2 ** r - r - 1)
+        code. The positions of the code word are numbered from 1: the
+        parity bits are at the powers of 2, the k-th one being the parity
+        of the positions with the k-th bit set, and the data bits are at
+        the other positions, in order. [hamming_encoder](3) computes the
+        same function as [encoder].
+
+        Parameters
+        ----------
+        r : int
+            The number of parity bits.
+
+        Returns
+        -------
+        bool_circ
+            A circuit with 2 ** r - r - 1 inputs and 2 ** r - 1 outputs.
+
+        Raises
+        ------
+        ValueError
+            If [r] is less than 2.
+        """
+        if r < 2:
+            raise ValueError(f"r = {r} must be at least 2.")
+        g = cls.empty()
+        bits = [None] * 2 ** r
+        for position in range(3, 2 ** r):
+            if position & (position - 1):
+                bits[position] = g.add_node()
+                g.add_input_node(bits[position])
+        parity = g._parity_bits(bits, r)
+        for k in range(r):
+            bits[2 ** k] = g._signal(parity[k])
+        for position in range(1, 2 ** r):
+            g.add_output_node(bits[position])
+        g.clean_up()
+        return g
+
+    @classmethod
+    def hamming_decoder(cls, r):
+        """
+        Construct a decoder of the Hamming(2 ** r - 1, 2 ** r - r - 1)
+        code, see [hamming_encoder], correcting one error. The syndrome is
+        computed with the balanced xor trees of the encoder, and matched
+        against the position of each data bit with a balanced tree of and
+        gates sharing the matches of the halves of the syndrome, so that
+        the depth of the circuit is logarithmic in its number of inputs.
+        [hamming_decoder](3) computes the same function as [decoder].
+
+        Parameters
+        ----------
+        r : int
+            The number of parity bits.
+
+        Returns
+        -------
+        bool_circ
+            A circuit with 2 ** r - 1 inputs and 2 ** r - r - 1 outputs.
+
+        Raises
+        ------
+        ValueError
+            If [r] is less than 2.
+        """
+        if r < 2:
+            raise ValueError(f"r = {r} must be at least 2.")
+        g = cls.empty()
+        bits = [None]
+        for position in range(1, 2 ** r):
+            bits.append(g.add_node())
+            g.add_input_node(bits[-1])
+        syndrome = g._parity_bits(bits, r)
+        literals = {}
+        matches = {}
+
+        def literal(k, value):
+            if value:
+                return syndrome[k]
+            if k not in literals:
+                literals[k] = g._add_gate(cls.NOT, [syndrome[k]])
+            return literals[k]
+
+        def match(low, high, value):
+            # The gate which is true iff the bits of the syndrome from low
+            # to high are the ones of value.
+            key = (low, high, value)
+            if key not in matches:
+                if high - low == 1:
+                    matches[key] = literal(low, value & 1)
+                else:
+                    mid = (low + high) // 2
+                    mask = (1 << (mid - low)) - 1
+                    matches[key] = g._add_gate(cls.AND, [match(low, mid, value & mask),
+                                                         match(mid, high, value >> (mid - low))])
+            return matches[key]
+
+        for position in range(3, 2 ** r):
+            if position & (position - 1):
+                g.add_output_node(g._add_gate(cls.XOR, [bits[position], match(0, r, position)]))
+        g.clean_up()
+        return g
+
+    def build_pattern_index(self):
+        """
+        Build an index of the nodes by label and degree signature, to find
+        the matches of the rewrite rules.
+
+        Returns
+        -------
+        pattern_index
+            The index of the circuit.
+        """
+        return pattern_index(self)
+
+    def _apply_rule(self, rule, nid, boundary=None):
+        """
+        Apply a rule if it matches at a node.
+
+        Parameters
+        ----------
+        rule : rewrite_rule
+            The rule.
+        nid : int
+            The ID of the root.
+        boundary : int set, optional
+            The IDs of the inputs and outputs.
+
+        Returns
+        -------
+        bool
+            True if the rule was applied.
+        """
+        neighbour = rule.match_at(self, nid, boundary)
+        if neighbour is None:
+            return False
+        getattr(self, rule.action)(nid, neighbour)
+        return True
+
+    def _asso_xor(self, nid, cid):
+        """
+        Merge a xor node into its xor child.
+        """
+        for pid, m in self.get_node_by_id(nid).parents.items():
+            for _ in range(m):
+                self.add_edge(pid, cid)
+        self.remove_node_by_id(nid)
+
+    def _asso_copie(self, nid, cid):
+        """
+        Merge a copy node into its copy parent.
+        """
+        for id, m in self.get_node_by_id(cid).children.items():
+            for _ in range(m):
+                self.add_edge(nid, id)
+        self.remove_node_by_id(cid)
+
+    def _invo_xor(self, nid, cid):
+        """
+        Remove the pairs of parallel edges from a copy node to a xor node.
+        """
+        m = self.get_node_by_id(nid).get_child_multiplicity(cid)
+        self.remove_edges(*[(nid, cid)] * (m - m % 2))
+
+    def _effacement(self, nid, pid):
+        """
+        Remove an erased node and its parent, erasing the parents of the
+        parent instead.
+        """
+        for id, m in self.get_node_by_id(pid).parents.items():
+            for _ in range(m):
+                self.add_node('', [id])
+        self.remove_nodes_by_id([nid, pid])
+
+    def _invo_no(self, nid, cid):
+        """
+        Remove two consecutive not nodes.
+        """
+        pid = self.get_node_by_id(nid).get_parent_ids()[0]
+        id = self.get_node_by_id(cid).get_children_ids()[0]
+        self.remove_nodes_by_id([nid, cid])
+        self.add_edge(pid, id)
+
+    def _no_travers_xor(self, nid, cid):
+        """
+        Move a not node from an input to the output of a xor node.
+        """
+        pid = self.get_node_by_id(nid).get_parent_ids()[0]
+        id = self.get_node_by_id(cid).get_children_ids()[0]
+        self.remove_node_by_id(nid)
+        self.add_edge(pid, cid)
+        self.remove_edge(cid, id)
+        self.add_node('~', [cid], [id])
+
+    def _no_travers_copie(self, nid, cid):
+        """
+        Move a not node from the input to the outputs of a copy node.
+        """
+        pid = self.get_node_by_id(nid).get_parent_ids()[0]
+        self.remove_node_by_id(nid)
+        self.add_edge(pid, cid)
+        for id, m in list(self.get_node_by_id(cid).children.items()):
+            self.remove_parallel_edges((cid, id))
+            for _ in range(m):
+                self.add_node('~', [cid], [id])
+
+    def _fold_constant(self, nid, cid):
+        """
+        Apply the transformation rule matching a constant node or a binary
+        gate without parents.
+        """
+        label = self.get_node_by_id(nid).get_label()
+        if label in self.BINARY:
+            self._trans_neutral_one(nid)
+        else:
+            {self.COPY: self._trans_copy_one,
+             self.NOT: self._trans_not_one,
+             self.AND: self._trans_and_one,
+             self.OR: self._trans_or_one,
+             self.XOR: self._trans_xor_one}[self.get_node_by_id(cid).get_label()](nid)
+
     def trans_asso_xor(self, nid):
         """
-        Apply the xor associativity rule on a node.
+        Apply the xor associativity rule on a node: a xor node whose child
+        is a xor node is merged into its child.
 
         Parameters
         ----------
         nid: int
             The node id where the rules is applied.
+
+        Returns
+        -------
+        bool
+            True if the rule was applied.
         """
-        n = self.get_node_by_id(nid)
-
-        if n.get_label() == "^":
-            for cid in n.get_children_ids():
-                child = self.get_node_by_id(cid)
-                
-                if child.get_label() == "^":                
-                    for id in n.get_children_ids():
-                        child.add_parent_id(id)
-                
-                    child.remove_parent_id(nid)
-                    self.remove_node_by_id(nid)
-    
+        return self._apply_rule(self.ASSO_XOR, nid)
+
     def trans_asso_copie(self, nid):
         """
-        Apply the copy associativity rule on a node.
+        Apply the copy associativity rule on a node: a copy node whose child
+        is a copy node takes the children of its child.
 
         Parameters
         ----------
         nid: int
             The node id where the rules is applied.
-        """
-        n = self.get_node_by_id(nid)
-        
-        if n.get_label() == "":
-            for cid in n.get_children_ids():
-                child = self.get_node_by_id(cid)
-
-                if child.get_label() == "":
-                    for id in child.get_children_ids():
-                        self.add_edge(nid, id)
 
-                    n.remove_child_id(cid)
-                    self.remove_node_by_id(cid)
+        Returns
+        -------
+        bool
+            True if the rule was applied.
+        """
+        return self._apply_rule(self.ASSO_COPIE, nid)
 
     def trans_invo_xor(self, nid):
         """
-        Apply the xor involution rule on a node.
+        Apply the xor involution rule on a node: the parallel edges from a
+        copy node to a xor node are removed by pairs.
 
         Parameters
         ----------
         nid: int
             The node id where the rules is applied.
+
+        Returns
+        -------
+        bool
+            True if the rule was applied.
         """
-        n = self.get_node_by_id(nid)
-    
-        if n.get_label() == "^":
-            if len(n.get_children_ids()) %2 == 0:
-                 self.remove_nodes_by_id(n.get_children_ids())
-            
-            else:
-                self.remove_nodes_by_id(n.get_children_ids()[1:])
+        return self._apply_rule(self.INVO_XOR, nid)
 
     def trans_effacement(self, nid):
         """
-        Remove an operator.
+        Remove an operator whose only child is a copy node without children,
+        and erase its parents instead.
 
         Parameters
         ----------
         nid: int
-            The node id where the operation is applied.
-        """
-        OP = ["^", "&", "~", ""]
-        n = self.get_node_by_id(nid)
-        
-        if n.get_label() in OP:
-            for pid in n.get_parents_ids():
-                copie = self.add_nodes()
-                self.add_edge(copie, pid)
-
-            for cid in n.get_parents_ids():
-                copie = self.add_nodes()
-                self.add_edge(copie, cid)
+            The ID of the erasing copy node.
 
-            self.remove_node_by_id(nid)
+        Returns
+        -------
+        bool
+            True if the rule was applied.
+        """
+        return self._apply_rule(self.EFFACEMENT, nid)
 
     def trans_invo_no(self, nid):
         """
-        Apply the no involution rule on a node.
+        Apply the no involution rule on a node: two consecutive not nodes
+        are removed.
 
         Parameters
         ----------
         nid: int
             The node id where the rules is applied.
-        """
-        n = self.get_node_by_id(nid)
-        has_removed = False
-
-        if n.get_label() == "~":
-            for cid in n.get_children_ids():
-                child = self.get_node_by_id(cid)
-        
-                if child.get_label() == "~":
-                    for pid in n.get_children_ids():
-                        self.add_edge(pid, cid)
 
-                    self.remove_node_by_id(cid)
-            
-            if has_removed:
-                self.remove_node_by_id(nid)
+        Returns
+        -------
+        bool
+            True if the rule was applied.
+        """
+        return self._apply_rule(self.INVO_NO, nid)
 
     def trans_no_travers_xor(self, nid):
         """
-        Apply the no operator through an xor node.
+        Apply the no operator through an xor node: a not node on an input
+        of a xor node is moved to its output.
 
         Parameters
         ----------
         nid: int
-            The node id where the transformation is applied.
-        """
-        n = self.get_node_by_id(nid)
-        has_changed = False
-
-        if n.get_label() == "^":
-            for pid in n.get_parent_ids():
-                parent = self.get_node_by_id(pid)
-
-                if parent.get_label() == "~":
-                    for ancestor_pid in parent.get_parent_ids():
-                        self.add_edge(ancestor_pid, nid)
-                    
-                    self.remove_node_by_id(parent)
-                    has_changed = True
-
-            if has_changed:
-                new_node_no = self.add_node("~")
-                child_id = n.get_children_ids()[0]
-                self.add_edge(nid, new_node_no)
-                self.add_edge(new_node_no, child_id)
-                self.remove_edge(child_id, nid)
-    
+            The ID of the not node.
+
+        Returns
+        -------
+        bool
+            True if the rule was applied.
+        """
+        return self._apply_rule(self.NO_TRAVERS_XOR, nid)
+
     def trans_no_travers_copie(self, nid):
         """
-        Apply the no operator through an copy node.
+        Apply the no operator through an copy node: a not node on the input
+        of a copy node is moved to each of its outputs.
 
         Parameters
         ----------
         nid: int
-            The node id where the transformation is applied.
+            The ID of the not node.
+
+        Returns
+        -------
+        bool
+            True if the rule was applied.
         """
-        n = self.get_node_by_id(nid)
+        return self._apply_rule(self.NO_TRAVERS_COPIE, nid)
 
-        if n.get_label() == "":
-            parent = n.get_parent_ids()
-            
-            if parent.get_label() == "~":
-                parent_ancestor = parent.get_parent_ids()
-                self.add_edge(parent_ancestor, nid)
-                self.remove_node_by_id(parent)
+    def _rewrite_fixpoint(self, rules, ids, index=None):
+        """
+        Apply rules from a list of nodes until none of them applies. After
+        each application, only the nodes around the modified ones are
+        examined again. The rules tried at a node are the ones whose root
+        accepts its label and degrees.
+
+        Parameters
+        ----------
+        rules : rewrite_rule list
+            The rules.
+        ids : int iter
+            The IDs of the nodes where the rules are first tried.
+        index : pattern_index, optional
+            An index of the circuit. If given, the signatures of the nodes
+            are read from it, it is updated after each application, and
+            the matches it still finds once the nodes around the modified
+            ones are exhausted are examined again, so that no rule applies
+            anywhere at the end.
 
-                for child in n.get_children_ids:
-                    new_no_node = self.add_node("~")
-                    self.add_edge(nid, new_no_node)
-                    self.add_edge(new_no_node, child)
-                    self.remove_edge(nid, child)
+        Returns
+        -------
+        int
+            The number of applied rules.
+        """
+        dispatch = {}
+        boundary = set(self.get_input_ids()) | set(self.get_output_ids())
+        nodes = self.get_id_node_map()
+        work = list(dict.fromkeys(ids))
+        count = 0
+
+        while work:
+            queued = set(work)
+            while work:
+                id = work.pop()
+                queued.discard(id)
+                if id not in nodes:
+                    continue
+                if index is not None:
+                    key = index.keys[id]
+                else:
+                    n = nodes[id]
+                    key = (n.get_label(), n.indegree(), n.outdegree())
+                if key not in dispatch:
+                    dispatch[key] = [rule for rule in rules if rule.accepts(*key)]
+                for rule in dispatch[key]:
+                    neighbour = rule.match_at(self, id, boundary)
+                    if neighbour is None:
+                        continue
+                    touched = {id, neighbour}
+                    for n in (id, neighbour):
+                        touched.update(nodes[n].parents)
+                        touched.update(nodes[n].children)
+                    first = self.next_id
+                    getattr(self, rule.action)(id, neighbour)
+                    touched.update(range(first, self.next_id))
+                    count += 1
+                    if index is not None:
+                        index.update(touched)
+
+                    for t in touched:
+                        if t in nodes:
+                            for u in [t, *nodes[t].parents, *nodes[t].children]:
+                                if u not in queued:
+                                    queued.add(u)
+                                    work.append(u)
+                    break
+            if index is not None:
+                work = list(dict.fromkeys(id for rule in rules
+                                          for id, _ in index.find_matches(rule)))
+        return count
 
     def rewrite(self, ids):
         """
-        Apply the rewrite rules to a list of nodes.
+        Apply the rewrite rules to a list of nodes, then to the nodes around
+        the modified ones, until no rule applies.
 
         Parameters
         ----------
         ids: list of int
             The nodes ids.
+
+        Returns
+        -------
+        int
+            The number of applied rules.
         """
-        for id in ids:
-            self.trans_asso_copie(id)
-            self.trans_asso_xor(id)
-            self.trans_invo_xor(id)
-            self.trans_invo_no(id)
-            self.trans_effacement(id)
-            self.trans_no_travers_xor(id)
-            self.trans_no_travers_copie(id)
+        count = self._rewrite_fixpoint(self.REWRITE_RULES, ids)
+        self.clean_up()
+        return count
 
+    def split_regions(self, n_regions):
+        """
+        Split the circuit into independent circuits, each made of whole
+        connected components, with about the same number of nodes. The
+        nodes keep their IDs, and the inputs and outputs their order.
+
+        Parameters
+        ----------
+        n_regions : int
+            The maximal number of regions.
+
+        Returns
+        -------
+        bool_circ list
+            The regions, sharing their nodes with the circuit.
+        """
+        _, comp = self.connected_components()
+        sizes = {}
+        for c in comp.values():
+            sizes[c] = sizes.get(c, 0) + 1
+        # The largest components first, each one in the least loaded region.
+        loads = [(0, r) for r in range(max(1, n_regions))]
+        region = {}
+        for c in sorted(sizes, key=lambda c: -sizes[c]):
+            load, r = heappop(loads)
+            region[c] = r
+            heappush(loads, (load + sizes[c], r))
+
+        parts = [([], [], []) for _ in loads]
+        for id in self.get_input_ids():
+            parts[region[comp[id]]][0].append(id)
+        for id in self.get_output_ids():
+            parts[region[comp[id]]][1].append(id)
+        for id, n in self.nodes.items():
+            parts[region[comp[id]]][2].append(n)
+        return [bool_circ(inputs, outputs, nodes, not_cyclic=True)
+                for inputs, outputs, nodes in parts if nodes]
+
+    def _apply_all_rules_parallel(self, workers):
+        """
+        Apply [apply_all_rules] to the regions given by [split_regions] in
+        separate processes, then gather the results. The nodes created by
+        the workers get new IDs of the circuit.
+
+        Returns
+        -------
+        int
+            The number of applied rules.
+        """
+        regions = self.split_regions(workers)
+        if len(regions) <= 1:
+            return self.apply_all_rules()
+        originals = [set(r.get_id_node_map()) for r in regions]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_rewrite_region, regions))
+
+        nodes = {}
+        count = 0
+        for known, (region, applied) in zip(originals, results):
+            count += applied
+            ids = {}
+            for id in region.get_id_node_map():
+                ids[id] = id if id in known else self.new_id()
+            for id, n in region.get_id_node_map().items():
+                n.set_id(ids[id])
+                n.parents = {ids[p]: m for p, m in n.parents.items()}
+                n.children = {ids[c]: m for c, m in n.children.items()}
+                nodes[ids[id]] = n
+        self.nodes = nodes
+        self.inputs[:] = [id for id in self.inputs if id in nodes]
+        self.outputs[:] = [id for id in self.outputs if id in nodes]
+        return count
+
+    def apply_all_rules(self, workers=1):
+        """
+        Apply all rewrite rules and transformation in the graph, until no
+        rule applies.
+
+        Parameters
+        ----------
+        workers : int, optional
+            The number of processes. If more than 1, the connected
+            components are rewritten in parallel, see [split_regions].
+
+        Returns
+        -------
+        int
+            The number of applied rules.
+        """
+        if workers > 1:
+            return self._apply_all_rules_parallel(workers)
+        rules = self.TRANSFORM_RULES + self.REWRITE_RULES
+        index = self.build_pattern_index()
+        ids = [id for rule in rules for id, _ in index.find_matches(rule)]
+        count = self._rewrite_fixpoint(rules, ids, index)
         self.clean_up()
+        return count
 
-    def apply_all_rules(self):
+    def _supergate(self, id, boundary):
         """
-        Apply all rewrite rules and transformation in the graph.
+        Collect the supergate of a gate: the gates with the same label
+        whose only child is in the supergate, through copy nodes with one
+        parent and one child.
+
+        Returns
+        -------
+        int list
+            The IDs of the internal nodes of the supergate, [id] excluded.
+        int list
+            The IDs of the leaves, once per edge into the supergate.
+        """
+        label = self.nodes[id].get_label()
+        internal, leaves = [], []
+        stack = [p for p, m in self.nodes[id].parents.items() for _ in range(m)]
+        while stack:
+            p = stack.pop()
+            n = self.nodes[p]
+            if (p not in boundary and n.outdegree() == 1
+                    and (n.get_label() == label
+                         or (n.get_label() == self.COPY and n.indegree() == 1))):
+                internal.append(p)
+                stack.extend(q for q, m in n.parents.items() for _ in range(m))
+            else:
+                leaves.append(p)
+        return internal, leaves
+
+    def balance(self, max_fanin=2):
         """
-        self.transform_all()
-        self.rewrite(self.get_node_ids())
+        Reduce the depth of the chains of and, or and xor gates. Each
+        maximal supergate (see [_supergate]) is rebuilt as a tree of gates
+        with at most [max_fanin] parents, the earliest leaves being combined
+        first, so that the latest ones are the closest to the root. Repeated
+        leaves are merged (and, or) or cancelled (xor).
+
+        Parameters
+        ----------
+        max_fanin : int, optional
+            The maximal number of parents of the gates of the trees.
+
+        Returns
+        -------
+        int
+            The depth of the circuit before balancing.
+        int
+            The depth of the circuit after balancing.
+
+        Raises
+        ------
+        ValueError
+            If [max_fanin] is less than 2.
+        """
+        if max_fanin < 2:
+            raise ValueError(f"max_fanin = {max_fanin} must be at least 2.")
+        before = self.depth()
+        nodes = self.get_id_node_map()
+        boundary = set(self.get_input_ids()) | set(self.get_output_ids())
+
+        def is_root(id):
+            # A gate is not a root if its value only goes, through copy
+            # nodes, to a gate with the same label.
+            label = nodes[id].get_label()
+            if label not in self.BINARY or id in boundary:
+                return False
+            child = id
+            while nodes[child].outdegree() == 1:
+                child = nodes[child].get_children_ids()[0]
+                c = nodes[child]
+                if child in boundary:
+                    return True
+                if c.get_label() == label:
+                    return False
+                if c.get_label() != self.COPY or c.indegree() != 1:
+                    return True
+            return True
+
+        level = {}
+        counter = 0
+        for id in self.topological_order():
+            if id not in nodes:
+                continue
+            if not is_root(id):
+                level[id] = 1 + max([level[p] for p in nodes[id].parents] + [-1])
+                continue
+            label = nodes[id].get_label()
+            internal, leaves = self._supergate(id, boundary)
+            if label == self.XOR:
+                parity = {}
+                for p in leaves:
+                    parity[p] = parity.get(p, 0) ^ 1
+                signals = [p for p in parity if parity[p]]
+            else:
+                signals = list(dict.fromkeys(leaves))
+
+            removed = set(internal)
+            for p in internal + [id]:
+                for q in nodes[p].parents:
+                    if q not in removed:
+                        del nodes[q].children[p]
+            for p in internal:
+                del nodes[p]
+            nodes[id].parents = {}
+
+            heap = []
+            for p in signals:
+                heappush(heap, (level[p], counter, p))
+                counter += 1
+            while len(heap) > max_fanin:
+                group = [heappop(heap) for _ in range(max_fanin)]
+                new = self.new_id()
+                nodes[new] = node(new, label, {}, {})
+                for _, _, p in group:
+                    nodes[p].add_child_id(new)
+                    nodes[new].add_parent_id(p)
+                level[new] = 1 + group[-1][0]
+                heappush(heap, (level[new], counter, new))
+                counter += 1
+            for _, _, p in heap:
+                nodes[p].add_child_id(id)
+                nodes[id].add_parent_id(p)
+            level[id] = 1 + max([l for l, _, _ in heap] + [-1])
+        return before, self.depth()
+
+
+def _rewrite_region(circuit):
+    """
+    Apply all the rules to a circuit in a worker process.
+
+    Returns
+    -------
+    bool_circ
+        The rewritten circuit.
+    int
+        The number of applied rules.
+    """
+    count = circuit.apply_all_rules()
+    return circuit, count
@@ -0,0 +1,122 @@
+from .node import node
+
+
+class circuit_template:
+    """
+    A graph compiled into arrays indexed by the rank of the IDs of its
+    nodes, which can be stamped into other graphs at an ID offset in a
+    single pass, without copying and shifting the dictionaries of a graph.
+
+    Attributes
+    ----------
+    cls : type
+        The class of the compiled graph.
+    labels : str list
+        The label of each node.
+    parents : (int * int) list list
+        The indices and multiplicities of the parents of each node.
+    children : (int * int) list list
+        The indices and multiplicities of the children of each node.
+    inputs : int list
+        The indices of the input nodes.
+    outputs : int list
+        The indices of the output nodes.
+    """
+    def __init__(self, graph):
+        """
+        Compile a graph into a template. The graph is not modified.
+
+        Parameters
+        ----------
+        graph : open_digraph
+            A graph, usually a boolean circuit.
+        """
+        ids = sorted(graph.get_node_ids())
+        index = {id: i for i, id in enumerate(ids)}
+        nodes = graph.get_id_node_map()
+        self.cls = type(graph)
+        self.labels = [nodes[id].get_label() for id in ids]
+        self.parents = [[(index[p], m) for p, m in nodes[id].parents.items()] for id in ids]
+        self.children = [[(index[c], m) for c, m in nodes[id].children.items()] for id in ids]
+        self.inputs = [index[id] for id in graph.get_input_ids()]
+        self.outputs = [index[id] for id in graph.get_output_ids()]
+
+    def __len__(self):
+        """
+        Get the number of nodes of the template.
+        """
+        return len(self.labels)
+
+    def stamp(self, graph, offset=None):
+        """
+        Add a copy of the template to a graph, the node of index i getting
+        the ID [offset] + i. The inputs and outputs of the graph are not
+        changed: the copy is wired by the caller.
+
+        Parameters
+        ----------
+        graph : open_digraph
+            The graph to add the copy to.
+        offset : int, optional
+            The ID of the first node of the copy, the next ID of the graph
+            by default.
+
+        Returns
+        -------
+        int list
+            The IDs of the input nodes of the copy.
+        int list
+            The IDs of the output nodes of the copy.
+
+        Raises
+        ------
+        ValueError
+            If an ID of the copy is already the ID of a node of the graph.
+        """
+        n = len(self.labels)
+        if offset is None:
+            offset = graph.next_id
+        elif any(offset + i in graph.nodes for i in range(n)):
+            raise ValueError(f"The IDs from {offset} to {offset + n - 1} "
+                             f"are not free.")
+        nodes = graph.nodes
+        for i, (label, parents, children) in enumerate(zip(self.labels, self.parents,
+                                                            self.children)):
+            nodes[offset + i] = node(offset + i, label,
+                                     {offset + p: m for p, m in parents},
+                                     {offset + c: m for c, m in children})
+        graph.next_id = max(graph.next_id, offset + n)
+        return ([offset + i for i in self.inputs],
+                [offset + i for i in self.outputs])
+
+    def replicate(self, k):
+        """
+        Construct the parallel composition of [k] copies of the template.
+
+        Parameters
+        ----------
+        k : int
+            The number of copies.
+
+        Returns
+        -------
+        open_digraph
+            A graph of the class of the compiled graph, whose inputs and
+            outputs are the ones of each copy in turn.
+
+        Raises
+        ------
+        ValueError
+            If [k] is negative.
+        """
+        if k < 0:
+            raise ValueError(f"k = {k} must be positive.")
+        graph = self.cls.empty()
+        inputs, outputs = [], []
+        for _ in range(k):
+            ins, outs = self.stamp(graph)
+            inputs += ins
+            outputs += outs
+        graph.set_input_ids(inputs)
+        graph.set_output_ids(outputs)
+        return graph
@@ -0,0 +1,229 @@
+class dominator_tree:
+    """
+    The dominator tree (or post-dominator tree) of a graph, computed with the
+    iterative algorithm of Cooper, Harvey and Kennedy.
+
+    A node a dominates a node b if every path from an input to b goes through
+    a. A node a post-dominates a node b if every path from b to an output
+    goes through a. The inputs (respectively the outputs) and the nodes
+    without parents (respectively without children) are linked to a virtual
+    root, so that graphs with several inputs and outputs are supported. The
+    virtual root is represented by None.
+
+    Attributes
+    ----------
+    post : bool
+        True for a post-dominator tree.
+    idom : int -> int dict
+        The immediate dominator of each node reachable from the virtual root.
+        Nodes only dominated by the virtual root are associated with None.
+    tree : int -> int list dict
+        The nodes immediately dominated by each node, None being the virtual
+        root.
+    """
+    def __init__(self, graph, post=False):
+        """
+        Build the dominator tree of a graph. The graph is not modified, and the
+        tree is not updated if the graph is later modified.
+
+        Parameters
+        ----------
+        graph : open_digraph
+            A graph.
+        post : bool, optional
+            Build the post-dominator tree instead of the dominator tree.
+        """
+        self.post = post
+        nodes = graph.get_id_node_map()
+        if post:
+            succ = {id: n.parents for id, n in nodes.items()}
+            pred = {id: n.children for id, n in nodes.items()}
+            entries = graph.get_output_ids()
+        else:
+            succ = {id: n.children for id, n in nodes.items()}
+            pred = {id: n.parents for id, n in nodes.items()}
+            entries = graph.get_input_ids()
+        entries = list(dict.fromkeys(list(entries) + [id for id in nodes if len(pred[id]) == 0]))
+
+        # Postorder numbering from the virtual root, which gets the last number.
+        number = {}
+        order = []
+        seen = set()
+        for entry in entries:
+            if entry in seen:
+                continue
+            seen.add(entry)
+            work = [(entry, iter(succ[entry]))]
+            while work:
+                v, children = work[-1]
+                for w in children:
+                    if w not in seen:
+                        seen.add(w)
+                        work.append((w, iter(succ[w])))
+                        break
+                else:
+                    work.pop()
+                    number[v] = len(order)
+                    order.append(v)
+        root = len(order)
+        entry_numbers = set(number[e] for e in entries)
+
+        idom = [None] * root + [root]
+        preds = [[number[p] for p in pred[v] if p in number] for v in order]
+        changed = True
+        while changed:
+            changed = False
+            for b in range(root - 1, -1, -1):
+                candidates = preds[b] + ([root] if b in entry_numbers else [])
+                new_idom = None
+                for p in candidates:
+                    if idom[p] is None:
+                        continue
+                    if new_idom is None:
+                        new_idom = p
+                    else:
+                        f1, f2 = p, new_idom
+                        while f1 != f2:
+                            while f1 < f2:
+                                f1 = idom[f1]
+                            while f2 < f1:
+                                f2 = idom[f2]
+                        new_idom = f1
+                if idom[b] != new_idom:
+                    idom[b] = new_idom
+                    changed = True
+
+        self.idom = {order[b]: (None if idom[b] == root else order[idom[b]])
+                     for b in range(root)}
+
+        # Interval numbering of the tree, to test dominance in constant time.
+        tree = {id: [] for id in self.idom}
+        tree[None] = []
+        for id, d in self.idom.items():
+            tree[d].append(id)
+        self._pre, self._post = {}, {}
+        counter = 0
+        work = [(None, iter(tree[None]))]
+        while work:
+            v, children = work[-1]
+            for w in children:
+                self._pre[w] = counter
+                counter += 1
+                work.append((w, iter(tree[w])))
+                break
+            else:
+                work.pop()
+                self._post[v] = counter
+                counter += 1
+        self.tree = tree
+
+    def _check_ids(self, *ids):
+        """
+        Raise a ValueError if one of [ids] is not in the tree.
+        """
+        for id in ids:
+            if id not in self.idom:
+                raise ValueError(f"{id} is not a valid node ID or cannot be "
+                                 "reached from the virtual root.")
+
+    def immediate_dominator(self, id):
+        """
+        Get the immediate dominator of a node.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node.
+
+        Returns
+        -------
+        int
+            The ID of the immediate dominator, or None if the node is only
+            dominated by the virtual root.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID, or cannot be reached from the
+            virtual root.
+        """
+        self._check_ids(id)
+        return self.idom[id]
+
+    def dominates(self, foo, bar):
+        """
+        Test if a node dominates another node. Every node dominates itself.
+
+        Parameters
+        ----------
+        foo : int
+            The ID of the supposed dominator.
+        bar : int
+            The ID of the supposed dominated node.
+
+        Returns
+        -------
+        bool
+            True if [foo] dominates [bar].
+
+        Raises
+        ------
+        ValueError
+            If [foo] or [bar] is not a valid node ID, or cannot be reached
+            from the virtual root.
+        """
+        self._check_ids(foo, bar)
+        return (self._pre[foo] <= self._pre[bar]
+                and self._post[bar] <= self._post[foo])
+
+    def dominators(self, id):
+        """
+        Get all the dominators of a node, from the node itself to the child
+        of the virtual root.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node.
+
+        Returns
+        -------
+        int list
+            The IDs of the dominators.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID, or cannot be reached from the
+            virtual root.
+        """
+        self._check_ids(id)
+        result = []
+        while id is not None:
+            result.append(id)
+            id = self.idom[id]
+        return result
+
+    def dominated(self, id):
+        """
+        Get the nodes immediately dominated by a node.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node, or None for the virtual root.
+
+        Returns
+        -------
+        int list
+            The IDs of the children of the node in the tree.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID, or cannot be reached from the
+            virtual root.
+        """
+        if id is not None:
+            self._check_ids(id)
+        return list(self.tree[id])
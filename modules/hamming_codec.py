@@ -0,0 +1,250 @@
+from time import perf_counter
+import numpy as np
+from .bool_circ import bool_circ
+
+
+class hamming_codec:
+    """
+    A Hamming(7,4) codec over byte buffers, with the circuits of
+    [bool_circ.encoder] and [bool_circ.decoder].
+
+    Each byte of data is split into two nibbles, most significant first,
+    and each nibble is encoded into one byte holding its codeword in the 7
+    least significant bits. The circuits are simulated once per chunk of
+    the buffer (see [bool_circ.simulate]), in a topological order computed
+    once: the k-th bit of the value of a signal is its value for the k-th
+    nibble of the chunk.
+
+    The decoder corrects one error per codeword. A codeword with two
+    errors also has a nonzero syndrome and is decoded to wrong data, but
+    it cannot be told apart from a codeword with one error: it is counted
+    in [corrected] as well.
+
+    Attributes
+    ----------
+    encoder : bool_circ
+        The Hamming encoder.
+    decoder : bool_circ
+        The Hamming decoder.
+    chunk_size : int
+        The number of bytes of data processed at once.
+    corrected : int
+        The number of codewords with a nonzero syndrome decoded so far,
+        which is the number of corrected errors if there is at most one
+        error per codeword.
+    """
+    def __init__(self, chunk_size=1 << 16):
+        """
+        Construct a codec.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            The number of bytes of data processed at once.
+
+        Raises
+        ------
+        ValueError
+            If [chunk_size] is not strictly positive.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size = {chunk_size} must be strictly positive.")
+        self.encoder = bool_circ.encoder()
+        self.decoder = bool_circ.decoder()
+        self._orders = {id(c): c.topological_order() for c in (self.encoder, self.decoder)}
+        self.chunk_size = chunk_size
+        self.corrected = 0
+
+    @staticmethod
+    def _planes(values, bits):
+        """
+        Transpose an array of values into bit planes: the k-th plane holds
+        the k-th most significant of the [bits] lower bits of each value.
+        """
+        return [int.from_bytes(np.packbits((values >> (bits - 1 - k)) & 1,
+                                           bitorder='little').tobytes(), 'little')
+                for k in range(bits)]
+
+    @staticmethod
+    def _values(planes, n):
+        """
+        Transpose [n] values back from their bit planes, see [_planes].
+        """
+        values = np.zeros(n, np.uint8)
+        for k, plane in enumerate(planes):
+            bits = np.unpackbits(np.frombuffer(plane.to_bytes((n + 7) // 8, 'little'), np.uint8),
+                                 count=n, bitorder='little')
+            values |= bits << (len(planes) - 1 - k)
+        return values
+
+    def _simulate(self, circuit, planes, n):
+        """
+        Simulate the encoder or the decoder on [n] vectors, in its
+        precomputed topological order, see [bool_circ.simulate].
+        """
+        mask = (1 << n) - 1
+        words = {id: p & mask for id, p in zip(circuit.get_input_ids(), planes)}
+        circuit._simulate_words(words, self._orders[id(circuit)], mask)
+        return [words[id] for id in circuit.get_output_ids()]
+
+    def _encode_chunk(self, chunk):
+        data = np.frombuffer(chunk, np.uint8)
+        nibbles = np.empty(2 * len(data), np.uint8)
+        nibbles[0::2] = data >> 4
+        nibbles[1::2] = data & 15
+        words = self._simulate(self.encoder, self._planes(nibbles, 4), len(nibbles))
+        return self._values(words, len(nibbles)).tobytes()
+
+    def _decode_chunk(self, chunk):
+        codes = np.frombuffer(chunk, np.uint8)
+        n = len(codes)
+        planes = self._planes(codes, 7)
+        nibbles = self._values(self._simulate(self.decoder, planes, n), n)
+        # A codeword has a nonzero syndrome iff its parity bits are not the
+        # ones of its data bits.
+        parities = self._simulate(self.encoder, [planes[2], planes[4], planes[5], planes[6]], n)
+        syndrome = ((parities[0] ^ planes[0]) | (parities[1] ^ planes[1])
+                    | (parities[3] ^ planes[3]))
+        self.corrected += bin(syndrome).count('1')
+        return ((nibbles[0::2] << 4) | nibbles[1::2]).tobytes()
+
+    def encode(self, data):
+        """
+        Encode a buffer.
+
+        Parameters
+        ----------
+        data : bytes-like
+            The data.
+
+        Returns
+        -------
+        bytes
+            The codewords, two bytes per byte of data.
+        """
+        return b"".join(self.encode_stream([data]))
+
+    def decode(self, data):
+        """
+        Decode a buffer, correcting one error per codeword.
+
+        Parameters
+        ----------
+        data : bytes-like
+            The codewords, two bytes per byte of data. The most significant
+            bit of each byte is ignored.
+
+        Returns
+        -------
+        bytes
+            The data.
+
+        Raises
+        ------
+        ValueError
+            If the length of [data] is odd.
+        """
+        if len(data) % 2 != 0:
+            raise ValueError(f"The length {len(data)} of the codewords is odd.")
+        return b"".join(self.decode_stream([data]))
+
+    def encode_stream(self, chunks):
+        """
+        Encode a stream of buffers.
+
+        Parameters
+        ----------
+        chunks : bytes-like iter
+            The buffers of data.
+
+        Yields
+        ------
+        bytes
+            The codewords of at most [chunk_size] bytes of data.
+        """
+        for chunk in chunks:
+            view = memoryview(chunk).cast('B')
+            for i in range(0, len(view), self.chunk_size):
+                yield self._encode_chunk(view[i:i + self.chunk_size])
+
+    def decode_stream(self, chunks):
+        """
+        Decode a stream of buffers of codewords, which may be split
+        anywhere. The number of codewords with a nonzero syndrome is added
+        to [corrected].
+
+        Parameters
+        ----------
+        chunks : bytes-like iter
+            The buffers of codewords.
+
+        Yields
+        ------
+        bytes
+            The data of at most [chunk_size] bytes.
+
+        Raises
+        ------
+        ValueError
+            If the total length of the codewords is odd.
+        """
+        size = 2 * self.chunk_size
+        pending = b""
+        for chunk in chunks:
+            view = memoryview(chunk).cast('B')
+            if pending:
+                fill = size - len(pending)
+                pending += view[:fill].tobytes()
+                view = view[fill:]
+                if len(pending) < size:
+                    continue
+                yield self._decode_chunk(pending)
+            n = len(view) - len(view) % size
+            for i in range(0, n, size):
+                yield self._decode_chunk(view[i:i + size])
+            pending = view[n:].tobytes()
+        if len(pending) % 2 != 0:
+            raise ValueError("The total length of the codewords is odd.")
+        if pending:
+            yield self._decode_chunk(pending)
+
+
+def benchmark(size=1 << 20, chunk_size=1 << 16, seed=0):
+    """
+    Measure the throughput of a codec on random data, with one error in
+    every codeword.
+
+    Parameters
+    ----------
+    size : int, optional
+        The number of bytes of data.
+    chunk_size : int, optional
+        The number of bytes of data processed at once.
+    seed : int, optional
+        The seed of the data and of the errors.
+
+    Returns
+    -------
+    float
+        The encoding throughput, in MB of data per second.
+    float
+        The decoding throughput, in MB of data per second.
+    """
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 256, size, np.uint8).tobytes()
+    codec = hamming_codec(chunk_size)
+    start = perf_counter()
+    codes = codec.encode(data)
+    encoding = perf_counter() - start
+    errors = np.uint8(1) << rng.integers(0, 7, len(codes), np.uint8)
+    noisy = (np.frombuffer(codes, np.uint8) ^ errors).tobytes()
+    start = perf_counter()
+    codec.decode(noisy)
+    decoding = perf_counter() - start
+    return size / 1e6 / encoding, size / 1e6 / decoding
+
+
+if __name__ == "__main__":
+    encoding, decoding = benchmark()
+    print(f"encode: {encoding:.2f} MB/s")
+    print(f"decode: {decoding:.2f} MB/s")
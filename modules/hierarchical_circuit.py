@@ -0,0 +1,598 @@
+from collections import Counter
+from .bool_circ import bool_circ
+from .circuit_template import circuit_template
+
+
+class hierarchical_circuit:
+    """
+    A module of a hierarchical boolean circuit: either a leaf, which is a
+    boolean circuit, or a netlist of instances of other modules. A module
+    can be instantiated any number of times, in any number of modules,
+    and is stored once: the memory of a circuit is proportional to the
+    number of its distinct modules and of their instances, not to its
+    number of gates. It is evaluated, measured and counted module by
+    module, with a program compiled once per leaf, and flattened into a
+    boolean circuit of its leaves only on request.
+
+    The signals of a netlist are pairs (j, k): the k-th output of the
+    j-th instance, or the k-th input of the module if j is -1. The
+    instances are kept in the order in which they were added, which is a
+    topological order since an instance can only read the inputs and the
+    outputs of the previous instances.
+
+    A module must not be modified once it is instantiated or evaluated.
+
+    Attributes
+    ----------
+    n_inputs : int
+        The number of inputs.
+    circuit : bool_circ or None
+        The circuit of a leaf, None for a netlist.
+    instances : (hierarchical_circuit * (int * int) list) list
+        The module and the signals read by the inputs of each instance.
+    outputs : (int * int) list
+        The signals of the outputs of a netlist.
+    name : str
+        The name of the module.
+    """
+    def __init__(self, n_inputs, name=""):
+        """
+        Construct an empty netlist, without instances nor outputs.
+
+        Parameters
+        ----------
+        n_inputs : int
+            The number of inputs.
+        name : str, optional
+            The name of the module.
+
+        Raises
+        ------
+        ValueError
+            If [n_inputs] is negative.
+        """
+        if n_inputs < 0:
+            raise ValueError(f"n_inputs = {n_inputs} must be positive.")
+        self.n_inputs = n_inputs
+        self.circuit = None
+        self.instances = []
+        self.outputs = []
+        self.name = name
+        self._clear()
+
+    @classmethod
+    def leaf(cls, circuit, name=""):
+        """
+        Construct a leaf module. The circuit must not be modified
+        afterwards.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+        name : str, optional
+            The name of the module.
+
+        Returns
+        -------
+        hierarchical_circuit
+            The module of the circuit.
+        """
+        m = cls(len(circuit.get_input_ids()), name)
+        m.circuit = circuit
+        return m
+
+    def _clear(self):
+        """
+        Forget what was compiled, analysed and counted.
+        """
+        self._program = None
+        self._counts = None
+        self._analysis = None
+        self._template = None
+
+    @property
+    def n_outputs(self):
+        """
+        Get the number of outputs.
+        """
+        if self.circuit is not None:
+            return len(self.circuit.get_output_ids())
+        return len(self.outputs)
+
+    def input(self, k):
+        """
+        Get the signal of an input of a netlist.
+
+        Parameters
+        ----------
+        k : int
+            The index of the input.
+
+        Returns
+        -------
+        (int * int)
+            The signal.
+
+        Raises
+        ------
+        ValueError
+            If the input does not exist.
+        """
+        if not 0 <= k < self.n_inputs:
+            raise ValueError(f"There is no input {k}.")
+        return (-1, k)
+
+    def _check_signal(self, signal):
+        j, k = signal
+        if j == -1:
+            self.input(k)
+        elif not (0 <= j < len(self.instances)
+                  and 0 <= k < self.instances[j][0].n_outputs):
+            raise ValueError(f"There is no signal {signal}.")
+
+    def instantiate(self, module, sources):
+        """
+        Add an instance of a module to a netlist.
+
+        Parameters
+        ----------
+        module : hierarchical_circuit
+            The module to instantiate.
+        sources : (int * int) list
+            The signals read by the inputs of the instance.
+
+        Returns
+        -------
+        (int * int) list
+            The signals of the outputs of the instance.
+
+        Raises
+        ------
+        ValueError
+            If the module is a leaf.
+        ValueError
+            If the number of signals is not the number of inputs of
+            [module], or if a signal does not exist.
+        """
+        if self.circuit is not None:
+            raise ValueError("A leaf module has no instances.")
+        if len(sources) != module.n_inputs:
+            raise ValueError(f"{len(sources)} signals given for "
+                             f"{module.n_inputs} inputs.")
+        for signal in sources:
+            self._check_signal(signal)
+        self.instances.append((module, list(sources)))
+        self._clear()
+        j = len(self.instances) - 1
+        return [(j, k) for k in range(module.n_outputs)]
+
+    def set_outputs(self, signals):
+        """
+        Set the signals of the outputs of a netlist.
+
+        Parameters
+        ----------
+        signals : (int * int) list
+            The signals.
+
+        Raises
+        ------
+        ValueError
+            If the module is a leaf, or if a signal does not exist.
+        """
+        if self.circuit is not None:
+            raise ValueError("The outputs of a leaf module are the ones of its circuit.")
+        for signal in signals:
+            self._check_signal(signal)
+        self.outputs = list(signals)
+        self._clear()
+
+    def modules(self):
+        """
+        Get the distinct modules of the hierarchy, this one included.
+
+        Returns
+        -------
+        hierarchical_circuit list
+            The modules, each one after the modules it instantiates.
+        """
+        seen = {}
+
+        def visit(m):
+            if id(m) not in seen:
+                for module, _ in m.instances:
+                    visit(module)
+                seen[id(m)] = m
+        visit(self)
+        return list(seen.values())
+
+    def _compile(self):
+        """
+        Compile a leaf into a program over an array of registers, one per
+        node: the registers of the inputs, the instructions (label, target
+        register, source registers) in topological order and the registers
+        of the outputs.
+        """
+        if self._program is None:
+            c = self.circuit
+            order = c.topological_order()
+            index = {id: i for i, id in enumerate(order)}
+            inputs = set(c.get_input_ids())
+            nodes = c.get_id_node_map()
+            self._program = (len(order),
+                             [index[id] for id in c.get_input_ids()],
+                             [(nodes[id].get_label(), index[id],
+                               [index[p] for p, m in nodes[id].parents.items() for _ in range(m)])
+                              for id in order if id not in inputs],
+                             [index[id] for id in c.get_output_ids()])
+        return self._program
+
+    def simulate(self, patterns, width):
+        """
+        Evaluate the module on several input vectors at once, instance by
+        instance, see [bool_circ.simulate].
+
+        Parameters
+        ----------
+        patterns : int list
+            The values of the inputs, one integer per input.
+        width : int
+            The number of vectors.
+
+        Returns
+        -------
+        int list
+            The values of the outputs, one integer per output.
+
+        Raises
+        ------
+        ValueError
+            If the number of patterns is not the number of inputs.
+        ValueError
+            If a node of a leaf has a label or a number of parents which
+            has no meaning.
+        """
+        if len(patterns) != self.n_inputs:
+            raise ValueError(f"{len(patterns)} patterns given for "
+                             f"{self.n_inputs} inputs.")
+        mask = (1 << width) - 1
+        if self.circuit is None:
+            words = [[p & mask for p in patterns]]
+            for module, sources in self.instances:
+                words.append(module.simulate([words[j + 1][k] for j, k in sources], width))
+            return [words[j + 1][k] for j, k in self.outputs]
+        size, inputs, program, outputs = self._compile()
+        regs = [0] * size
+        for i, p in zip(inputs, patterns):
+            regs[i] = p & mask
+        for label, target, sources in program:
+            if label in bool_circ.VALUES and len(sources) == 0:
+                regs[target] = mask if label == bool_circ.ONE else 0
+            elif label == bool_circ.COPY and len(sources) == 1:
+                regs[target] = regs[sources[0]]
+            elif label == bool_circ.NOT and len(sources) == 1:
+                regs[target] = regs[sources[0]] ^ mask
+            elif label == bool_circ.AND:
+                w = mask
+                for s in sources:
+                    w &= regs[s]
+                regs[target] = w
+            elif label == bool_circ.OR:
+                w = 0
+                for s in sources:
+                    w |= regs[s]
+                regs[target] = w
+            elif label == bool_circ.XOR:
+                w = 0
+                for s in sources:
+                    w ^= regs[s]
+                regs[target] = w
+            else:
+                raise ValueError(f"The node with label '{label}' and {len(sources)} "
+                                 f"parents of the module '{self.name}' cannot be simulated.")
+        return [regs[i] for i in outputs]
+
+    def evaluate(self, bits):
+        """
+        Evaluate the module.
+
+        Parameters
+        ----------
+        bits : str
+            The values of the inputs.
+
+        Returns
+        -------
+        str
+            The values of the outputs.
+
+        Raises
+        ------
+        ValueError
+            See [simulate].
+        """
+        return "".join(str(w) for w in self.simulate([int(bit) for bit in bits], 1))
+
+    def _signals(self):
+        """
+        Analyse how the signals of the module are wired in the flattened
+        circuit (see [flatten]), memoized by module: what drives each
+        output, how many input nodes of leaves read each input, and how
+        many read the node of each output.
+
+        Returns
+        -------
+        ((str * int) or None) list
+            The driver of each output: ('in', i) if it is the input i,
+            ('out', k) if it is the same node as the output k < o, and None
+            if it is a node of its own.
+        int list
+            The number of input nodes of leaves which read each input.
+        int list
+            The number of input nodes of leaves which read the node of each
+            output, 0 for the outputs which are not nodes of their own.
+        """
+        if self._analysis is None:
+            if self.circuit is not None:
+                self._analysis = ([None] * self.n_outputs, [1] * self.n_inputs,
+                                  [0] * self.n_outputs)
+            else:
+                uses = [0] * self.n_inputs
+                loads = {}
+                # The signal of each output of each instance, resolved to
+                # an input of the module or to the first output of an
+                # instance driven by the same node.
+                resolved = []
+                for j, (module, sources) in enumerate(self.instances):
+                    origins, module_uses, module_loads = module._signals()
+                    sources = [s if s[0] == -1 else resolved[s[0]][s[1]] for s in sources]
+                    for (i, k), n in zip(sources, module_uses):
+                        if i == -1:
+                            uses[k] += n
+                        else:
+                            loads[(i, k)] += n
+                    row = []
+                    for k, origin in enumerate(origins):
+                        if origin is None:
+                            row.append((j, k))
+                            loads[(j, k)] = module_loads[k]
+                        elif origin[0] == 'in':
+                            row.append(sources[origin[1]])
+                        else:
+                            row.append(row[origin[1]])
+                    resolved.append(row)
+                outputs = [s if s[0] == -1 else resolved[s[0]][s[1]] for s in self.outputs]
+                origins = []
+                for o, (j, k) in enumerate(outputs):
+                    if j == -1:
+                        origins.append(('in', k))
+                    elif (j, k) in outputs[:o]:
+                        origins.append(('out', outputs.index((j, k))))
+                    else:
+                        origins.append(None)
+                self._analysis = (origins, uses,
+                                  [loads[s] if origin is None else 0
+                                   for s, origin in zip(outputs, origins)])
+        return self._analysis
+
+    def _boundary(self):
+        """
+        Get which inputs and outputs of the module need nodes of their own
+        when it is flattened, see [flatten].
+
+        Returns
+        -------
+        bool list
+            For each input, False if it is the input node of the single leaf
+            which reads it, True if it is an input node followed by a copy
+            node.
+        bool list
+            For each output, False if it is the output node of a leaf, True
+            if it is a copy node added after its driver.
+        """
+        origins, uses, loads = self._signals()
+        passed = {origin[1] for origin in origins if origin is not None and origin[0] == 'in'}
+        repeated = {origin[1] for origin in origins if origin is not None and origin[0] == 'out'}
+        return ([uses[k] != 1 or k in passed for k in range(self.n_inputs)],
+                [origin is not None or loads[o] > 0 or o in repeated
+                 for o, origin in enumerate(origins)])
+
+    def _arrivals(self, arrivals, memo):
+        """
+        Compute the number of nodes of the longest path of the flattened
+        circuit (see [flatten]) ending at the node which drives each output,
+        given the number of nodes of the longest path ending at the node
+        which drives each input. The results are memoized by module and by
+        arrivals relative to their minimum.
+        """
+        base = min(arrivals, default=0)
+        key = (id(self), tuple(a - base for a in arrivals))
+        if key not in memo:
+            relative = key[1]
+            if self.circuit is None:
+                times = [list(relative)]
+                for module, sources in self.instances:
+                    times.append(module._arrivals([times[j + 1][k] for j, k in sources], memo))
+                result = [times[j + 1][k] for j, k in self.outputs]
+            else:
+                size, inputs, program, outputs = self._compile()
+                times = [0] * size
+                for i, a in zip(inputs, relative):
+                    times[i] = a + 1
+                for _, target, sources in program:
+                    times[target] = max((times[s] for s in sources), default=0) + 1
+                result = [times[i] for i in outputs]
+            memo[key] = result
+        return [t + base for t in memo[key]]
+
+    def depth(self):
+        """
+        Compute the depth of the flattened circuit (see [flatten]), as the
+        number of nodes of its longest path ending at an output, module by
+        module. The flattened circuit is not constructed.
+
+        Returns
+        -------
+        int
+            The depth.
+        """
+        inputs, outputs = self._boundary()
+        times = self._arrivals([2 if extra else 0 for extra in inputs], {})
+        return max((t + extra for t, extra in zip(times, outputs)), default=0)
+
+    def _leaf_counts(self):
+        """
+        Count the nodes of the leaves of the module by label, memoized by
+        module.
+        """
+        if self._counts is None:
+            if self.circuit is None:
+                counts = Counter()
+                for module, _ in self.instances:
+                    counts.update(module._leaf_counts())
+            else:
+                counts = Counter(n.get_label() for n in self.circuit.get_nodes())
+            self._counts = counts
+        return self._counts
+
+    def gate_counts(self):
+        """
+        Count the nodes of the flattened circuit (see [flatten]) by label,
+        module by module. The flattened circuit is not constructed.
+
+        Returns
+        -------
+        str -> int dict
+            The number of nodes of each label.
+        """
+        inputs, outputs = self._boundary()
+        counts = Counter(self._leaf_counts())
+        counts[bool_circ.COPY] += 2 * sum(inputs) + sum(outputs)
+        return {label: n for label, n in counts.items() if n > 0}
+
+    def _expand(self, g, drivers, readers):
+        """
+        Stamp the leaves of the module into a circuit, see [flatten].
+
+        Parameters
+        ----------
+        g : bool_circ
+            The circuit.
+        drivers : int list
+            The ID of the node which drives each input, or -1 - k for the
+            k-th input of the flattened module.
+        readers : int list list
+            The IDs of the input nodes of leaves which read each input of the
+            flattened module, completed in place.
+
+        Returns
+        -------
+        int list
+            The ID of the node which drives each output, or -1 - k for the
+            k-th input of the flattened module.
+        """
+        if self.circuit is None:
+            signals = [drivers]
+            for module, sources in self.instances:
+                signals.append(module._expand(g, [signals[j + 1][k] for j, k in sources],
+                                              readers))
+            return [signals[j + 1][k] for j, k in self.outputs]
+        if self._template is None:
+            self._template = circuit_template(self.circuit)
+        inputs, outputs = self._template.stamp(g)
+        nodes = g.get_id_node_map()
+        for driver, id in zip(drivers, inputs):
+            if driver < 0:
+                readers[-1 - driver].append(id)
+            else:
+                nodes[driver].children[id] = 1
+                nodes[id].parents[driver] = 1
+        return outputs
+
+    def flatten(self):
+        """
+        Construct the boolean circuit of the module, by stamping the circuit
+        of each instance of a leaf and linking the input nodes of each one to
+        the nodes which drive them, as [bool_circ.adder] links its full
+        adders. An input of the module is the input node of the leaf which
+        reads it, or an input node followed by a copy node if it is read
+        several times or is an output. An output is the output node of a
+        leaf, or a copy node added after it if it is read or is several
+        outputs.
+
+        Returns
+        -------
+        bool_circ
+            The flattened circuit.
+        """
+        g = bool_circ.empty()
+        nodes = g.get_id_node_map()
+
+        def link(src, tgt):
+            nodes[src].children[tgt] = 1
+            nodes[tgt].parents[src] = 1
+
+        readers = [[] for _ in range(self.n_inputs)]
+        drivers = self._expand(g, [-1 - k for k in range(self.n_inputs)], readers)
+        inputs = []
+        copies = set()
+        for k, ids in enumerate(readers):
+            if len(ids) == 1 and -1 - k not in drivers:
+                inputs.append(ids[0])
+            else:
+                copy = g.add_node()
+                copies.add(copy)
+                for id in ids:
+                    link(copy, id)
+                inputs.append(g.add_node())
+                link(inputs[-1], copy)
+                drivers = [copy if d == -1 - k else d for d in drivers]
+        outputs = []
+        repeated = Counter(drivers)
+        for id in drivers:
+            if len(nodes[id].children) == 0 and repeated[id] == 1 and id not in copies:
+                outputs.append(id)
+            else:
+                outputs.append(g.add_node())
+                link(id, outputs[-1])
+        g.set_input_ids(inputs)
+        g.set_output_ids(outputs)
+        return g
+
+    @classmethod
+    def adder(cls, n):
+        """
+        Construct an adder for registers of size 2 ** n, with the inputs
+        and the outputs of [bool_circ.adder]: a full adder for n = 0, and
+        two instances of the adder of size 2 ** (n - 1) linked by their
+        carries otherwise. There are n + 1 distinct modules.
+
+        Parameters
+        ----------
+        n : int
+            Number of 2 ** n bits for the registers.
+
+        Returns
+        -------
+        hierarchical_circuit
+            The adder.
+
+        Raises
+        ------
+        ValueError
+            If [n] is not positive.
+        """
+        if n < 0:
+            raise ValueError(f"n = {n} must be positive.")
+        module = cls.leaf(bool_circ.adder(0), "adder0")
+        for level in range(1, n + 1):
+            k = 2 ** (level - 1)
+            m = cls(4 * k + 1, f"adder{level}")
+            a = [m.input(i) for i in range(2 * k)]
+            b = [m.input(i) for i in range(2 * k, 4 * k)]
+            low = m.instantiate(module, a[k:] + b[k:] + [m.input(4 * k)])
+            high = m.instantiate(module, a[:k] + b[:k] + [low[0]])
+            m.set_outputs([high[0]] + high[1:] + low[1:])
+            module = m
+        return module
@@ -0,0 +1,266 @@
+from heapq import heapify, heappop, heappush
+
+
+class input_binding:
+    """
+    Constant values bound to some inputs of a boolean circuit, as an
+    overlay: the circuit is neither modified nor copied. The values of the
+    nodes which only depend on the bound inputs and on the constants of
+    the circuit are known by partial evaluation, and kept up to date when
+    the binding changes by going through the downstream cone of the
+    inputs which change only. The evaluation of the circuit then computes
+    the other nodes only.
+
+    The circuit must not be modified while it is bound.
+
+    Attributes
+    ----------
+    circuit : bool_circ
+        The circuit.
+    order : int list
+        The IDs of the nodes of the circuit in topological order.
+    position : int -> int dict
+        The position of each node in [order].
+    values : int -> int dict
+        The value bound to each bound input, by ID.
+    known : int -> int dict
+        The value of each node known by partial evaluation.
+    """
+    def __init__(self, circuit):
+        """
+        Construct a binding of a circuit without any bound input, the
+        constants of the circuit being propagated.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+        """
+        self.circuit = circuit
+        self.order = circuit.topological_order()
+        self.position = {id: i for i, id in enumerate(self.order)}
+        self.values = {}
+        self.known = {}
+        self._inputs = set(circuit.get_input_ids())
+        self._residual = None
+        for id in self.order:
+            value = self._fold(id)
+            if value is not None:
+                self.known[id] = value
+
+    def _fold(self, id):
+        """
+        Get the value of a node from the values of its parents, or None if
+        it is not known.
+        """
+        c = self.circuit
+        if id in self.values:
+            return self.values[id]
+        if id in self._inputs:
+            return None
+        node = c.nodes[id]
+        label = node.get_label()
+        parents = [self.known.get(p) for p, k in node.parents.items() for _ in range(k)]
+        if label in c.VALUES and len(parents) == 0:
+            return int(label)
+        if label in c.UNARY and len(parents) == 1:
+            value = parents[0]
+            return value if value is None or label == c.COPY else 1 - value
+        if label == c.AND and 0 in parents:
+            return 0
+        if label == c.OR and 1 in parents:
+            return 1
+        if label in c.BINARY and None not in parents:
+            if label == c.XOR:
+                return sum(parents) % 2
+            return 1 if label == c.AND else 0
+        return None
+
+    def _propagate(self, ids):
+        """
+        Update the known values after a change of the values of some
+        inputs, stopping at the nodes whose value does not change.
+        """
+        heap = [self.position[id] for id in ids]
+        heapify(heap)
+        seen = set(ids)
+        while heap:
+            id = self.order[heappop(heap)]
+            value = self._fold(id)
+            if value == self.known.get(id):
+                continue
+            if value is None:
+                del self.known[id]
+            else:
+                self.known[id] = value
+            for child in self.circuit.nodes[id].children:
+                if child not in seen:
+                    seen.add(child)
+                    heappush(heap, self.position[child])
+        self._residual = None
+
+    def bind(self, bits, start=0):
+        """
+        Bind consecutive inputs to values.
+
+        Parameters
+        ----------
+        bits : str or int list
+            The values, as '0' and '1' or as integers.
+        start : int, optional
+            The index of the first input to bind.
+
+        Returns
+        -------
+        input_binding
+            The binding itself.
+
+        Raises
+        ------
+        ValueError
+            If the inputs do not exist.
+        ValueError
+            If a value is not a bit.
+        """
+        inputs = self.circuit.get_input_ids()
+        if start < 0 or start + len(bits) > len(inputs):
+            raise ValueError(f"There are no inputs from {start} to "
+                             f"{start + len(bits) - 1}.")
+        changed = []
+        for id, bit in zip(inputs[start:], bits):
+            if bit not in ['0', '1', 0, 1]:
+                raise ValueError(f"{bit} is not a bit.")
+            if self.values.get(id) != int(bit):
+                self.values[id] = int(bit)
+                changed.append(id)
+        self._propagate(changed)
+        return self
+
+    def bind_integer(self, value, start, n):
+        """
+        Bind consecutive inputs to the bits of an integer, most significant
+        bit first, as a register (see [bool_circ.register]).
+
+        Parameters
+        ----------
+        value : int
+            A positive integer.
+        start : int
+            The index of the first input to bind.
+        n : int
+            The number of inputs to bind.
+
+        Returns
+        -------
+        input_binding
+            The binding itself.
+
+        Raises
+        ------
+        ValueError
+            If [value] is not positive.
+        ValueError
+            If [value] cannot be represented in binary with [n] bits.
+        ValueError
+            If the inputs do not exist.
+        """
+        if value < 0:
+            raise ValueError(f"value = {value} is not positive.")
+        if value.bit_length() > n:
+            raise ValueError(f"value = {value} cannot be represented "
+                             f"with n = {n} bits.")
+        return self.bind(format(value, f"0{n}b") if n > 0 else "", start)
+
+    def unbind(self, start=0, stop=None):
+        """
+        Unbind consecutive inputs.
+
+        Parameters
+        ----------
+        start : int, optional
+            The index of the first input to unbind.
+        stop : int, optional
+            The index after the last input to unbind, all the inputs after
+            [start] by default.
+        """
+        changed = [id for id in self.circuit.get_input_ids()[start:stop]
+                   if self.values.pop(id, None) is not None]
+        self._propagate(changed)
+
+    def free_inputs(self):
+        """
+        Get the indices of the inputs which are not bound.
+        """
+        return [i for i, id in enumerate(self.circuit.get_input_ids())
+                if id not in self.values]
+
+    def output_values(self):
+        """
+        Get the values of the outputs known by partial evaluation.
+
+        Returns
+        -------
+        (int or None) list
+            The value of each output, None if it depends on a free input.
+        """
+        return [self.known.get(id) for id in self.circuit.get_output_ids()]
+
+    def simulate(self, patterns, width):
+        """
+        Evaluate the bound circuit on several vectors of values of the free
+        inputs at once, see [bool_circ.simulate]. Only the nodes whose
+        value is not known are computed.
+
+        Parameters
+        ----------
+        patterns : int list
+            The values of the free inputs, one integer per input.
+        width : int
+            The number of vectors.
+
+        Returns
+        -------
+        int list
+            The values of the outputs, one integer per output.
+
+        Raises
+        ------
+        ValueError
+            If the number of patterns is not the number of free inputs.
+        ValueError
+            See [bool_circ.simulate].
+        """
+        c = self.circuit
+        free = [id for id in c.get_input_ids() if id not in self.values]
+        if len(patterns) != len(free):
+            raise ValueError(f"{len(patterns)} patterns given for "
+                             f"{len(free)} free inputs.")
+        if self._residual is None:
+            self._residual = [id for id in self.order if id not in self.known]
+        mask = (1 << width) - 1
+        words = {id: mask * value for id, value in self.known.items()}
+        words.update((id, p & mask) for id, p in zip(free, patterns))
+        c._simulate_words(words, self._residual, mask)
+        return [words[id] for id in c.get_output_ids()]
+
+    def evaluate(self, bits=""):
+        """
+        Evaluate the bound circuit.
+
+        Parameters
+        ----------
+        bits : str, optional
+            The values of the free inputs.
+
+        Returns
+        -------
+        str
+            The values of the outputs.
+
+        Raises
+        ------
+        ValueError
+            If the number of bits is not the number of free inputs.
+        """
+        words = self.simulate([int(bit) for bit in bits], 1)
+        return "".join(str(w) for w in words)
@@ -1,9 +1,11 @@
 from copy import deepcopy
 from random import sample
 
+from modules.node import node
 from modules.open_digraph_mx.op_algorithm_mx import op_algorithm_mx
 from modules.open_digraph_mx.op_connected_components_mx import op_connected_components_mx
 from modules.open_digraph_mx.op_getter_mx import op_getter_mx
+from modules.open_digraph_mx.op_isomorphism_mx import op_isomorphism_mx
 from modules.open_digraph_mx.op_matrix_mx import op_matrix_mx
 from modules.open_digraph_mx.op_modify_mx import op_modify_mx
 from modules.open_digraph_mx.op_setter_mx import op_setter_mx
@@ -22,7 +24,8 @@ class open_digraph(op_compositions_mx,
                    op_setter_mx,
                    op_special_graph_mx,
                    op_tools_mx,
-                   op_algorithm_mx
+                   op_algorithm_mx,
+                   op_isomorphism_mx
                    ):
     """
     An open directed graph.
@@ -181,29 +184,15 @@ class open_digraph(op_compositions_mx,
         bool
            True if the graph is cyclic. Otherwise, return False.
         """
-        def sub_is_cyclic(graph):
-            if graph.get_node_ids() == []:
-                return False
-
-            else:
-                leaf = []
-                for n_id in graph.get_node_ids():
-                    if graph.get_node_by_id(n_id).get_parent_ids() == []:
-                        leaf.append(n_id)
-                        break
-
-                if leaf == []:
-                    return True
-
-                else:
-                    graph.remove_node_by_id(leaf[0])
-                    return graph.is_cyclic()
-
-        return sub_is_cyclic(self.copy())
+        try:
+            self.topological_order()
+        except ValueError:
+            return True
+        return False
     
     def shift_indices(self, n):
         """
-        Shift the ID of all nodes.
+        Shift the ID of all nodes, in a single pass over the nodes.
 
         Parameters
         ----------
@@ -212,20 +201,16 @@ class open_digraph(op_compositions_mx,
         """
         if n != 0 and len(self.get_id_node_map()) > 0:
             shift_list = lambda l :list(map(lambda x : x + n, l))
+            next_id = max(self.next_id + n, 0)
 
             for node in self.get_nodes():
-                parent_ids = node.get_parent_ids()
-                parent_ids.sort(reverse=True if n > 0 else False)
-                for pid in parent_ids:
-                    node.parents[pid + n] = node.parents.pop(pid)
-                children_ids = node.get_children_ids()
-                children_ids.sort(reverse=True if n > 0 else False)
-                for cid in children_ids:
-                    node.children[cid + n] = node.children.pop(cid)
+                node.parents = {pid + n: m for pid, m in node.parents.items()}
+                node.children = {cid + n: m for cid, m in node.children.items()}
                 node.set_id(node.get_id() + n)
             self.set_nodes(self.get_nodes())
             self.set_input_ids(shift_list(self.get_input_ids()))
             self.set_output_ids(shift_list(self.get_output_ids()))
+            self.next_id = next_id
 
     def separate_indices(self, g):
         if self.min_id() <= g.max_id():
@@ -256,3 +241,44 @@ class open_digraph(op_compositions_mx,
             list_comps.append(graph)
 
         return list_comps
+
+    def condensation(self):
+        """
+        Get the condensation of the graph: each strongly connected component
+        is contracted into a single node, which gives a directed acyclic
+        graph.
+
+        The ID of each node of the condensation is the number of its
+        component, as given by [strongly_connected_components]. A node keeps
+        its label if it is alone in its component. The multiplicity of an
+        edge between two components is the sum of the multiplicities of the
+        edges between their nodes.
+
+        Returns
+        ------
+        open_digraph
+           The condensation of the graph.
+        int -> int
+           A dict where each node is associated with its component.
+        """
+        n_comp, dict_comp = self.strongly_connected_components()
+        nodes = [node(c, '', {}, {}) for c in range(n_comp)]
+        sizes = [0] * n_comp
+
+        for id, n in self.nodes.items():
+            c = dict_comp[id]
+            sizes[c] += 1
+            nodes[c].set_label(n.get_label())
+            for child, m in n.children.items():
+                d = dict_comp[child]
+                if c != d:
+                    nodes[c].children[d] = nodes[c].children.get(d, 0) + m
+                    nodes[d].parents[c] = nodes[d].parents.get(c, 0) + m
+
+        for c in range(n_comp):
+            if sizes[c] > 1:
+                nodes[c].set_label('')
+
+        inputs = list(dict.fromkeys(dict_comp[i] for i in self.get_input_ids()))
+        outputs = list(dict.fromkeys(dict_comp[o] for o in self.get_output_ids()))
+        return open_digraph(inputs, outputs, nodes), dict_comp
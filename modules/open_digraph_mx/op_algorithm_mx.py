@@ -1,4 +1,6 @@
 from operator import itemgetter
+from modules.ancestry_index import ancestry_index
+from modules.dominator_tree import dominator_tree
 
 
 class op_algorithm_mx:
@@ -117,6 +119,99 @@ class op_algorithm_mx:
             common = set(prev_O.keys()).intersection(set(prev_1.keys()))
             return {n: (dist_0[n], dist_1[n]) for n in common}
 
+    def build_ancestry_index(self):
+        """
+        Build an index answering common ancestry queries without traversing
+        the graph again.
+
+        Returns
+        -------
+        ancestry_index
+            The index of the graph.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        return ancestry_index(self)
+
+    def build_dominator_tree(self, post=False):
+        """
+        Build the dominator tree of the graph, rooted at a virtual node
+        linked to the inputs and to the nodes without parents.
+
+        Parameters
+        ----------
+        post : bool, optional
+            Build the post-dominator tree instead, rooted at a virtual node
+            linked to the outputs and to the nodes without children.
+
+        Returns
+        -------
+        dominator_tree
+            The dominator tree of the graph.
+        """
+        return dominator_tree(self, post)
+
+    def fanout_free_regions(self):
+        """
+        Partition the graph into fanout-free regions. The root of a region
+        is a node whose out degree is not 1, and each other node belongs to
+        the region of its unique child.
+
+        Returns
+        -------
+        int -> int dict
+            The root of the region containing each node. Use [reverse_dict]
+            to get the nodes of each region.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        regions = {}
+        for id in reversed(self.topological_order()):
+            node = self.nodes[id]
+            if node.outdegree() == 1:
+                regions[id] = regions[node.get_children_ids()[0]]
+            else:
+                regions[id] = id
+        return regions
+
+    def topological_order(self):
+        """
+        Compute a topological order of the nodes in linear time (Kahn's
+        algorithm).
+
+        Returns
+        -------
+        int list
+            The IDs of the nodes, each node appearing after all its parents.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        indegree = {id: 0 for id in self.nodes}
+        for node in self.nodes.values():
+            for child in node.children:
+                indegree[child] += 1
+        order = [id for id, d in indegree.items() if d == 0]
+        i = 0
+        while i < len(order):
+            for child in self.nodes[order[i]].children:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+            i += 1
+
+        if len(order) != len(self.nodes):
+            raise ValueError("The graph can't be cyclic.")
+        return order
+
     def topological_sort(self):
         """
         Compute the topological sorted.
@@ -1,21 +1,59 @@
+from modules.node import node
+
 
 class op_compositions_mx:
+    def _offset_nodes(self, g):
+        """
+        Copy the nodes of a graph with their IDs shifted by an offset, in a
+        single pass, so that they are free in this graph: the IDs of this
+        graph are less than its next ID.
+
+        Parameters
+        ----------
+        g : open_digraph
+            A graph, which is not modified.
+
+        Returns
+        -------
+        int
+            The offset.
+        int -> node dict
+            The shifted copies of the nodes of [g].
+        """
+        offset = max(self.next_id - g.min_id(), 0)
+        return offset, {id + offset: node(id + offset, n.get_label(),
+                                          {p + offset: m for p, m in n.parents.items()},
+                                          {c + offset: m for c, m in n.children.items()})
+                        for id, n in g.get_id_node_map().items()}
+
     def iparallel(self, list_graph):
         """
         Add graphs parallel to itself. This functionality only accepts well-formed graphs.
 
+        The graphs are not modified: their nodes are copied with their IDs
+        shifted after the IDs of this graph, whose IDs are kept. The time is
+        linear in the size of the graphs to add. This graph may be in
+        [list_graph]: it is then added as it was before the call.
+
         Parameters
         ----------
         list_graph : open_digraph list
             A list containing graphs to add.
         """
+        itself = None
         for graph in list_graph:
+            if graph is self:
+                if itself is None:
+                    itself = self.copy()
+                graph = itself
             if len(graph.get_id_node_map()) > 0:
-                self.separate_indices(graph)
-                self.nodes.update(graph.get_id_node_map())
-                self.set_input_ids(self.get_input_ids() + graph.get_input_ids())
-                self.set_output_ids(self.get_output_ids() + graph.get_output_ids())
-                self.next_id = max(self.nodes.keys()) + 1
+                offset, nodes = self._offset_nodes(graph)
+                inputs = [id + offset for id in graph.get_input_ids()]
+                outputs = [id + offset for id in graph.get_output_ids()]
+                self.nodes.update(nodes)
+                self.inputs.extend(inputs)
+                self.outputs.extend(outputs)
+                self.next_id = max(self.next_id, max(nodes) + 1)
 
     @classmethod
     def parallel(cls, list_graph):
@@ -40,6 +78,10 @@ class op_compositions_mx:
         """
         Compose graph in sequence. The graph g is not modified. This functionality only accepts well-formed graphs.
 
+        The nodes of g are copied with their IDs shifted after the IDs of
+        this graph, whose IDs are kept, so that a chain of compositions
+        takes a time linear in the total size of the graphs.
+
         Parameters
         ----------
         g : open_digraph
@@ -55,19 +97,23 @@ class op_compositions_mx:
         elif len(self.get_output_ids()) == 0 and len(g.get_input_ids()) == 0:
             self.iparallel([g])
         elif len(self.get_id_node_map()) == 0 and len(g.get_id_node_map()) > 0:
-            self.nodes = g.get_id_node_map()
-            self.set_input_ids(g.get_input_ids())
-            self.set_output_ids(g.get_output_ids())
+            offset, self.nodes = self._offset_nodes(g)
+            self.set_input_ids([id + offset for id in g.get_input_ids()])
+            self.set_output_ids([id + offset for id in g.get_output_ids()])
+            self.next_id = max(self.nodes) + 1
         elif len(g.get_id_node_map()) > 0:
-            self.separate_indices(g)
-            self.nodes.update(g.get_id_node_map())
+            offset, nodes = self._offset_nodes(g)
+            self.nodes.update(nodes)
             for outid, inid in zip(self.get_output_ids(), g.get_input_ids()):
-                onode = self.get_node_by_id(outid)
+                onode = self.nodes.pop(outid)
                 onode_parent_id = onode.get_parent_ids()[0] # since output node only has 1 parent
-                self.add_edge(onode_parent_id, inid)
-            self.remove_nodes_by_id(self.get_output_ids())
-            self.set_output_ids(g.get_output_ids())
-        self.next_id = (max (self.nodes.keys()) if self.nodes.keys() else 0) + 1
+                pnode = self.nodes[onode_parent_id]
+                del pnode.children[outid]
+                pnode.children[inid + offset] = pnode.children.get(inid + offset, 0) + 1
+                parents = self.nodes[inid + offset].parents
+                parents[onode_parent_id] = parents.get(onode_parent_id, 0) + 1
+            self.set_output_ids([id + offset for id in g.get_output_ids()])
+            self.next_id = max(self.next_id, max(nodes) + 1)
 
     def compose(self, g):
         """
@@ -77,12 +123,12 @@ class op_compositions_mx:
         ----------
         g : open_digraph
            A graph to compose in sequence.
-        
+
         Returns
         ------
         open_digraph
            The composition of the self graph with g.
-        """ 
+        """
         graph = self.copy()
         graph.icompose(g)
         return graph
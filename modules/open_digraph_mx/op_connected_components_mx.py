@@ -1,4 +1,5 @@
 import copy
+from modules.reachability_index import reachability_index
 
 
 class op_connected_components_mx:
@@ -20,6 +21,23 @@ class op_connected_components_mx:
         dist, _ = self.dijkstra(id)
         return list(dist.keys())
 
+    def build_reachability_index(self):
+        """
+        Build the transitive closure of the graph, answering reachability
+        queries without traversing the graph again.
+
+        Returns
+        -------
+        reachability_index
+            The index of the graph.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        return reachability_index(self)
+
     def assoc_nodes_to_comp(self, nodes):
         """
         Associate each node of a list with its components.
@@ -60,3 +78,72 @@ class op_connected_components_mx:
         dict_comp = self.assoc_nodes_to_comp(self.get_node_ids())
 
         return len(set(dict_comp.values())), dict_comp
+
+    def strongly_connected_components(self):
+        """
+        Get the strongly connected components of the graph, with an
+        iterative version of Tarjan's algorithm.
+
+        The components are numbered in topological order: if there is an
+        edge from a node of component i to a node of component j, then
+        i <= j.
+
+        Returns
+        ------
+        int * (int -> int)
+           The number of strongly connected components and a dict where each
+           node is associated with its component.
+        """
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        dict_comp = {}
+        n_comp = 0
+
+        for root in self.nodes:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.nodes[root].children))]
+            while work:
+                v, children = work[-1]
+                for w in children:
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(self.nodes[w].children)))
+                        break
+                    elif w in on_stack:
+                        low[v] = min(low[v], index[w])
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        low[u] = min(low[u], low[v])
+                    if low[v] == index[v]:
+                        w = None
+                        while w != v:
+                            w = stack.pop()
+                            on_stack.remove(w)
+                            dict_comp[w] = n_comp
+                        n_comp += 1
+
+        return n_comp, {id: n_comp - 1 - c for id, c in dict_comp.items()}
+
+    def strongly_connected_component_sizes(self):
+        """
+        Get the number of nodes of each strongly connected component.
+
+        Returns
+        ------
+        int list
+           The size of each component, indexed as in
+           [strongly_connected_components].
+        """
+        n_comp, dict_comp = self.strongly_connected_components()
+        sizes = [0] * n_comp
+        for c in dict_comp.values():
+            sizes[c] += 1
+        return sizes
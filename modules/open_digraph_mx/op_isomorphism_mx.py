@@ -0,0 +1,211 @@
+from hashlib import blake2b
+
+
+class op_isomorphism_mx:
+    def structural_colors(self):
+        """
+        Color the nodes according to the structure of the graph, ignoring
+        their IDs: two nodes exchanged by an isomorphism have the same color.
+
+        The initial color of a node depends on its label and on its position
+        in the inputs or outputs. On a directed acyclic graph, the colors are
+        refined once from the inputs and once from the outputs, in linear
+        time. Otherwise they are refined (Weisfeiler-Lehman) until the number
+        of colors stops growing.
+
+        Returns
+        -------
+        int -> int dict
+            The color of each node.
+        """
+        labels = {}
+        roles = {}
+        for k, id in enumerate(self.get_input_ids()):
+            roles[id] = 2 * k + 1
+        for k, id in enumerate(self.get_output_ids()):
+            roles[id] = 2 * k + 2
+
+        colors = {}
+        for id, node in self.nodes.items():
+            label = node.get_label()
+            if label not in labels:
+                digest = blake2b(label.encode(), digest_size=8).digest()
+                labels[label] = int.from_bytes(digest, 'big')
+            colors[id] = hash((labels[label], roles.get(id, 0)))
+
+        try:
+            order = self.topological_order()
+        except ValueError:
+            order = None
+
+        if order is not None:
+            up, down = {}, {}
+            for id in order:
+                parents = self.nodes[id].parents
+                up[id] = hash((colors[id], tuple(sorted((up[p], m) for p, m in parents.items()))))
+            for id in reversed(order):
+                children = self.nodes[id].children
+                down[id] = hash((colors[id], tuple(sorted((down[c], m) for c, m in children.items()))))
+            return {id: hash((up[id], down[id])) for id in order}
+
+        n_colors = len(set(colors.values()))
+        while True:
+            refined = {}
+            for id, node in self.nodes.items():
+                parents = tuple(sorted((colors[p], m) for p, m in node.parents.items()))
+                children = tuple(sorted((colors[c], m) for c, m in node.children.items()))
+                refined[id] = hash((colors[id], parents, children))
+            colors = refined
+            n_refined = len(set(colors.values()))
+            if n_refined == n_colors:
+                return colors
+            n_colors = n_refined
+
+    def canonical_hash(self):
+        """
+        Compute a hash of the graph which does not depend on the IDs of the
+        nodes, but depends on the labels, the multiplicities of the edges, and
+        the order of the inputs and outputs. Isomorphic graphs have the same
+        hash, but graphs with the same hash are not always isomorphic: use
+        [is_isomorphic] to decide. The hash does not depend on the Python
+        process.
+
+        Returns
+        -------
+        int
+            A 64 bits hash of the graph.
+        """
+        colors = self.structural_colors()
+        h = hash((len(colors),
+                  tuple(sorted(colors.values())),
+                  tuple(colors[i] for i in self.get_input_ids()),
+                  tuple(colors[o] for o in self.get_output_ids())))
+        return h & ((1 << 64) - 1)
+
+    def isomorphism(self, g):
+        """
+        Find an isomorphism from this graph to another graph, preserving the
+        labels, the multiplicities of the edges, and the order of the inputs
+        and outputs.
+
+        The structural colors are used to reject non-isomorphic graphs
+        quickly and to restrict the candidates of each node, before a
+        backtracking search.
+
+        Parameters
+        ----------
+        g : open_digraph
+            Another graph.
+
+        Returns
+        -------
+        int -> int dict
+            The image in [g] of each node ID of this graph, or None if the
+            graphs are not isomorphic.
+        """
+        if (len(self.nodes) != len(g.nodes)
+                or len(self.get_input_ids()) != len(g.get_input_ids())
+                or len(self.get_output_ids()) != len(g.get_output_ids())):
+            return None
+        colors, g_colors = self.structural_colors(), g.structural_colors()
+        if sorted(colors.values()) != sorted(g_colors.values()):
+            return None
+
+        classes = {}
+        for id, c in g_colors.items():
+            classes.setdefault(c, []).append(id)
+
+        mapping, used = {}, set()
+
+        def consistent(u, v):
+            if colors[u] != g_colors[v] or v in used:
+                return False
+            un, vn = self.nodes[u], g.nodes[v]
+            if (un.get_label() != vn.get_label()
+                    or len(un.parents) != len(vn.parents)
+                    or len(un.children) != len(vn.children)
+                    or un.get_child_multiplicity(u) != vn.get_child_multiplicity(v)):
+                return False
+            for w, m in un.parents.items():
+                if w in mapping and vn.get_parent_multiplicity(mapping[w]) != m:
+                    return False
+            for w, m in un.children.items():
+                if w in mapping and vn.get_child_multiplicity(mapping[w]) != m:
+                    return False
+            return True
+
+        forced = (list(zip(self.get_input_ids(), g.get_input_ids()))
+                  + list(zip(self.get_output_ids(), g.get_output_ids())))
+        for u, v in forced:
+            if u in mapping or not consistent(u, v):
+                return None
+            mapping[u] = v
+            used.add(v)
+
+        # Visit the nodes so that each one is adjacent to an earlier one when
+        # possible, which restricts its candidates to the neighbours of an
+        # already mapped node.
+        order, seen = [], set(mapping)
+        for start in list(mapping) + [id for id in self.nodes if id not in mapping]:
+            if start not in mapping:
+                if start in seen:
+                    continue
+                seen.add(start)
+                order.append(start)
+            queue = [start]
+            while queue:
+                v = queue.pop()
+                for w in list(self.nodes[v].parents) + list(self.nodes[v].children):
+                    if w not in seen:
+                        seen.add(w)
+                        order.append(w)
+                        queue.append(w)
+
+        def candidates(u):
+            node = self.nodes[u]
+            for w in node.parents:
+                if w in mapping:
+                    return [v for v in g.nodes[mapping[w]].children if g_colors[v] == colors[u]]
+            for w in node.children:
+                if w in mapping:
+                    return [v for v in g.nodes[mapping[w]].parents if g_colors[v] == colors[u]]
+            return classes[colors[u]]
+
+        stack = []
+        k = 0
+        while k < len(order):
+            if len(stack) == k:
+                stack.append(iter(candidates(order[k])))
+            else:
+                previous = mapping.pop(order[k])
+                used.remove(previous)
+            for v in stack[k]:
+                if consistent(order[k], v):
+                    mapping[order[k]] = v
+                    used.add(v)
+                    k += 1
+                    break
+            else:
+                stack.pop()
+                k -= 1
+                if k < 0:
+                    return None
+        return mapping
+
+    def is_isomorphic(self, g):
+        """
+        Test if this graph is isomorphic to another graph, preserving the
+        labels, the multiplicities of the edges, and the order of the inputs
+        and outputs.
+
+        Parameters
+        ----------
+        g : open_digraph
+            Another graph.
+
+        Returns
+        -------
+        bool
+            True if the graphs are isomorphic.
+        """
+        return self.isomorphism(g) is not None
@@ -21,4 +21,14 @@ class op_setter_mx:
         self.outputs = list(dict.fromkeys(outputs))
 
     def set_nodes(self, nodes):
+        """
+        Set the nodes. The next ID follows the greatest ID, so that the IDs
+        given by [add_node] and by the compositions are free.
+
+        Parameters
+        ----------
+        nodes : node list
+            The node list.
+        """
         self.nodes = {node.get_id(): node for node in nodes}
+        self.next_id = max(self.nodes, default=-1) + 1
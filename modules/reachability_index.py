@@ -0,0 +1,240 @@
+from modules.utils import iter_bits
+
+
+class reachability_index:
+    """
+    The transitive closure of a directed acyclic graph, stored as one bitset
+    of descendants and one bitset of ancestors per node.
+
+    The index keeps a reference to its graph. Edges and nodes added through
+    the index are added to the graph and the closure is updated
+    incrementally, other modifications of the graph are not tracked.
+
+    Attributes
+    ----------
+    graph : open_digraph
+        The indexed graph.
+    order : int list
+        The IDs of the indexed nodes. The position of a node in this list is
+        its bit in the bitsets.
+    position : int -> int dict
+        The position of each node in [order].
+    desc : int -> int dict
+        The bitset of each node and all its descendants.
+    anc : int -> int dict
+        The bitset of each node and all its ancestors.
+    """
+    def __init__(self, graph):
+        """
+        Build the index of a graph.
+
+        Parameters
+        ----------
+        graph : open_digraph
+            A directed acyclic graph.
+
+        Raises
+        ------
+        ValueError
+            If the graph is cyclic.
+        """
+        self.graph = graph
+        self.order = graph.topological_order()
+        self.position = {id: i for i, id in enumerate(self.order)}
+        self.desc = {}
+        self.anc = {}
+
+        for i, id in enumerate(self.order):
+            bits = 1 << i
+            for parent in graph.get_node_by_id(id).get_parent_ids():
+                bits |= self.anc[parent]
+            self.anc[id] = bits
+
+        for i in range(len(self.order) - 1, -1, -1):
+            id = self.order[i]
+            bits = 1 << i
+            for child in graph.get_node_by_id(id).get_children_ids():
+                bits |= self.desc[child]
+            self.desc[id] = bits
+
+    def _check_ids(self, *ids):
+        """
+        Raise a ValueError if one of [ids] is not indexed.
+        """
+        for id in ids:
+            if id not in self.position:
+                raise ValueError(f"{id} is not a valid node ID.")
+
+    def _ids(self, bits):
+        """
+        Convert a bitset into the list of the corresponding node IDs.
+        """
+        return [self.order[i] for i in iter_bits(bits)]
+
+    def _link(self, up, down):
+        """
+        Make every node of the bitset [up] reach every node of the bitset
+        [down].
+        """
+        for i in iter_bits(up):
+            id = self.order[i]
+            self.desc[id] |= down
+        for i in iter_bits(down):
+            id = self.order[i]
+            self.anc[id] |= up
+
+    def reaches(self, foo, bar):
+        """
+        Test if there is a path from a node to another. Every node reaches
+        itself.
+
+        Parameters
+        ----------
+        foo : int
+            The ID of the source node.
+        bar : int
+            The ID of the target node.
+
+        Returns
+        -------
+        bool
+            True if [bar] can be reached from [foo].
+
+        Raises
+        ------
+        ValueError
+            If [foo] or [bar] is not a valid node ID.
+        """
+        self._check_ids(foo, bar)
+        return (self.desc[foo] >> self.position[bar]) & 1 == 1
+
+    def descendants(self, id):
+        """
+        Get the descendants of a node, the node itself excluded.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node.
+
+        Returns
+        -------
+        int list
+            The IDs of the descendants.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID.
+        """
+        self._check_ids(id)
+        return self._ids(self.desc[id] & ~(1 << self.position[id]))
+
+    def ancestors(self, id):
+        """
+        Get the ancestors of a node, the node itself excluded.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the node.
+
+        Returns
+        -------
+        int list
+            The IDs of the ancestors.
+
+        Raises
+        ------
+        ValueError
+            If [id] is not a valid node ID.
+        """
+        self._check_ids(id)
+        return self._ids(self.anc[id] & ~(1 << self.position[id]))
+
+    def dependency_matrix(self):
+        """
+        Generate the dependency matrix between the inputs and the outputs of
+        the graph.
+
+        Returns
+        -------
+        list list int
+            The matrix M where M[i][j] is 1 if the j-th output depends on the
+            i-th input, 0 otherwise.
+        """
+        outputs = [self.position[o] for o in self.graph.get_output_ids()]
+        return [[(self.desc[i] >> o) & 1 for o in outputs]
+                for i in self.graph.get_input_ids()]
+
+    def add_edge(self, src, tgt):
+        """
+        Add a new edge to the graph and update the index.
+
+        Parameters
+        ----------
+        src : int
+            The ID of the source node.
+        tgt : int
+            The ID of the target node.
+
+        Raises
+        ------
+        ValueError
+            If [src] or [tgt] is not a valid node ID.
+        ValueError
+            If the new edge creates a cycle.
+        ValueError
+            If the graph refuses the edge, see [open_digraph.add_edge].
+        """
+        self._check_ids(src, tgt)
+        if self.reaches(tgt, src):
+            raise ValueError(f"The edge from {src} to {tgt} creates a cycle.")
+        self.graph.add_edge(src, tgt)
+        if not self.reaches(src, tgt):
+            self._link(self.anc[src], self.desc[tgt])
+
+    def add_node(self, label='', parents=[], children=[]):
+        """
+        Add a new node to the graph and update the index.
+
+        Parameters
+        ----------
+        label : str, optional
+            The label of the new node.
+        parents : int list, optional
+            The list of the IDs of parent nodes.
+        children : int list, optional
+            The list of the IDs of child nodes.
+
+        Returns
+        -------
+        int
+            The ID of the new node.
+
+        Raises
+        ------
+        ValueError
+            If one of [parents] or [children] is not a valid node ID.
+        ValueError
+            If the new node creates a cycle.
+        ValueError
+            If the graph refuses the node, see [open_digraph.add_node].
+        """
+        self._check_ids(*parents, *children)
+        up, down = 0, 0
+        for parent in parents:
+            up |= self.anc[parent]
+        for child in children:
+            down |= self.desc[child]
+        if up & down:
+            raise ValueError("The new node creates a cycle.")
+
+        id = self.graph.add_node(label, parents, children)
+        bit = 1 << len(self.order)
+        self.position[id] = len(self.order)
+        self.order.append(id)
+        self.anc[id] = bit
+        self.desc[id] = bit
+        self._link(up | bit, down | bit)
+        return id
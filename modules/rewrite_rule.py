@@ -0,0 +1,217 @@
+def _fits(node, degree):
+    """
+    Test if the degrees of a node are the ones required by a pattern, None
+    meaning any degree.
+    """
+    indegree, outdegree = degree
+    return ((indegree is None or node.indegree() == indegree)
+            and (outdegree is None or node.outdegree() == outdegree))
+
+
+class rewrite_rule:
+    """
+    A local pattern of a boolean circuit, made of a root node and one of its
+    neighbours, together with the transformation to apply where it matches.
+
+    Attributes
+    ----------
+    name : str
+        The name of the rule.
+    root : str list
+        The allowed labels of the root.
+    neighbour : str list
+        The allowed labels of the neighbour.
+    action : str
+        The name of the method of the circuit applying the transformation.
+        It is called with the ID of the root and the ID of the neighbour.
+    direction : int
+        1 if the neighbour is a child of the root, -1 if it is a parent.
+    root_degree : (int or None) * (int or None)
+        The required indegree and outdegree of the root, None for any degree.
+    neighbour_degree : (int or None) * (int or None)
+        The required indegree and outdegree of the neighbour.
+    multiplicity : int
+        The minimal number of edges between the root and the neighbour.
+    internal : bool
+        If True, neither the root nor the neighbour can be an input or an
+        output node.
+    """
+    def __init__(self, name, root, neighbour, action, direction=1,
+                 root_degree=(None, None), neighbour_degree=(None, None),
+                 multiplicity=1, internal=True):
+        self.name = name
+        self.root = root
+        self.neighbour = neighbour
+        self.action = action
+        self.direction = direction
+        self.root_degree = root_degree
+        self.neighbour_degree = neighbour_degree
+        self.multiplicity = multiplicity
+        self.internal = internal
+
+    def __repr__(self):
+        return f"rewrite_rule({self.name})"
+
+    def accepts(self, label, indegree, outdegree):
+        """
+        Test if a node with a given signature can be the root of a match.
+
+        Parameters
+        ----------
+        label : str
+            The label of the node.
+        indegree : int
+            The indegree of the node.
+        outdegree : int
+            The outdegree of the node.
+
+        Returns
+        -------
+        bool
+            True if the label and the degrees are the ones of the root.
+        """
+        i, o = self.root_degree
+        return (label in self.root and (i is None or i == indegree)
+                and (o is None or o == outdegree))
+
+    def match_at(self, graph, id, boundary=None):
+        """
+        Find a match of the rule whose root is a given node.
+
+        Parameters
+        ----------
+        graph : bool_circ
+            A boolean circuit.
+        id : int
+            The ID of the supposed root.
+        boundary : int set, optional
+            The IDs of the inputs and outputs of [graph], computed if not
+            given.
+
+        Returns
+        -------
+        int
+            The ID of the matching neighbour, or None if the rule does not
+            match at [id].
+        """
+        nodes = graph.get_id_node_map()
+        node = nodes.get(id)
+        if node is None or node.get_label() not in self.root or not _fits(node, self.root_degree):
+            return None
+        if self.internal:
+            if boundary is None:
+                boundary = set(graph.get_input_ids()) | set(graph.get_output_ids())
+            if id in boundary:
+                return None
+        links = node.children if self.direction == 1 else node.parents
+        for other, m in links.items():
+            if m < self.multiplicity:
+                continue
+            neighbour = nodes[other]
+            if (neighbour.get_label() in self.neighbour
+                    and _fits(neighbour, self.neighbour_degree)
+                    and not (self.internal and other in boundary)):
+                return other
+        return None
+
+
+class pattern_index:
+    """
+    An index of the nodes of a graph by label and degree signature, used to
+    find the candidate roots of a rule without scanning the whole graph.
+
+    The index is not updated when the graph is modified, call [update] with
+    the IDs of the modified nodes, as [bool_circ.apply_all_rules] does after
+    each rewrite.
+
+    Attributes
+    ----------
+    graph : bool_circ
+        The indexed graph.
+    table : str -> (int * int -> int set dict) dict
+        The IDs of the nodes with a given label, then a given indegree and
+        outdegree.
+    keys : int -> str * int * int dict
+        The label, indegree and outdegree under which each node is indexed.
+    """
+    def __init__(self, graph):
+        """
+        Build the index of a graph.
+
+        Parameters
+        ----------
+        graph : bool_circ
+            A boolean circuit.
+        """
+        self.graph = graph
+        self.table = {}
+        self.keys = {}
+        self.update(graph.get_node_ids())
+
+    def update(self, ids):
+        """
+        Index again some nodes after a modification of the graph. Removed
+        nodes are removed from the index.
+
+        Parameters
+        ----------
+        ids : int iter
+            The IDs of the modified, added or removed nodes.
+        """
+        nodes = self.graph.get_id_node_map()
+        for id in ids:
+            key = self.keys.pop(id, None)
+            if key is not None:
+                self.table[key[0]][key[1:]].discard(id)
+            node = nodes.get(id)
+            if node is not None:
+                key = (node.get_label(), node.indegree(), node.outdegree())
+                self.keys[id] = key
+                self.table.setdefault(key[0], {}).setdefault(key[1:], set()).add(id)
+
+    def candidates(self, labels, degree=(None, None)):
+        """
+        Get the nodes with one of the given labels and the given degrees.
+
+        Parameters
+        ----------
+        labels : str list
+            The allowed labels.
+        degree : (int or None) * (int or None), optional
+            The required indegree and outdegree, None for any degree.
+
+        Returns
+        -------
+        int list
+            The IDs of the nodes.
+        """
+        indegree, outdegree = degree
+        result = []
+        for label in labels:
+            for (i, o), ids in self.table.get(label, {}).items():
+                if (indegree is None or i == indegree) and (outdegree is None or o == outdegree):
+                    result.extend(ids)
+        return result
+
+    def find_matches(self, rule):
+        """
+        Find all the matches of a rule in the graph, in time proportional to
+        the number of candidate roots.
+
+        Parameters
+        ----------
+        rule : rewrite_rule
+            A rule.
+
+        Returns
+        -------
+        (int * int) list
+            The IDs of the root and of the neighbour of each match.
+        """
+        boundary = set(self.graph.get_input_ids()) | set(self.graph.get_output_ids())
+        result = []
+        for id in self.candidates(rule.root, rule.root_degree):
+            neighbour = rule.match_at(self.graph, id, boundary)
+            if neighbour is not None:
+                result.append((id, neighbour))
+        return result
@@ -0,0 +1,536 @@
+import heapq
+from modules.bool_circ import bool_circ
+
+
+def _luby(i):
+    """
+    Get the i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ...
+    """
+    k = 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        if (1 << (k - 1)) <= i < (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+        else:
+            k += 1
+
+
+class cnf:
+    """
+    A boolean formula in conjunctive normal form, with the conventions of
+    the DIMACS format: the variables are the integers from 1, the literal v
+    is the variable v and the literal -v is its negation.
+
+    Attributes
+    ----------
+    num_vars : int
+        The number of variables.
+    clauses : int list list
+        The clauses, as lists of literals.
+    """
+    def __init__(self, num_vars=0, clauses=[]):
+        """
+        Construct a formula.
+
+        Parameters
+        ----------
+        num_vars : int, optional
+            The number of variables.
+        clauses : int list list, optional
+            The clauses.
+
+        Raises
+        ------
+        ValueError
+            If a clause contains an invalid literal.
+        """
+        self.num_vars = num_vars
+        self.clauses = []
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def new_var(self):
+        """
+        Add a variable.
+
+        Returns
+        -------
+        int
+            The new variable.
+        """
+        self.num_vars += 1
+        return self.num_vars
+
+    def add_clause(self, clause):
+        """
+        Add a clause.
+
+        Parameters
+        ----------
+        clause : int list
+            The literals of the clause.
+
+        Raises
+        ------
+        ValueError
+            If a literal is 0 or its variable does not exist.
+        """
+        for lit in clause:
+            if not (isinstance(lit, int) and 0 < abs(lit) <= self.num_vars):
+                raise ValueError(f"{lit} is not a valid literal.")
+        self.clauses.append(list(clause))
+
+    def to_dimacs(self):
+        """
+        Write the formula in the DIMACS CNF format.
+
+        Returns
+        -------
+        str
+            The formula in DIMACS format.
+        """
+        lines = [f"p cnf {self.num_vars} {len(self.clauses)}"]
+        lines += [" ".join(str(lit) for lit in clause + [0]) for clause in self.clauses]
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_dimacs(cls, text):
+        """
+        Read a formula in the DIMACS CNF format.
+
+        Parameters
+        ----------
+        text : str
+            The formula in DIMACS format.
+
+        Returns
+        -------
+        cnf
+            The formula.
+
+        Raises
+        ------
+        ValueError
+            If the text is not in DIMACS format.
+        """
+        f = None
+        clause = []
+        for line in text.splitlines():
+            words = line.split()
+            if len(words) == 0 or words[0] == 'c':
+                continue
+            if words[0] == 'p':
+                if f is not None or len(words) != 4 or words[1] != 'cnf':
+                    raise ValueError(f"'{line}' is not a valid problem line.")
+                f = cls(int(words[2]))
+                continue
+            if f is None:
+                raise ValueError("The problem line is missing.")
+            for word in words:
+                lit = int(word)
+                if lit == 0:
+                    f.add_clause(clause)
+                    clause = []
+                else:
+                    clause.append(lit)
+        if f is None:
+            raise ValueError("The problem line is missing.")
+        if clause:
+            f.add_clause(clause)
+        return f
+
+    @classmethod
+    def from_bool_circ(cls, circuit):
+        """
+        Encode a circuit with the Tseitin transformation: each gate gets a
+        variable, constrained to be the value of the gate by a few clauses.
+        The copy and not nodes get the literal of their parent, or its
+        negation.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A well formed boolean circuit. The labels of the inputs are
+            ignored.
+
+        Returns
+        -------
+        cnf
+            The formula, satisfied by the assignments consistent with the
+            circuit.
+        int list
+            The literal of each input.
+        int list
+            The literal of each output.
+
+        Raises
+        ------
+        ValueError
+            If a node has a label or a number of parents which has no
+            meaning.
+        """
+        f = cls()
+        lits = {id: f.new_var() for id in circuit.get_input_ids()}
+        nodes = circuit.get_id_node_map()
+        true = []
+
+        def constant(value):
+            if not true:
+                true.append(f.new_var())
+                f.add_clause([true[0]])
+            return true[0] if value else -true[0]
+
+        for id in circuit.topological_order():
+            if id in lits:
+                continue
+            n = nodes[id]
+            label = n.get_label()
+            fanins = [lits[p] for p, k in n.parents.items() for _ in range(k)]
+            if label in bool_circ.VALUES and len(fanins) == 0:
+                lits[id] = constant(label == bool_circ.ONE)
+            elif label == bool_circ.COPY and len(fanins) == 1:
+                lits[id] = fanins[0]
+            elif label == bool_circ.NOT and len(fanins) == 1:
+                lits[id] = -fanins[0]
+            elif label in (bool_circ.AND, bool_circ.OR):
+                # An or gate is an and gate with negated fanins and output.
+                sign = 1 if label == bool_circ.AND else -1
+                if len(fanins) <= 1:
+                    lits[id] = fanins[0] if fanins else constant(sign == 1)
+                    continue
+                v = f.new_var()
+                for lit in fanins:
+                    f.add_clause([-sign * v, sign * lit])
+                f.add_clause([sign * v] + [-sign * lit for lit in fanins])
+                lits[id] = v
+            elif label == bool_circ.XOR:
+                if len(fanins) == 0:
+                    lits[id] = constant(False)
+                    continue
+                a = fanins[0]
+                for b in fanins[1:]:
+                    v = f.new_var()
+                    f.add_clause([-v, a, b])
+                    f.add_clause([-v, -a, -b])
+                    f.add_clause([v, -a, b])
+                    f.add_clause([v, a, -b])
+                    a = v
+                lits[id] = a
+            else:
+                raise ValueError(f"The node {id} with label '{label}' and "
+                                 f"{len(fanins)} parents cannot be converted.")
+
+        return (f, [lits[id] for id in circuit.get_input_ids()],
+                [lits[id] for id in circuit.get_output_ids()])
+
+
+class sat_solver:
+    """
+    A conflict-driven clause learning (CDCL) SAT solver.
+
+    The unit propagation watches two literals per clause. A conflict is
+    analysed up to its first unique implication point, the learnt clause
+    is added and the search jumps back to the second highest level of the
+    clause. The decisions follow the activity of the variables in the
+    recent conflicts (VSIDS) with their last value (phase saving), and the
+    search restarts after a number of conflicts following the Luby
+    sequence.
+
+    Attributes
+    ----------
+    num_vars : int
+        The number of variables.
+    clauses : int list list
+        The clauses of at least two literals, original and learnt. The first
+        two literals of a clause are watched.
+    conflicts : int
+        The number of conflicts met so far.
+    restarts : int
+        The number of restarts so far.
+    """
+    def __init__(self, formula, restart_base=100, decay=0.95):
+        """
+        Construct a solver for a formula.
+
+        Parameters
+        ----------
+        formula : cnf
+            The formula.
+        restart_base : int, optional
+            The number of conflicts before the first restart, multiplied by
+            the terms of the Luby sequence for the next ones.
+        decay : float, optional
+            The factor by which the activities decay at each conflict.
+        """
+        n = formula.num_vars
+        self.num_vars = n
+        self.clauses = []
+        self.watches = {lit: [] for v in range(1, n + 1) for lit in (v, -v)}
+        self.value = [0] * (n + 1)
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)
+        self.phase = [False] * (n + 1)
+        self.activity = [0.0] * (n + 1)
+        self.increment = 1.0
+        self.decay = decay
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        self.trail = []
+        self.trail_lim = []
+        self.head = 0
+        self.restart_base = restart_base
+        self.conflicts = 0
+        self.restarts = 0
+        self.units = []
+        self.empty = False
+        for clause in formula.clauses:
+            clause = list(dict.fromkeys(clause))
+            if any(-lit in clause for lit in clause):
+                continue
+            if len(clause) == 0:
+                self.empty = True
+            elif len(clause) == 1:
+                self.units.append(clause[0])
+            else:
+                self._attach(clause)
+
+    def _attach(self, clause):
+        """
+        Add a clause of at least two literals, watching the first two.
+        """
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _value(self, lit):
+        """
+        Get the value of a literal: 1 if true, -1 if false, 0 if unassigned.
+        """
+        return self.value[lit] if lit > 0 else -self.value[-lit]
+
+    def _assign(self, lit, reason):
+        """
+        Make a literal true at the current level.
+        """
+        v = abs(lit)
+        self.value[v] = 1 if lit > 0 else -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """
+        Propagate the assigned literals until a fixpoint or a conflict.
+
+        Returns
+        -------
+        int list
+            The falsified clause, or None if there is no conflict.
+        """
+        while self.head < len(self.trail):
+            false_lit = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches[false_lit]
+            kept = []
+            for k, clause in enumerate(watching):
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self._value(clause[0]) == 1:
+                    kept.append(clause)
+                    continue
+                for i in range(2, len(clause)):
+                    if self._value(clause[i]) != -1:
+                        clause[1], clause[i] = clause[i], clause[1]
+                        self.watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self._value(clause[0]) == -1:
+                        kept.extend(watching[k + 1:])
+                        self.watches[false_lit] = kept
+                        return clause
+                    self._assign(clause[0], clause)
+            self.watches[false_lit] = kept
+        return None
+
+    def _bump(self, v):
+        """
+        Increase the activity of a variable involved in a conflict.
+        """
+        self.activity[v] += self.increment
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(1, self.num_vars + 1)]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _analyze(self, conflict):
+        """
+        Learn a clause from a conflict, by resolution with the reasons of
+        the literals of the current level until only one remains.
+
+        Returns
+        -------
+        int list
+            The learnt clause, whose first literal is the negation of the
+            first unique implication point.
+        int
+            The level to jump back to.
+        """
+        seen = set()
+        learnt = [0]
+        current = len(self.trail_lim)
+        pending = 0
+        lit = 0
+        i = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                v = abs(q)
+                if q != lit and v not in seen and self.level[v] > 0:
+                    seen.add(v)
+                    self._bump(v)
+                    if self.level[v] == current:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[i]) not in seen:
+                i -= 1
+            lit = self.trail[i]
+            i -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reason[abs(lit)]
+        learnt[0] = -lit
+
+        level = 0
+        if len(learnt) > 1:
+            k = max(range(1, len(learnt)), key=lambda k: self.level[abs(learnt[k])])
+            learnt[1], learnt[k] = learnt[k], learnt[1]
+            level = self.level[abs(learnt[1])]
+        return learnt, level
+
+    def _backtrack(self, level):
+        """
+        Unassign the literals above a level, saving their values.
+        """
+        if len(self.trail_lim) <= level:
+            return
+        for lit in self.trail[self.trail_lim[level]:]:
+            v = abs(lit)
+            self.phase[v] = lit > 0
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[self.trail_lim[level]:]
+        del self.trail_lim[level:]
+        self.head = len(self.trail)
+
+    def _decide(self):
+        """
+        Get the unassigned variable with the highest activity, or None if
+        all the variables are assigned.
+        """
+        while self.heap:
+            _, v = heapq.heappop(self.heap)
+            if self.value[v] == 0:
+                return v
+        for v in range(1, self.num_vars + 1):
+            if self.value[v] == 0:
+                return v
+        return None
+
+    def solve(self):
+        """
+        Decide if the formula is satisfiable. The learnt clauses are kept
+        between calls.
+
+        Returns
+        -------
+        int list
+            A satisfying assignment, as the list of the true literals of the
+            variables from 1, or None if the formula is unsatisfiable.
+        """
+        self._backtrack(0)
+        if self.empty:
+            return None
+        for lit in self.units:
+            if self._value(lit) == -1:
+                return None
+            if self._value(lit) == 0:
+                self._assign(lit, None)
+
+        budget = self.restart_base * _luby(self.restarts + 1)
+        since_restart = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if len(self.trail_lim) == 0:
+                    self.empty = True
+                    return None
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self.units.append(learnt[0])
+                    self._assign(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._assign(learnt[0], learnt)
+                self.increment /= self.decay
+                continue
+
+            if since_restart >= budget:
+                self.restarts += 1
+                budget = self.restart_base * _luby(self.restarts + 1)
+                since_restart = 0
+                self._backtrack(0)
+                continue
+
+            v = self._decide()
+            if v is None:
+                model = [v if self.value[v] == 1 else -v
+                         for v in range(1, self.num_vars + 1)]
+                self._backtrack(0)
+                return model
+            self.trail_lim.append(len(self.trail))
+            self._assign(v if self.phase[v] else -v, None)
+
+
+def check_equivalence(a, b):
+    """
+    Decide if two circuits compute the same function, by solving the
+    Tseitin encoding of their miter.
+
+    Parameters
+    ----------
+    a : bool_circ
+        A well formed boolean circuit.
+    b : bool_circ
+        A well formed boolean circuit with as many inputs and outputs.
+
+    Returns
+    -------
+    bool
+        True if the circuits are equivalent.
+    str
+        The bits of an input vector on which the outputs differ, or None if
+        the circuits are equivalent.
+
+    Raises
+    ------
+    ValueError
+        If the circuits do not have the same number of inputs or of
+        outputs.
+    """
+    f, inputs, (output,) = cnf.from_bool_circ(a.miter(b))
+    f.add_clause([output])
+    model = sat_solver(f).solve()
+    if model is None:
+        return True, None
+    return False, "".join('1' if model[abs(lit) - 1] * lit > 0 else '0' for lit in inputs)
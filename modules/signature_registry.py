@@ -0,0 +1,101 @@
+class signature_registry:
+    """
+    A registry of boolean circuits grouped by signature (see
+    [bool_circ.signature]): the circuits of a bucket probably compute the
+    same function, and circuits of different buckets certainly do not.
+
+    Attributes
+    ----------
+    k : int
+        The number of input vectors of the signatures.
+    seed : int
+        The seed of the input vectors of the signatures.
+    buckets : int -> (object * bool_circ) list dict
+        The keys and circuits registered under each signature.
+    """
+    def __init__(self, k=64, seed=0):
+        """
+        Construct an empty registry.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of input vectors of the signatures.
+        seed : int, optional
+            The seed of the input vectors of the signatures.
+        """
+        self.k = k
+        self.seed = seed
+        self.buckets = {}
+
+    def __len__(self):
+        """
+        Get the number of registered circuits.
+        """
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def signature(self, circuit):
+        """
+        Compute the signature of a circuit with the parameters of the
+        registry.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+
+        Returns
+        -------
+        int
+            The signature of [circuit].
+        """
+        return circuit.signature(self.k, self.seed)
+
+    def add(self, circuit, key=None):
+        """
+        Register a circuit.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+        key : object, optional
+            A name of the circuit, the circuit itself by default.
+
+        Returns
+        -------
+        int
+            The signature of [circuit].
+        """
+        s = self.signature(circuit)
+        self.buckets.setdefault(s, []).append((circuit if key is None else key, circuit))
+        return s
+
+    def candidates(self, circuit):
+        """
+        Get the registered circuits which may be equivalent to a circuit:
+        the other ones are not.
+
+        Parameters
+        ----------
+        circuit : bool_circ
+            A boolean circuit.
+
+        Returns
+        -------
+        (object * bool_circ) list
+            The keys and circuits with the same signature as [circuit].
+        """
+        return list(self.buckets.get(self.signature(circuit), []))
+
+    def classes(self):
+        """
+        Get the buckets of more than one circuit, which are the ones left
+        to check formally.
+
+        Returns
+        -------
+        (object * bool_circ) list list
+            The keys and circuits of each bucket.
+        """
+        return [list(bucket) for bucket in self.buckets.values() if len(bucket) > 1]
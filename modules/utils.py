@@ -343,9 +343,330 @@ def K_map(bit_string):
     return K
 
 
+def _truth_table(bit_string):
+    """
+    Read a truth table, the bit at index i being the output for the inputs
+    whose bits, x0 being the most significant, are the binary writing of i.
+
+    Returns
+    -------
+    int
+        The number of variables.
+    int list
+        The indices of the 1s.
+    int list
+        The indices of the 0s.
+
+    Raises
+    ------
+    ValueError
+        If the length of [bit_string] is not a power of 2.
+    ValueError
+        If [bit_string] is not composed of bits.
+    """
+    for c in bit_string:
+        if c != '0' and c != '1':
+            raise ValueError(f"bit_string = {bit_string} is not entirely composed of bits.")
+    if len(bit_string) == 0 or len(bit_string) & (len(bit_string) - 1) != 0:
+        raise ValueError(f"bit_string = {bit_string} is not a power of 2.")
+    n = len(bit_string).bit_length() - 1
+    on = [i for i, c in enumerate(bit_string) if c == '1']
+    off = [i for i, c in enumerate(bit_string) if c == '0']
+    return n, on, off
+
+
+def _cube_string(n, cube):
+    """
+    Write a cube (bits, care) as a string: the j-th character is the value
+    of xj in the cube, '-' if xj does not appear.
+    """
+    bits, care = cube
+    return "".join('-' if not (care >> (n - 1 - j)) & 1
+                   else str((bits >> (n - 1 - j)) & 1) for j in range(n))
+
+
+def _cube_cost(cube):
+    """
+    Get the number of literals of a cube (bits, care).
+    """
+    return bin(cube[1]).count('1')
+
+
+def _select_cover(rows, costs, universe, limit=10000):
+    """
+    Choose rows whose union is [universe], with as few rows as possible,
+    then as few literals as possible. The essential rows are chosen first,
+    then the other ones are searched by branch and bound from a greedy
+    solution, visiting at most [limit] nodes.
+
+    Parameters
+    ----------
+    rows : int list
+        The columns covered by each row, as bitsets.
+    costs : int list
+        The cost of each row.
+    universe : int
+        The columns to cover, as a bitset.
+    limit : int, optional
+        The maximal number of nodes of the search.
+
+    Returns
+    -------
+    int list
+        The indices of the chosen rows.
+    """
+    chosen = set()
+    for col in iter_bits(universe):
+        covering = [r for r, bits in enumerate(rows) if (bits >> col) & 1]
+        if len(covering) == 1:
+            chosen.add(covering[0])
+    for r in chosen:
+        universe &= ~rows[r]
+    chosen = sorted(chosen)
+
+    greedy, left = [], universe
+    while left:
+        r = max(range(len(rows)),
+                key=lambda r: (bin(rows[r] & left).count('1'), -costs[r]))
+        greedy.append(r)
+        left &= ~rows[r]
+    best = [greedy, (len(greedy), sum(costs[r] for r in greedy))]
+    budget = [limit]
+
+    def search(left, picked, cost):
+        if left == 0:
+            if cost < best[1]:
+                best[0], best[1] = list(picked), cost
+            return
+        if budget[0] <= 0 or (cost[0] + 1, cost[1]) >= best[1]:
+            return
+        budget[0] -= 1
+        col = min(iter_bits(left),
+                  key=lambda col: sum((bits >> col) & 1 for bits in rows))
+        covering = [r for r, bits in enumerate(rows) if (bits >> col) & 1]
+        covering.sort(key=lambda r: (-bin(rows[r] & left).count('1'), costs[r]))
+        for r in covering:
+            picked.append(r)
+            search(left & ~rows[r], picked, (cost[0] + 1, cost[1] + costs[r]))
+            picked.pop()
+
+    search(universe, [], (0, 0))
+    return chosen + best[0]
+
+
+def quine_mccluskey(bit_string):
+    """
+    Compute a minimal sum of products of a truth table with the
+    Quine-McCluskey method: the prime implicants are generated by merging
+    the cubes which differ by one variable, then a minimal set of prime
+    implicants covering the 1s is chosen on a table of bitsets.
+
+    Parameters
+    ----------
+    bit_string : str
+        A truth table, the first variable being the most significant.
+
+    Returns
+    -------
+    str list
+        The cubes of the sum of products, see [cubes_to_formula].
+
+    Raises
+    ------
+    ValueError
+        If the length of [bit_string] is not a power of 2.
+    ValueError
+        If [bit_string] is not composed of bits.
+    """
+    n, on, _ = _truth_table(bit_string)
+    full = (1 << n) - 1
+    primes = []
+    current = {(m, full) for m in on}
+    while current:
+        by_care = {}
+        for bits, care in current:
+            by_care.setdefault(care, set()).add(bits)
+        merged, following = set(), set()
+        for care, group in by_care.items():
+            for bits in group:
+                for v in iter_bits(care):
+                    other = bits ^ (1 << v)
+                    if other in group:
+                        following.add((bits & ~(1 << v), care & ~(1 << v)))
+                        merged.add((bits, care))
+        primes += sorted(c for c in current if c not in merged)
+        current = following
+
+    index = {m: i for i, m in enumerate(on)}
+    rows = []
+    for bits, care in primes:
+        row, free = 0, full & ~care
+        sub = free
+        while True:
+            row |= 1 << index[bits | sub]
+            if sub == 0:
+                break
+            sub = (sub - 1) & free
+        rows.append(row)
+    chosen = _select_cover(rows, [_cube_cost(c) for c in primes], (1 << len(on)) - 1)
+    return sorted(_cube_string(n, primes[r]) for r in chosen)
+
+
+def espresso(bit_string, max_iterations=20):
+    """
+    Compute a near-minimal sum of products of a truth table with the
+    heuristic loop of Espresso: the cubes are expanded as much as the 0s
+    allow, the redundant cubes are removed, then each cube is reduced to
+    the 1s it alone covers, and again, while the cover gets smaller.
+
+    Parameters
+    ----------
+    bit_string : str
+        A truth table, the first variable being the most significant.
+    max_iterations : int, optional
+        The maximal number of reductions.
+
+    Returns
+    -------
+    str list
+        The cubes of the sum of products, see [cubes_to_formula].
+
+    Raises
+    ------
+    ValueError
+        If the length of [bit_string] is not a power of 2.
+    ValueError
+        If [bit_string] is not composed of bits.
+    """
+    n, on, off = _truth_table(bit_string)
+    full = (1 << n) - 1
+    if not off:
+        return ['-' * n]
+
+    def covered(cube):
+        bits, care = cube
+        return [m for m in on if m & care == bits]
+
+    def expand(cover):
+        result = []
+        for bits, care in sorted(cover, key=_cube_cost):
+            if any(bits & c == b for b, c in result if care & c == c):
+                continue
+            for v in iter_bits(care):
+                c, b = care & ~(1 << v), bits & ~(1 << v)
+                if all(m & c != b for m in off):
+                    bits, care = b, c
+            result.append((bits, care))
+        return result
+
+    def irredundant(cover):
+        count = {}
+        for cube in cover:
+            for m in covered(cube):
+                count[m] = count.get(m, 0) + 1
+        result = []
+        for cube in sorted(cover, key=_cube_cost, reverse=True):
+            ms = covered(cube)
+            if all(count[m] > 1 for m in ms):
+                for m in ms:
+                    count[m] -= 1
+            else:
+                result.append(cube)
+        return result
+
+    def reduce(cover):
+        count = {}
+        for cube in cover:
+            for m in covered(cube):
+                count[m] = count.get(m, 0) + 1
+        result = []
+        for cube in cover:
+            ms = covered(cube)
+            alone = [m for m in ms if count[m] == 1]
+            for m in ms:
+                count[m] -= 1
+            if alone:
+                care = full
+                for m in alone:
+                    care &= ~(m ^ alone[0])
+                cube = (alone[0] & care, care)
+                for m in covered(cube):
+                    count[m] += 1
+                result.append(cube)
+        return result
+
+    def cost(cover):
+        return (len(cover), sum(_cube_cost(c) for c in cover))
+
+    cover = irredundant(expand([(m, full) for m in on]))
+    for _ in range(max_iterations):
+        candidate = irredundant(expand(reduce(cover)))
+        if cost(candidate) >= cost(cover):
+            break
+        cover = candidate
+    return sorted(_cube_string(n, c) for c in cover)
+
+
+def sum_of_products(bit_string, exact=None):
+    """
+    Compute a minimal or near-minimal sum of products of a truth table.
+
+    Parameters
+    ----------
+    bit_string : str
+        A truth table, the first variable being the most significant.
+    exact : bool, optional
+        Use [quine_mccluskey] if True, [espresso] if False. By default, the
+        exact method is used up to 8 variables.
+
+    Returns
+    -------
+    str list
+        The cubes of the sum of products, see [cubes_to_formula].
+
+    Raises
+    ------
+    ValueError
+        If the length of [bit_string] is not a power of 2.
+    ValueError
+        If [bit_string] is not composed of bits.
+    """
+    if exact is None:
+        exact = len(bit_string) <= 2 ** 8
+    return quine_mccluskey(bit_string) if exact else espresso(bit_string)
+
+
+def cubes_to_formula(cubes):
+    """
+    Write a sum of products as a formula accepted by
+    [bool_circ.from_formula].
+
+    Parameters
+    ----------
+    cubes : str list
+        The products, where the j-th character is '1' if xj appears, '0'
+        if its negation appears, '-' if it does not appear.
+
+    Returns
+    -------
+    str
+        The formula, "(0)" for the empty sum and "(1)" for the empty
+        product.
+    """
+    terms = []
+    for cube in cubes:
+        literals = [f"(x{j})" if c == '1' else f"(~(x{j}))"
+                    for j, c in enumerate(cube) if c != '-']
+        if len(literals) == 0:
+            return "(1)"
+        terms.append(literals[0] if len(literals) == 1 else f"({'&'.join(literals)})")
+    return "|".join(terms) if terms else "(0)"
+
+
 def bit_string_to_formula(bit_string):
     """
-    Generate the formula from a bit string.
+    Generate a minimal or near-minimal sum of products formula from a bit
+    string, see [sum_of_products].
 
     Parameters
     ----------
@@ -359,10 +680,30 @@ def bit_string_to_formula(bit_string):
 
     Raises
     ------
+    ValueError
+        If the length of [bit_string] is not a power of 2.
     ValueError
         If bit_string is not composed of bit.
     """
-    raise NotImplementedError("C'est trop dur.")
+    return cubes_to_formula(sum_of_products(bit_string))
 
 
+def iter_bits(bits):
+    """
+    Iterate over the positions of the bits set in an integer used as a
+    bitset, from the lowest to the highest.
 
+    Parameters
+    ----------
+    bits : int
+        A positive integer.
+
+    Returns
+    -------
+    int iter
+        The positions of the bits set to 1.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
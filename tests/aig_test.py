@@ -0,0 +1,83 @@
+from modules.aig import aig
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class aig_test(unittest.TestCase):
+    def setUp(self):
+        self.circuits = [bool_circ.adder(1), bool_circ.decoder(),
+                         bool_circ.from_binary("1110001000111111"),
+                         bool_circ.from_formula("((x0)&((x1)&(x2)))|((x1)&(~(x2)))",
+                                                "((x0)&(~(x1)))|(x2)")]
+
+    def test_structural_hashing(self):
+        g = aig(2)
+        a, b = 2, 4
+        self.assertEqual(g.add_and(a, b), g.add_and(b, a))
+        self.assertEqual(1, g.n_ands())
+        self.assertEqual(aig.FALSE, g.add_and(a, aig.negate(a)))
+        self.assertEqual(aig.FALSE, g.add_and(a, aig.FALSE))
+        self.assertEqual(a, g.add_and(a, aig.TRUE))
+        self.assertEqual(a, g.add_and(a, a))
+        self.assertEqual(1, g.n_ands())
+        self.assertEqual(g.add_xor(a, b), g.add_xor(b, a))
+        self.assertEqual(4, g.n_ands())
+        self.assertRaises(ValueError, g.add_and, a, 100)
+
+    def test_simulate_and_levels(self):
+        g = aig(3)
+        a, b, c = 2, 4, 6
+        g.add_output(g.add_xor(g.add_and(a, b), c))
+        g.add_output(g.add_or(a, aig.negate(c)))
+        # The k-th bit of each pattern is the k-th vector.
+        a_bits, b_bits, c_bits = 0b10101010, 0b11001100, 0b11110000
+        xor, orn = g.simulate([a_bits, b_bits, c_bits], 8)
+        self.assertEqual((a_bits & b_bits) ^ c_bits, xor)
+        self.assertEqual((a_bits | ~c_bits) & 0xFF, orn)
+        self.assertEqual("11", g.evaluate("110"))
+        self.assertRaises(ValueError, g.simulate, [1, 2])
+
+        levels = g.levels()
+        self.assertEqual(0, levels[1])
+        self.assertEqual(1, levels[g.add_and(a, b) >> 1])
+        self.assertEqual(3, g.depth())
+
+    def test_from_bool_circ(self):
+        for circuit in self.circuits:
+            g = aig.from_bool_circ(circuit)
+            n = len(circuit.get_input_ids())
+            self.assertEqual(n, len(g.inputs))
+            self.assertEqual(len(circuit.get_output_ids()), len(g.outputs))
+            for k in range(2 ** n):
+                bits = format(k, f"0{n}b")
+                h = circuit.copy()
+                h.set_input_bits(bits)
+                self.assertEqual(h.evaluate(), g.evaluate(bits))
+
+    @given(st.integers(min_value=0, max_value=3), st.integers(min_value=0, max_value=2 ** 32 - 1))
+    def test_round_trip(self, i, seed):
+        circuit = self.circuits[i]
+        g = aig.from_bool_circ(circuit)
+        back = g.to_bool_circ()
+        self.assertTrue(back.is_well_formed())
+        patterns = [(seed >> k) | (seed << (k + 3)) for k in range(len(g.inputs))]
+        self.assertEqual(g.simulate(patterns, 32),
+                         aig.from_bool_circ(back).simulate(patterns, 32))
+
+    def test_to_bool_circ_constants(self):
+        g = aig(1)
+        g.add_output(aig.TRUE)
+        g.add_output(aig.FALSE)
+        g.add_output(g.add_and(2, aig.negate(2)))
+        g.add_output(aig.negate(2))
+        circuit = g.to_bool_circ()
+        self.assertTrue(circuit.is_well_formed())
+        for bits in ["0", "1"]:
+            h = circuit.copy()
+            h.set_input_bits(bits)
+            self.assertEqual(g.evaluate(bits), h.evaluate())
@@ -0,0 +1,82 @@
+from tests.strategy import random_well_formed_open_digraph_strategy
+from modules.node import node
+from modules.open_digraph import open_digraph
+import unittest
+import sys
+import os
+from hypothesis import given
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class ancestry_index_test(unittest.TestCase):
+    def setUp(self):
+        n0 = node(0, '0', {}, {3: 1})
+        n1 = node(1, '1', {}, {4: 1, 5: 1, 8: 1})
+        n2 = node(2, '2', {}, {4: 1})
+        n3 = node(3, '3', {0: 1}, {5: 1, 6: 1, 7: 1})
+        n4 = node(4, '4', {1: 1, 2: 1}, {6: 1})
+        n5 = node(5, '5', {1: 1, 3: 1}, {7: 1})
+        n6 = node(6, '6', {3: 1, 4: 1}, {8: 1, 9: 1})
+        n7 = node(7, '7', {3: 1, 5: 1}, {})
+        n8 = node(8, '8', {1: 1, 6: 1}, {})
+        n9 = node(9, '9', {6: 1}, {})
+        self.graph = open_digraph([], [], [n0, n1, n2, n3, n4, n5, n6, n7, n8, n9])
+        self.index = self.graph.build_ancestry_index()
+
+    def test_cyclic_graph(self):
+        g = open_digraph([], [], [node(0, '', {1: 1}, {1: 1}), node(1, '', {0: 1}, {0: 1})])
+        self.assertRaises(ValueError, g.build_ancestry_index)
+
+    def test_invalid_ids(self):
+        self.assertRaises(ValueError, self.index.common_ancestry, 5, 42)
+        self.assertRaises(ValueError, self.index.ancestors, 42)
+
+    def test_common_ancestry_example(self):
+        ancestry = self.index.common_ancestry(5, 8)
+        self.assertCountEqual(ancestry.keys(), [0, 3, 1])
+        self.assertEqual(ancestry[0], (2, 3))
+        self.assertEqual(ancestry[3], (1, 2))
+        self.assertEqual(ancestry[1], (1, 1))
+
+    def test_nearest_common_ancestors_example(self):
+        self.assertEqual(self.index.nearest_common_ancestors(5, 8), {3: (1, 2), 1: (1, 1)})
+        self.assertEqual(self.index.nearest_common_ancestors(7, 9), {3: (1, 2), 1: (2, 3)})
+        self.assertEqual(self.index.nearest_common_ancestors(6, 6), {6: (0, 0)})
+        self.assertEqual(self.index.nearest_common_ancestors(0, 2), {})
+
+    def test_distances_of_queried_nodes(self):
+        cache = {}
+        self.assertEqual(self.index.common_ancestry(5, 8),
+                         self.index.common_ancestry(5, 8, cache))
+        self.index.nearest_common_ancestors(7, 8, cache)
+        self.assertEqual({5, 7, 8}, set(cache))
+
+    def test_ancestors_example(self):
+        self.assertCountEqual(self.index.ancestors(6), [0, 1, 2, 3, 4])
+        self.assertTrue(self.index.is_ancestor(0, 7))
+        self.assertFalse(self.index.is_ancestor(7, 0))
+        self.assertFalse(self.index.is_ancestor(7, 7))
+
+    @given(random_well_formed_open_digraph_strategy(form='DAG'))
+    def test_common_ancestry(self, graph):
+        index = graph.build_ancestry_index()
+        ids = graph.get_node_ids()
+        pairs = [(n0, n1) for n0 in ids for n1 in ids]
+        for (n0, n1), ancestry in zip(pairs, index.common_ancestry_batch(pairs)):
+            self.assertEqual(ancestry, graph.common_ancestry(n0, n1))
+
+    @given(random_well_formed_open_digraph_strategy(form='DAG'))
+    def test_nearest_common_ancestors(self, graph):
+        index = graph.build_ancestry_index()
+        ids = graph.get_node_ids()
+        pairs = [(n0, n1) for n0 in ids for n1 in ids]
+        for (n0, n1), nearest in zip(pairs, index.nearest_common_ancestors_batch(pairs)):
+            common = index.common_ancestry(n0, n1)
+            for n in nearest:
+                self.assertIn(n, common)
+                for other in common:
+                    self.assertFalse(index.is_ancestor(n, other))
+            for n in common:
+                if n not in nearest:
+                    self.assertTrue(any(index.is_ancestor(n, other) for other in nearest))
@@ -0,0 +1,105 @@
+from modules.aig import aig
+from modules.bdd import bdd
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class bdd_test(unittest.TestCase):
+    def setUp(self):
+        self.circuits = [bool_circ.adder(1), bool_circ.decoder(),
+                         bool_circ.from_binary("1110001000111111"),
+                         bool_circ.from_formula("((x0)&((x1)&(x2)))|((x1)&(~(x2)))",
+                                                "((x0)&(~(x1)))|(x2)")]
+
+    def test_canonicity(self):
+        m = bdd(3)
+        x, y, z = m.variable(0), m.variable(1), m.variable(2)
+        self.assertEqual(m.apply_and(x, y), m.apply_and(y, x))
+        self.assertEqual(m.apply_not(m.apply_and(x, y)),
+                         m.apply_or(m.apply_not(x), m.apply_not(y)))
+        self.assertEqual(bdd.FALSE, m.apply_and(x, m.apply_not(x)))
+        self.assertEqual(bdd.TRUE, m.apply_xor(m.apply_xor(x, z), m.apply_not(m.apply_xor(z, x))))
+        self.assertEqual(x, m.ite(y, x, x))
+        self.assertRaises(ValueError, m.apply_and, x, 100)
+        self.assertRaises(ValueError, m.variable, 3)
+        self.assertRaises(ValueError, bdd, 2, None, 100)
+
+    def test_restrict_and_sat_count(self):
+        m = bdd(3)
+        x, y, z = m.variable(0), m.variable(1), m.variable(2)
+        f = m.apply_or(m.apply_and(x, y), z)
+        self.assertEqual(5, m.sat_count(f))
+        self.assertEqual(z, m.restrict(f, 0, False))
+        self.assertEqual(m.apply_or(y, z), m.restrict(f, 0, True))
+        self.assertEqual(8, m.sat_count(bdd.TRUE))
+        self.assertEqual(4, m.sat_count(y))
+        self.assertTrue(m.evaluate(f, "110"))
+        self.assertFalse(m.evaluate(f, [True, False, False]))
+
+    def test_from_bool_circ(self):
+        for circuit in self.circuits:
+            n = len(circuit.get_input_ids())
+            m, roots = bdd.from_bool_circ(circuit)
+            self.assertEqual(n, m.num_vars)
+            self.assertEqual(len(circuit.get_output_ids()), len(roots))
+            for k in range(2 ** n):
+                bits = format(k, f"0{n}b")
+                h = circuit.copy()
+                h.set_input_bits(bits)
+                expected = h.evaluate()
+                self.assertEqual(expected, "".join("1" if m.evaluate(r, bits) else "0" for r in roots))
+
+    def test_gc(self):
+        m, roots = bdd.from_bool_circ(bool_circ.adder(2))
+        m.gc()
+        self.assertEqual(0, m.gc())
+        size = len(m)
+        self.assertEqual(size, m.size(*roots))
+        m.deref(roots[0])
+        self.assertGreater(m.gc(), 0)
+        self.assertEqual(m.size(*roots[1:]), len(m))
+        # The freed nodes are reused.
+        free = len(m.free)
+        m.apply_and(m.variable(0), m.variable(1))
+        self.assertLess(len(m.free), free)
+        self.assertRaises(ValueError, m.deref, m.apply_and(m.variable(2), m.variable(3)))
+
+    def test_swap_and_sift(self):
+        # (x0 & x3) | (x1 & x4) | (x2 & x5) is exponential with the natural
+        # order and linear when the pairs are adjacent.
+        m = bdd(6)
+        f = bdd.FALSE
+        for i in range(3):
+            f = m.apply_or(f, m.apply_and(m.variable(i), m.variable(i + 3)))
+        m.ref(f)
+        m.gc()
+        table = [m.evaluate(f, format(k, "06b")) for k in range(64)]
+        before = len(m)
+        m.swap(2)
+        self.assertEqual([3, 2], m.order[2:4])
+        self.assertEqual(table, [m.evaluate(f, format(k, "06b")) for k in range(64)])
+        self.assertLess(m.sift(), before)
+        self.assertEqual(6, len(m))
+        self.assertEqual(table, [m.evaluate(f, format(k, "06b")) for k in range(64)])
+        self.assertEqual(sorted(m.order), list(range(6)))
+        m.set_order([0, 1, 2, 3, 4, 5])
+        self.assertEqual(before, len(m))
+        self.assertEqual(table, [m.evaluate(f, format(k, "06b")) for k in range(64)])
+
+    @given(st.integers(min_value=0, max_value=3), st.booleans())
+    def test_to_bool_circ(self, i, reorder):
+        circuit = self.circuits[i]
+        m, roots = bdd.from_bool_circ(circuit, reorder=reorder)
+        back = m.to_bool_circ(roots)
+        self.assertTrue(back.is_well_formed())
+        g = aig.from_bool_circ(back)
+        n = len(circuit.get_input_ids())
+        for k in range(2 ** n):
+            bits = format(k, f"0{n}b")
+            self.assertEqual("".join("1" if m.evaluate(r, bits) else "0" for r in roots),
+                             g.evaluate(bits))
@@ -1,6 +1,8 @@
 from modules.node import node
 from modules.bool_circ import bool_circ
+from modules.sat import check_equivalence
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 from hypothesis import given, strategies as st, assume
@@ -171,6 +173,66 @@ class Bool_CircTest(unittest.TestCase):
         self.assertEqual(5, len(HA2.get_output_ids()))
         self.assertTrue(HA2.is_well_formed())
 
+    def test_adder_styles(self):
+        for n in range(4):
+            ripple = bool_circ.adder(n)
+            for style in bool_circ.ADDER_STYLES:
+                A = bool_circ.adder(n, style)
+                self.assertTrue(A.is_well_formed())
+                self.assertEqual(2 ** (n + 1) + 1, len(A.get_input_ids()))
+                self.assertEqual(2 ** n + 1, len(A.get_output_ids()))
+                self.assertTrue(check_equivalence(ripple, A)[0])
+                HA = bool_circ.half_adder(n, style)
+                self.assertTrue(HA.is_well_formed())
+                self.assertEqual(2 ** (n + 1), len(HA.get_input_ids()))
+        for style in bool_circ.ADDER_STYLES[1:]:
+            self.assertLess(bool_circ.adder(3, style).depth(), bool_circ.adder(3).depth())
+        self.assertRaises(ValueError, bool_circ.adder, 1, 'carry_save')
+
+    def test_adder_of_width(self):
+        for width in [1, 3, 5, 6]:
+            for style in bool_circ.ADDER_STYLES:
+                A = bool_circ.adder_of_width(width, style)
+                self.assertTrue(A.is_well_formed())
+                self.assertEqual(2 * width + 1, len(A.get_input_ids()))
+                self.assertEqual(width + 1, len(A.get_output_ids()))
+                for a, b, c in [(0, 0, 1), (2 ** width - 1, 1, 0), (5 % 2 ** width, 2 ** width - 1, 1)]:
+                    g = A.copy()
+                    g.set_input_bits(format(a, f"0{width}b") + format(b, f"0{width}b") + str(c))
+                    self.assertEqual(a + b + c, int(g.evaluate(), 2))
+                HA = bool_circ.half_adder_of_width(width, style)
+                self.assertTrue(HA.is_well_formed())
+                self.assertEqual(2 * width, len(HA.get_input_ids()))
+        self.assertRaises(ValueError, bool_circ.adder_of_width, 0)
+        self.assertRaises(ValueError, bool_circ.half_adder, -1)
+
+    def test_multiplier(self):
+        for width in [1, 2, 3, 5]:
+            for style in bool_circ.MULTIPLIER_STYLES:
+                M = bool_circ.multiplier(width, style)
+                self.assertTrue(M.is_well_formed())
+                self.assertEqual(2 * width, len(M.get_input_ids()))
+                self.assertEqual(2 * width, len(M.get_output_ids()))
+                for a, b in [(0, 0), (1, 2 ** width - 1), (2 ** width - 1, 2 ** width - 1),
+                             (5 % 2 ** width, 3 % 2 ** width)]:
+                    g = M.copy()
+                    g.set_input_bits(format(a, f"0{width}b") + format(b, f"0{width}b"))
+                    self.assertEqual(a * b, int(g.evaluate(), 2))
+        array = bool_circ.multiplier(8, 'array').depth()
+        for style in ['wallace', 'dadda']:
+            self.assertLess(bool_circ.multiplier(8, style).depth(), array * 2 // 3)
+        self.assertRaises(ValueError, bool_circ.multiplier, 0)
+        self.assertRaises(ValueError, bool_circ.multiplier, 2, 'booth')
+
+    def test_replicate(self):
+        A = bool_circ.adder(1)
+        g = A.replicate(3)
+        self.assertTrue(g.is_well_formed())
+        self.assertEqual(15, len(g.get_input_ids()))
+        self.assertEqual(9, len(g.get_output_ids()))
+        g.set_input_bits("01101" + "11111" + "00001")
+        self.assertEqual("100" + "111" + "001", g.evaluate())
+
     def test_register(self):
         g = bool_circ.register(8, 11)
 
@@ -371,12 +433,391 @@ class Bool_CircTest(unittest.TestCase):
         self.assertEqual(enc_eval, ENC.evaluate())
         self.assertNotEqual(bit_string, DEC.evaluate())
 
+    def test_hamming_generators(self):
+        self.assertEqual((True, None), check_equivalence(bool_circ.hamming_encoder(3),
+                                                         bool_circ.encoder()))
+        self.assertEqual((True, None), check_equivalence(bool_circ.hamming_decoder(3),
+                                                         bool_circ.decoder()))
+        self.assertRaises(ValueError, bool_circ.hamming_encoder, 1)
+        self.assertRaises(ValueError, bool_circ.hamming_decoder, 1)
+
+    @given(st.integers(min_value=2, max_value=6), st.data())
+    def test_hamming_generators_one_error(self, r, data):
+        k, n = 2 ** r - r - 1, 2 ** r - 1
+        ENC = bool_circ.hamming_encoder(r)
+        DEC = bool_circ.hamming_decoder(r)
+        self.assertTrue(ENC.is_well_formed())
+        self.assertTrue(DEC.is_well_formed())
+        self.assertLessEqual(ENC.depth(), 2 * r + 3)
+        self.assertLessEqual(DEC.depth(), 4 * r)
+        bit_string = data.draw(st.text(alphabet=['0', '1'], min_size=k, max_size=k))
+        err = data.draw(st.integers(min_value=0, max_value=n))
+        ENC.set_input_bits(bit_string)
+        code = ENC.evaluate()
+        if err < n:
+            code = code[:err] + ("0" if code[err] == '1' else "1") + code[err+1:]
+        DEC.set_input_bits(code)
+        self.assertEqual(bit_string, DEC.evaluate())
+
     @given(st.integers(min_value=0, max_value=100),
            st.integers(min_value=0, max_value=100))
     def test_add(self, a, b):
         c = a + b
         res, overflow, bits = bool_circ.add(a, b)
-        if overflow:
-            self.assertEqual(res, c % bits)
-        else:
-            self.assertEqual(c, res)
+        self.assertEqual(max(a.bit_length(), b.bit_length(), 1), bits)
+        self.assertEqual(c >= 2 ** bits, overflow)
+        self.assertEqual(c % 2 ** bits, res)
+
+    @given(st.integers(min_value=0, max_value=100),
+           st.integers(min_value=0, max_value=100),
+           st.sampled_from(bool_circ.ADDER_STYLES))
+    def test_add_styles(self, a, b, style):
+        self.assertEqual(bool_circ.add(a, b), bool_circ.add(a, b, style))
+
+    @given(st.integers(min_value=0, max_value=100),
+           st.integers(min_value=0, max_value=100),
+           st.sampled_from(bool_circ.MULTIPLIER_STYLES))
+    def test_mul(self, a, b, style):
+        res, bits = bool_circ.mul(a, b, style)
+        self.assertEqual(2 * max(a.bit_length(), b.bit_length(), 1), bits)
+        self.assertEqual(a * b, res)
+
+    def test_operations_reuse_bindings(self):
+        self.assertEqual((12, False, 4), bool_circ.add(9, 3))
+        binding = bool_circ._binding(bool_circ.half_adder_of_width, 4, 'ripple')
+        self.assertEqual((5, True, 4), bool_circ.add(9, 12))
+        self.assertIs(binding, bool_circ._binding(bool_circ.half_adder_of_width, 4, 'ripple'))
+        self.assertEqual((108, 8), bool_circ.mul(9, 12))
+        binding = bool_circ._binding(bool_circ.multiplier, 4, 'array')
+        self.assertEqual((39, 8), bool_circ.mul(13, 3))
+        self.assertIs(binding, bool_circ._binding(bool_circ.multiplier, 4, 'array'))
+        # The cache is bounded.
+        for a in range(1, 40):
+            self.assertEqual((2 ** a - 1, False, a), bool_circ.add(2 ** a - 1, 0))
+        self.assertLessEqual(bool_circ._binding.cache_info().currsize, 32)
+
+    def test_operations_in_threads(self):
+        def work(k):
+            return [bool_circ.add(a, k) for a in range(32, 64)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(work, range(32, 64)))
+        for k, sums in zip(range(32, 64), results):
+            self.assertEqual([((a + k) % 64, True, 6) for a in range(32, 64)], sums)
+
+    @given(st.lists(st.tuples(st.integers(min_value=0, max_value=2 ** 12),
+                              st.integers(min_value=0, max_value=2 ** 12)), max_size=20),
+           st.sampled_from(bool_circ.MULTIPLIER_STYLES))
+    def test_mul_batch(self, pairs, style):
+        self.assertEqual([a * b for a, b in pairs], bool_circ.mul_batch(pairs, style))
+
+    def assertSameFunction(self, circuit, rewritten):
+        self.assertEqual(len(circuit.get_input_ids()), len(rewritten.get_input_ids()))
+        self.assertEqual(len(circuit.get_output_ids()), len(rewritten.get_output_ids()))
+        self.assertEqual((True, None), check_equivalence(circuit, rewritten))
+
+    def test_pattern_index(self):
+        g = bool_circ.from_formula("((x0)^(x1))^((x0)^(x2))")
+        index = g.build_pattern_index()
+        matches = index.find_matches(bool_circ.ASSO_XOR)
+        self.assertEqual(2, len(matches))
+        for root, child in matches:
+            self.assertEqual('^', g.get_node_by_id(root).get_label())
+            self.assertIn(child, g.get_node_by_id(root).get_children_ids())
+        self.assertEqual([], index.find_matches(bool_circ.INVO_NO))
+
+        root, child = matches[0]
+        self.assertTrue(g.trans_asso_xor(root))
+        index.update([root, child])
+        self.assertEqual(1, len(index.find_matches(bool_circ.ASSO_XOR)))
+        self.assertNotIn(root, index.candidates(['^']))
+
+    def test_pattern_index_follows_rewrites(self):
+        g = bool_circ.encoder().compose(bool_circ.decoder())
+        rules = bool_circ.TRANSFORM_RULES + bool_circ.REWRITE_RULES
+        index = g.build_pattern_index()
+        ids = [id for rule in rules for id, _ in index.find_matches(rule)]
+        self.assertGreater(g._rewrite_fixpoint(rules, ids, index), 0)
+        self.assertEqual(g.build_pattern_index().keys, index.keys)
+        self.assertEqual([], [m for rule in rules for m in index.find_matches(rule)])
+
+    def test_trans_asso_xor(self):
+        g = bool_circ.from_formula("((x0)^(x1))^(x2)")
+        xors = [n.get_id() for n in g.get_nodes() if n.get_label() == '^']
+        self.assertFalse(g.trans_asso_xor(g.get_output_ids()[0]))
+        self.assertTrue(any(g.trans_asso_xor(id) for id in xors))
+        self.assertEqual(1, len([n for n in g.get_nodes() if n.get_label() == '^']))
+        self.assertTrue(g.is_well_formed())
+
+    def test_trans_invo_xor_and_effacement(self):
+        # x ^ x ^ x, the copy node having three edges to the xor node.
+        g = bool_circ.empty()
+        copy = g.add_node('')
+        xor = g.add_node('^')
+        for _ in range(3):
+            g.add_edge(copy, xor)
+        g.add_output_node(xor)
+        input = g.add_input_node(copy)
+        self.assertTrue(g.trans_invo_xor(copy))
+        self.assertEqual(1, g.get_node_by_id(copy).outdegree())
+        self.assertFalse(g.trans_invo_xor(copy))
+        self.assertTrue(g.is_well_formed())
+
+        # A not node whose output is erased.
+        g = bool_circ.empty()
+        no = g.add_node('~')
+        eraser = g.add_node('', [no])
+        input = g.add_input_node(no)
+        self.assertFalse(g.trans_effacement(no))
+        self.assertTrue(g.trans_effacement(eraser))
+        self.assertEqual(2, len(g.get_node_ids()))
+        child = g.get_node_by_id(g.get_node_by_id(input).get_children_ids()[0])
+        self.assertEqual('', child.get_label())
+        self.assertEqual(0, child.outdegree())
+        self.assertTrue(g.is_well_formed())
+
+    def test_trans_no(self):
+        g = bool_circ.from_formula("(~(~(x0)))&(x1)")
+        nots = [n.get_id() for n in g.get_nodes() if n.get_label() == '~']
+        self.assertTrue(g.trans_invo_no(nots[0]) or g.trans_invo_no(nots[1]))
+        self.assertEqual([], [n for n in g.get_nodes() if n.get_label() == '~'])
+        self.assertTrue(g.is_well_formed())
+
+        g = bool_circ.from_formula("(~(x0))^(~(x1))")
+        nots = [n.get_id() for n in g.get_nodes() if n.get_label() == '~']
+        self.assertTrue(g.trans_no_travers_xor(nots[0]))
+        self.assertTrue(g.is_well_formed())
+        self.assertEqual(2, g.rewrite(g.get_node_ids()))
+        self.assertEqual([], [n for n in g.get_nodes() if n.get_label() == '~'])
+
+    def test_rewrite_preserves_function(self):
+        for circuit in [bool_circ.from_formula("((x0)^(x1))^((x0)^(x2))",
+                                               "(~(x0))&((x1)|(~(x2)))"),
+                        bool_circ.adder(1),
+                        bool_circ.encoder().compose(bool_circ.decoder()),
+                        # The inputs whose uses are all erased are kept.
+                        bool_circ.from_formula("(x2)", "((~((x0)^(x2)))^(x0))"),
+                        bool_circ.from_formula("((x0)^(x1))^(x1)")]:
+            rewritten = circuit.copy()
+            rewritten.apply_all_rules()
+            self.assertTrue(rewritten.is_well_formed())
+            self.assertLessEqual(len(rewritten.get_node_ids()), len(circuit.get_node_ids()))
+            self.assertSameFunction(circuit, rewritten)
+            self.assertEqual(0, rewritten.apply_all_rules())
+
+    def test_from_binary_truth_table(self):
+        bit_string = "1110001000111111"
+        for strash in [False, True]:
+            g = bool_circ.from_binary(bit_string, strash)
+            self.assertTrue(g.is_well_formed())
+            for i in range(16):
+                h = g.copy()
+                h.set_input_bits(format(i, "04b"))
+                self.assertEqual(bit_string[i], h.evaluate())
+        self.assertLess(len(bool_circ.from_binary(bit_string, True).get_node_ids()),
+                        len(bool_circ.from_binary(bit_string).get_node_ids()))
+
+    def test_strash_add_node(self):
+        g = bool_circ.empty()
+        g.set_strash(True)
+        x0, x1 = g.add_node(), g.add_node()
+        g.add_input_node(x0)
+        g.add_input_node(x1)
+        a = g.add_node('&', [x0, x1])
+        self.assertEqual(a, g.add_node('&', [x1, x0]))
+        o = g.add_node('|', [x1, x0])
+        self.assertNotEqual(a, o)
+        g.add_output_node(o)
+        g.add_output_node(a)
+
+        # The second gate is reached through a copy node inserted after the
+        # first one.
+        b = g.add_node('&', [x1, x0])
+        self.assertEqual('', g.get_node_by_id(b).get_label())
+        self.assertEqual([b], g.get_node_by_id(a).get_children_ids())
+        g.add_output_node(b)
+        self.assertEqual(b, g.add_node('&', [x0, x1]))
+        self.assertTrue(g.is_well_formed())
+
+        g.set_strash(False)
+        self.assertNotEqual(b, g.add_node('&', [x0, x1]))
+
+    def test_set_strash(self):
+        formulas = ["((x0)&(x1))|(~((x1)&(x0)))", "(x1)&(x0)"]
+        g = bool_circ.from_formula(*formulas)
+        h = g.copy()
+        self.assertEqual(2, h.set_strash(True))
+        self.assertTrue(h.is_well_formed())
+        self.assertLess(len(h.get_node_ids()), len(g.get_node_ids()))
+        self.assertEqual(0, h.copy().set_strash(True))
+        self.assertTrue(h.copy().strash)
+        self.assertEqual(len(h.get_node_ids()),
+                         len(bool_circ.from_formula(*formulas, strash=True).get_node_ids()))
+        for i in range(4):
+            g0, h0 = g.copy(), h.copy()
+            g0.set_input_bits(format(i, "02b"))
+            h0.set_input_bits(format(i, "02b"))
+            self.assertEqual(g0.evaluate(), h0.evaluate())
+
+    def test_sweep_constants(self):
+        adder = bool_circ.adder(1)
+        a, b, c = adder.get_input_ids()[:2], adder.get_input_ids()[2:4], adder.get_input_ids()[4]
+        g = adder.copy()
+        for id, bit in zip(a + [c], "100"):
+            g.get_node_by_id(id).set_label(bit)
+        removed = g.sweep()
+        self.assertGreater(removed, 0)
+        self.assertTrue(g.is_well_formed())
+        self.assertEqual(b, g.get_input_ids())
+        for k in range(4):
+            bits = format(k, "02b")
+            h = g.copy()
+            h.set_input_bits(bits)
+            full = adder.copy()
+            full.set_input_bits("10" + bits + "0")
+            self.assertEqual(full.evaluate(), h.evaluate())
+
+    def test_sweep_dead_logic(self):
+        g = bool_circ.from_formula("(x0)&(x1)")
+        x0 = g.get_input_ids()[0]
+        # A chain of gates whose result is never used.
+        id = g.get_node_by_id(x0).get_children_ids()[0]
+        for _ in range(50):
+            id = g.add_node('~', [id])
+        self.assertEqual(50, g.copy().sweep())
+        g.clean_up()
+        self.assertEqual(len(bool_circ.from_formula("(x0)&(x1)").get_node_ids()),
+                         len(g.get_node_ids()))
+
+        g.get_node_by_id(x0).set_label('0')
+        self.assertEqual(len(g.get_node_ids()) - 3, g.sweep())
+        self.assertEqual("0", g.evaluate())
+        # The other input is not used anymore, but stays an input.
+        self.assertEqual(1, len(g.get_input_ids()))
+        self.assertTrue(g.is_well_formed())
+
+    def test_miter(self):
+        def run(circuit, bits):
+            g = circuit.copy()
+            g.set_input_bits(bits)
+            return g.evaluate()
+
+        a = bool_circ.from_formula("((x0)&(x1))|((x0)&(x2))", "(x1)^(x2)")
+        b = bool_circ.from_formula("(x0)&((x1)|(x2))", "(x2)^(x1)")
+        miter = a.miter(b)
+        self.assertTrue(miter.is_well_formed())
+        self.assertEqual(3, len(miter.get_input_ids()))
+        self.assertEqual(1, len(miter.get_output_ids()))
+        c = bool_circ.from_formula("(x0)|(x1)", "(x1)^(x2)")
+        for k in range(8):
+            bits = format(k, "03b")
+            self.assertEqual("0", run(miter, bits))
+            expected = run(a, bits) != run(c, bits)
+            self.assertEqual("1" if expected else "0", run(a.miter(c), bits))
+        self.assertRaises(ValueError, a.miter, bool_circ.from_formula("(x0)|(x1)"))
+
+    def test_simulate_and_signature(self):
+        circuit = bool_circ.from_formula("((x0)&(x1))^(x2)", "(x0)|(~(x2))")
+        a, b, c = 0b10101010, 0b11001100, 0b11110000
+        self.assertEqual([(a & b) ^ c, (a | ~c) & 0xFF], circuit.simulate([a, b, c], 8))
+        self.assertRaises(ValueError, circuit.simulate, [a, b], 8)
+
+        rewritten = circuit.copy()
+        rewritten.apply_all_rules()
+        self.assertEqual(circuit.signature(), rewritten.signature())
+        self.assertEqual(circuit.signature(128, 7), rewritten.signature(128, 7))
+        self.assertNotEqual(circuit.signature(), circuit.signature(seed=1))
+        other = bool_circ.from_formula("((x0)&(x1))^(x2)", "(x0)|(x2)")
+        self.assertNotEqual(circuit.signature(), other.signature())
+        self.assertLess(circuit.signature(), 2 ** 64)
+
+    def test_from_binary_minimize(self):
+        for bit_string in ["1110001000111111", "0110100110010110", "0001011101111111",
+                           "00000000", "11111111", "10"]:
+            g = bool_circ.from_binary(bit_string, minimize=True)
+            self.assertTrue(g.is_well_formed())
+            n = len(g.get_input_ids())
+            self.assertEqual(len(bit_string), 2 ** n)
+            for i, c in enumerate(bit_string):
+                h = g.copy()
+                h.set_input_bits(format(i, f"0{n}b"))
+                self.assertEqual(c, h.evaluate())
+        self.assertLess(len(bool_circ.from_binary("0001011101111111", minimize=True).get_node_ids()),
+                        len(bool_circ.from_binary("0001011101111111").get_node_ids()))
+
+    def test_from_formula_variable_order(self):
+        g = bool_circ.from_formula("(x10)&(~(x2))")
+        # x2 comes before x10.
+        g.set_input_bits("01")
+        self.assertEqual("1", g.evaluate())
+        g.set_input_bits("10")
+        self.assertEqual("0", g.evaluate())
+
+    @given(st.integers(min_value=0, max_value=5).flatmap(
+        lambda n: st.text(alphabet="01", min_size=2 ** n, max_size=2 ** n)))
+    def test_from_binary_mux(self, bit_string):
+        g = bool_circ.from_binary_mux(bit_string)
+        self.assertTrue(g.is_well_formed())
+        n = len(g.get_input_ids())
+        self.assertEqual(len(bit_string), 2 ** n)
+        patterns = [int("".join(format(i, f"0{n}b")[j] for i in range(2 ** n)), 2)
+                    for j in range(n)]
+        self.assertEqual([int(bit_string, 2)], g.simulate(patterns, 2 ** n))
+
+    def test_from_binary_mux_sharing(self):
+        parity = "".join(str(bin(i).count('1') % 2) for i in range(2 ** 8))
+        # One xor gate per variable, the sub-tables being shared.
+        g = bool_circ.from_binary_mux(parity)
+        self.assertEqual(7, len([n for n in g.get_nodes() if n.get_label() == '^']))
+        self.assertLess(len(g.get_node_ids()), len(bool_circ.from_binary(parity).get_node_ids()))
+        self.assertRaises(ValueError, bool_circ.from_binary_mux, "011")
+
+    def test_balance(self):
+        formula = "(x0)&(x1)"
+        for k in range(2, 16):
+            formula = f"({formula})&(x{k})"
+        g = bool_circ.from_formula(formula, "((((x0)^(x1))^(x2))^(x3))^((x4)|((x5)|(x6)))")
+        h = g.copy()
+        before, after = h.balance()
+        self.assertEqual(g.depth(), before)
+        self.assertEqual(h.depth(), after)
+        self.assertLess(after, before)
+        self.assertTrue(h.is_well_formed())
+        self.assertTrue(all(n.indegree() <= 2 for n in h.get_nodes()))
+        patterns = [0x5A5A5A5A, 0x33CC33CC, 0x0F0F00FF, 0xFFFF0000] * 4
+        self.assertEqual(g.simulate(patterns, 32), h.simulate(patterns, 32))
+
+        # Repeated leaves are merged or cancelled.
+        g = bool_circ.from_formula("((x0)^(x1))^((x0)&((x1)&(x0)))")
+        h = g.copy()
+        h.balance(3)
+        self.assertTrue(h.is_well_formed())
+        self.assertSameFunction(g, h)
+        self.assertRaises(ValueError, h.balance, 1)
+
+    def test_split_regions(self):
+        g = bool_circ.parallel([bool_circ.adder(1), bool_circ.adder(2), bool_circ.decoder()])
+        regions = g.split_regions(2)
+        self.assertEqual(2, len(regions))
+        self.assertEqual(sorted(g.get_node_ids()),
+                         sorted(id for r in regions for id in r.get_node_ids()))
+        for r in regions:
+            self.assertTrue(r.is_well_formed())
+            self.assertEqual([id for id in g.get_input_ids() if id in r.get_id_node_map()],
+                             r.get_input_ids())
+        self.assertEqual(1, len(bool_circ.adder(1).split_regions(4)))
+
+    def test_apply_all_rules_parallel(self):
+        g = bool_circ.parallel([bool_circ.from_formula("((~(x0))^(~(x1)))&((x1)^(x1))"),
+                                bool_circ.adder(2), bool_circ.adder(1),
+                                bool_circ.from_formula("(~(~(x0)))|((x1)^(x2))")])
+        sequential, parallel = g.copy(), g.copy()
+        self.assertEqual(sequential.apply_all_rules(), parallel.apply_all_rules(workers=2))
+        self.assertEqual(len(sequential.get_node_ids()), len(parallel.get_node_ids()))
+        self.assertTrue(parallel.is_well_formed())
+        self.assertTrue(all(id == n.get_id() for id, n in parallel.get_id_node_map().items()))
+        self.assertGreaterEqual(parallel.next_id, max(parallel.get_node_ids()) + 1)
+        patterns = [0x5A5A, 0x33CC, 0x0F0F, 0xFF00] * 5
+        patterns = patterns[:len(g.get_input_ids())]
+        self.assertEqual(sequential.simulate(patterns, 16), parallel.simulate(patterns, 16))
+        self.assertEqual(g.simulate(patterns, 16), parallel.simulate(patterns, 16))
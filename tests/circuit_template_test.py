@@ -0,0 +1,48 @@
+from modules.circuit_template import circuit_template
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class circuit_template_test(unittest.TestCase):
+    def setUp(self):
+        self.circuit = bool_circ.from_formula("((x0)&(x1))|((x0)^(x2))", "(x1)&(x2)")
+        self.template = circuit_template(self.circuit)
+
+    def test_compile(self):
+        ids = sorted(self.circuit.get_node_ids())
+        self.assertEqual(len(ids), len(self.template))
+        self.assertEqual([self.circuit.get_node_by_id(id).get_label() for id in ids],
+                         self.template.labels)
+        self.assertEqual([ids.index(id) for id in self.circuit.get_input_ids()],
+                         self.template.inputs)
+
+    def test_stamp(self):
+        g = bool_circ.empty()
+        a = g.add_node('')
+        inputs, outputs = self.template.stamp(g)
+        self.assertEqual(set(range(a + 1, a + 1 + len(self.template))),
+                         set(g.get_node_ids()) - {a})
+        self.assertEqual(g.next_id, max(g.get_node_ids()) + 1)
+        inputs, outputs = self.template.stamp(g, 100)
+        self.assertLessEqual(100, min(inputs + outputs))
+        self.assertEqual(len(self.template) + 100, g.next_id)
+        self.assertRaises(ValueError, self.template.stamp, g, 99)
+        # The stamped copies are isomorphic to the circuit.
+        g.set_input_ids(inputs)
+        g.set_output_ids(outputs)
+        g.remove_nodes_by_id([id for id in g.get_node_ids() if id < 100])
+        self.assertTrue(g.is_isomorphic(self.circuit))
+
+    def test_replicate(self):
+        g = self.template.replicate(3)
+        self.assertIsInstance(g, bool_circ)
+        self.assertEqual(9, len(g.get_input_ids()))
+        self.assertEqual(6, len(g.get_output_ids()))
+        self.assertTrue(g.is_well_formed())
+        self.assertTrue(g.is_isomorphic(bool_circ.parallel([self.circuit.copy() for _ in range(3)])))
+        self.assertEqual(0, len(self.template.replicate(0).get_node_ids()))
+        self.assertRaises(ValueError, self.template.replicate, -1)
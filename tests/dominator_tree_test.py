@@ -0,0 +1,82 @@
+from tests.strategy import random_well_formed_open_digraph_strategy
+from modules.node import node
+from modules.open_digraph import open_digraph
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+def reachable(graph, post, removed=None):
+    """
+    Nodes reachable from the virtual root without going through [removed].
+    """
+    if post:
+        entries = graph.get_output_ids() + [n.get_id() for n in graph.get_nodes() if n.get_children_ids() == []]
+    else:
+        entries = graph.get_input_ids() + [n.get_id() for n in graph.get_nodes() if n.get_parent_ids() == []]
+    seen = set()
+    stack = [e for e in entries if e != removed]
+    while stack:
+        v = stack.pop()
+        if v in seen:
+            continue
+        seen.add(v)
+        n = graph.get_node_by_id(v)
+        for w in (n.get_parent_ids() if post else n.get_children_ids()):
+            if w != removed:
+                stack.append(w)
+    return seen
+
+
+class dominator_tree_test(unittest.TestCase):
+    def setUp(self):
+        # 0 -> 1 -> {2, 3} -> 4 -> 5
+        self.graph = open_digraph([0], [5], [node(0, '', {}, {1: 1}),
+                                             node(1, '', {0: 1}, {2: 1, 3: 1}),
+                                             node(2, '', {1: 1}, {4: 1}),
+                                             node(3, '', {1: 1}, {4: 1}),
+                                             node(4, '', {2: 1, 3: 1}, {5: 1}),
+                                             node(5, '', {4: 1}, {})])
+
+    def test_dominator_tree_example(self):
+        tree = self.graph.build_dominator_tree()
+        self.assertIsNone(tree.immediate_dominator(0))
+        self.assertEqual(tree.immediate_dominator(4), 1)
+        self.assertEqual(tree.immediate_dominator(2), 1)
+        self.assertEqual(tree.dominators(5), [5, 4, 1, 0])
+        self.assertTrue(tree.dominates(1, 4))
+        self.assertFalse(tree.dominates(2, 4))
+        self.assertCountEqual(tree.dominated(1), [2, 3, 4])
+        self.assertRaises(ValueError, tree.immediate_dominator, 42)
+
+    def test_post_dominator_tree_example(self):
+        tree = self.graph.build_dominator_tree(post=True)
+        self.assertIsNone(tree.immediate_dominator(5))
+        self.assertEqual(tree.immediate_dominator(1), 4)
+        self.assertEqual(tree.immediate_dominator(3), 4)
+        self.assertTrue(tree.dominates(4, 0))
+        self.assertFalse(tree.dominates(3, 1))
+
+    @given(random_well_formed_open_digraph_strategy(), st.booleans())
+    def test_dominator_tree(self, graph, post):
+        tree = graph.build_dominator_tree(post)
+        reach = reachable(graph, post)
+        self.assertCountEqual(tree.idom.keys(), reach)
+        for foo in reach:
+            without_foo = reachable(graph, post, removed=foo)
+            for bar in reach:
+                self.assertEqual(tree.dominates(foo, bar), foo == bar or bar not in without_foo)
+
+    def test_fanout_free_regions(self):
+        regions = self.graph.fanout_free_regions()
+        self.assertEqual(regions, {0: 1, 1: 1, 2: 5, 3: 5, 4: 5, 5: 5})
+        A0 = bool_circ.adder(0)
+        regions = A0.fanout_free_regions()
+        for id, r in regions.items():
+            self.assertNotEqual(A0.get_node_by_id(r).outdegree(), 1)
+            if A0.get_node_by_id(id).outdegree() == 1:
+                self.assertEqual(regions[A0.get_node_by_id(id).get_children_ids()[0]], r)
@@ -0,0 +1,62 @@
+from modules.hamming_codec import hamming_codec, benchmark
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st, assume
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class hamming_codec_test(unittest.TestCase):
+    def test_encode(self):
+        codec = hamming_codec()
+        codes = codec.encode(b"\x1e")
+        for nibble, code in zip(["0001", "1110"], codes):
+            g = bool_circ.encoder()
+            g.set_input_bits(nibble)
+            self.assertEqual(g.evaluate(), format(code, "07b"))
+        self.assertEqual(b"", codec.encode(b""))
+
+    @given(st.binary(max_size=64), st.integers(min_value=1, max_value=8), st.data())
+    def test_round_trip(self, data, chunk_size, draw):
+        codec = hamming_codec(chunk_size)
+        codes = bytearray(codec.encode(memoryview(data)))
+        self.assertEqual(2 * len(data), len(codes))
+        errors = draw.draw(st.lists(st.booleans(), min_size=len(codes), max_size=len(codes)))
+        for i, error in enumerate(errors):
+            if error:
+                codes[i] ^= 1 << draw.draw(st.integers(min_value=0, max_value=6))
+        self.assertEqual(data, codec.decode(codes))
+        self.assertEqual(sum(errors), codec.corrected)
+
+    @given(st.binary(max_size=64), st.lists(st.integers(min_value=0, max_value=128)))
+    def test_streams(self, data, cuts):
+        codec = hamming_codec(3)
+        codes = b"".join(codec.encode_stream([data[:len(data) // 2], data[len(data) // 2:]]))
+        self.assertEqual(codec.encode(data), codes)
+        cuts = sorted(c for c in cuts if c <= len(codes))
+        chunks = [codes[i:j] for i, j in zip([0] + cuts, cuts + [len(codes)])]
+        self.assertEqual(data, b"".join(codec.decode_stream(chunks)))
+        self.assertEqual(0, codec.corrected)
+
+    @given(st.integers(min_value=0, max_value=6), st.integers(min_value=0, max_value=6))
+    def test_two_errors(self, i, j):
+        # Two errors are miscorrected, and counted as a corrected error.
+        assume(i != j)
+        codec = hamming_codec()
+        codes = bytearray(codec.encode(b"\x1e"))
+        codes[0] ^= (1 << i) | (1 << j)
+        self.assertNotEqual(0x1e, codec.decode(codes)[0])
+        self.assertEqual(1, codec.corrected)
+
+    def test_errors(self):
+        codec = hamming_codec()
+        self.assertRaises(ValueError, codec.decode, b"\x00")
+        self.assertRaises(ValueError, list, codec.decode_stream([b"\x00", b"\x00\x00"]))
+        self.assertRaises(ValueError, hamming_codec, 0)
+
+    def test_benchmark(self):
+        encoding, decoding = benchmark(1 << 10, 1 << 8)
+        self.assertGreater(encoding, 0)
+        self.assertGreater(decoding, 0)
@@ -0,0 +1,106 @@
+from modules.hierarchical_circuit import hierarchical_circuit
+from modules.bool_circ import bool_circ
+from collections import Counter
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+def longest_path(g):
+    """
+    Get the number of nodes of the longest path of a circuit.
+    """
+    length = {}
+    for id in g.topological_order():
+        parents = g.get_node_by_id(id).get_parent_ids()
+        length[id] = max((length[p] for p in parents), default=0) + 1
+    return max(length.values(), default=0)
+
+
+class hierarchical_circuit_test(unittest.TestCase):
+    def setUp(self):
+        self.gates = hierarchical_circuit.leaf(
+            bool_circ.from_formula("(x0)&(x1)", "(x0)^(x1)"), "gates")
+        self.netlist = hierarchical_circuit(3, "netlist")
+        first = self.netlist.instantiate(self.gates, [self.netlist.input(0),
+                                                      self.netlist.input(1)])
+        second = self.netlist.instantiate(self.gates, [first[1], self.netlist.input(2)])
+        self.netlist.set_outputs([second[0], first[0], second[1], self.netlist.input(2)])
+
+    def test_evaluate(self):
+        for x in range(8):
+            bits = format(x, "03b")
+            x0, x1, x2 = (int(b) for b in bits)
+            expected = [(x0 ^ x1) & x2, x0 & x1, x0 ^ x1 ^ x2, x2]
+            self.assertEqual("".join(map(str, expected)), self.netlist.evaluate(bits))
+        self.assertEqual([0b1100, 0b0010, 0b0000, 0b1100],
+                         self.netlist.simulate([0b1010, 0b0110, 0b1100], 4))
+
+    def test_flatten(self):
+        g = self.netlist.flatten()
+        self.assertTrue(g.is_well_formed())
+        self.assertEqual(longest_path(g), self.netlist.depth())
+        self.assertEqual(self.netlist.gate_counts(),
+                         dict(Counter(n.get_label() for n in g.get_nodes())))
+        for x in range(8):
+            bits = format(x, "03b")
+            h = g.copy()
+            h.set_input_bits(bits)
+            self.assertEqual(self.netlist.evaluate(bits), h.evaluate())
+
+    def test_errors(self):
+        self.assertRaises(ValueError, hierarchical_circuit, -1)
+        self.assertRaises(ValueError, self.netlist.input, 3)
+        self.assertRaises(ValueError, self.netlist.instantiate, self.gates, [(-1, 0)])
+        self.assertRaises(ValueError, self.netlist.instantiate, self.gates, [(-1, 0), (2, 0)])
+        self.assertRaises(ValueError, self.netlist.set_outputs, [(1, 2)])
+        self.assertRaises(ValueError, self.gates.instantiate, self.gates, [(-1, 0), (-1, 1)])
+        self.assertRaises(ValueError, self.netlist.simulate, [0, 0], 1)
+        self.assertRaises(ValueError, hierarchical_circuit.adder, -1)
+
+    def test_boundaries(self):
+        # Inputs read several times or passed through, and outputs which
+        # are read or repeated, need nodes of their own.
+        m = hierarchical_circuit(2, "boundaries")
+        first = m.instantiate(self.netlist, [m.input(0), m.input(0), m.input(1)])
+        second = m.instantiate(self.gates, [first[1], first[3]])
+        m.set_outputs([first[1], second[0], first[3], m.input(1), second[1], second[1]])
+        g = m.flatten()
+        self.assertTrue(g.is_well_formed())
+        self.assertTrue(all(g.get_node_by_id(id).outdegree() == 0 for id in g.get_output_ids()))
+        self.assertEqual(longest_path(g), m.depth())
+        self.assertEqual(m.gate_counts(), dict(Counter(n.get_label() for n in g.get_nodes())))
+        for x in range(4):
+            bits = format(x, "02b")
+            h = g.copy()
+            h.set_input_bits(bits)
+            self.assertEqual(m.evaluate(bits), h.evaluate())
+
+    def test_adder(self):
+        for n in range(4):
+            h = hierarchical_circuit.adder(n)
+            self.assertEqual(n + 1, len(h.modules()))
+            g = h.flatten()
+            flat = bool_circ.adder(n)
+            self.assertTrue(g.is_well_formed())
+            self.assertTrue(g.is_isomorphic(flat))
+            self.assertEqual(longest_path(flat), h.depth())
+            self.assertEqual(dict(Counter(n.get_label() for n in flat.get_nodes())),
+                             h.gate_counts())
+        # Without flattening: the 1024-bit adder has 1024 full adders.
+        h = hierarchical_circuit.adder(10)
+        self.assertEqual(5122, h.depth())
+        self.assertEqual({'': 9216, '^': 2048, '&': 2048, '|': 1024}, h.gate_counts())
+
+    @given(st.integers(min_value=0, max_value=2 ** 1024 - 1),
+           st.integers(min_value=0, max_value=2 ** 1024 - 1),
+           st.integers(min_value=0, max_value=1))
+    def test_adder_1024(self, a, b, c):
+        h = hierarchical_circuit.adder(10)
+        self.assertEqual(11, len(h.modules()))
+        self.assertEqual(20, sum(len(m.instances) for m in h.modules()))
+        bits = format(a, "01024b") + format(b, "01024b") + str(c)
+        self.assertEqual(format(a + b + c, "01025b"), h.evaluate(bits))
@@ -0,0 +1,79 @@
+from modules.input_binding import input_binding
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class input_binding_test(unittest.TestCase):
+    def test_partial_evaluation(self):
+        g = bool_circ.from_formula("((x0)&(x1))|(x2)", "(x0)^(x1)", "~(x3)")
+        nodes = {id: (n.get_label(), dict(n.parents), dict(n.children))
+                 for id, n in g.get_id_node_map().items()}
+        b = g.bind("0", 0)
+        self.assertEqual([1, 2, 3], b.free_inputs())
+        self.assertEqual([None, None, None], b.output_values())
+        b.bind("1", 2)
+        self.assertEqual([1, None, None], b.output_values())
+        b.bind([1, 1], 0)
+        self.assertEqual([1, 0, None], b.output_values())
+        self.assertEqual("100", b.evaluate("1"))
+        self.assertEqual("101", b.evaluate("0"))
+        b.unbind(1, 2)
+        self.assertEqual([1, 3], b.free_inputs())
+        self.assertEqual("110", b.evaluate("01"))
+        # The circuit is not modified.
+        self.assertEqual(nodes, {id: (n.get_label(), dict(n.parents), dict(n.children))
+                                 for id, n in g.get_id_node_map().items()})
+        self.assertRaises(ValueError, b.evaluate, "1")
+        self.assertRaises(ValueError, b.bind, "2")
+        self.assertRaises(ValueError, b.bind, "11", 3)
+        self.assertRaises(ValueError, b.bind_integer, 4, 0, 2)
+
+    @given(st.integers(min_value=0, max_value=255), st.integers(min_value=0, max_value=255),
+           st.sampled_from(bool_circ.ADDER_STYLES))
+    def test_rebinding(self, a, b, style):
+        HA = bool_circ.half_adder_of_width(8, style)
+        binding = input_binding(HA).bind_integer(255 - a, 0, 8).bind_integer(b, 8, 8)
+        binding.bind_integer(a, 0, 8)
+        self.assertEqual(a + b, int(binding.evaluate(), 2))
+        binding.unbind(8)
+        self.assertEqual(a + 255, int(binding.evaluate("11111111"), 2))
+        # Three vectors at once: the k-th bit of each pattern is the bit of
+        # the k-th value.
+        values = [0, 1, 255 - b]
+        patterns = [sum(((v >> (7 - i)) & 1) << k for k, v in enumerate(values))
+                    for i in range(8)]
+        words = binding.simulate(patterns, 3)
+        self.assertEqual([a + v for v in values],
+                         [int("".join(str((w >> k) & 1) for w in words), 2)
+                          for k in range(3)])
+
+    @given(st.lists(st.tuples(st.integers(min_value=0, max_value=255),
+                              st.integers(min_value=0, max_value=255)), min_size=1, max_size=5))
+    def test_any_topological_order(self, pairs):
+        # The inputs are not the first nodes of a depth-first topological
+        # order: the propagation must not rely on it.
+        g = bool_circ.half_adder_of_width(8)
+        binding = input_binding(g)
+        nodes = g.get_id_node_map()
+        indegree = {id: n.indegree() for id, n in nodes.items()}
+        stack = list(g.get_input_ids())
+        stack += [id for id, d in indegree.items() if d == 0 and id not in stack]
+        order = []
+        while stack:
+            id = stack.pop()
+            order.append(id)
+            for child in nodes[id].children:
+                indegree[child] -= nodes[child].parents[id]
+                if indegree[child] == 0:
+                    stack.append(child)
+        self.assertNotEqual(set(g.get_input_ids()), set(order[:len(g.get_input_ids())]))
+        binding.order = order
+        binding.position = {id: i for i, id in enumerate(order)}
+        for a, b in pairs:
+            binding.bind_integer(a, 0, 8).bind_integer(b, 8, 8)
+            self.assertEqual(format(a + b, "09b"), binding.evaluate())
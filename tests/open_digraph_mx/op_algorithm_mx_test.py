@@ -130,6 +130,19 @@ class op_algorithm_mx_test(unittest.TestCase):
                     for child in node_children:
                         self.assertTrue(find_descendants(child, i, toposort))
 
+    @given(random_well_formed_open_digraph_strategy(form='DAG'))
+    def test_topological_order(self, graph):
+        order = graph.topological_order()
+        self.assertCountEqual(order, graph.get_node_ids())
+        position = {id: i for i, id in enumerate(order)}
+        for id in order:
+            for child in graph.get_node_by_id(id).get_children_ids():
+                self.assertLess(position[id], position[child])
+
+    def test_topological_order_cyclic(self):
+        graph = open_digraph([], [], [node(0, '', {1: 1}, {1: 1}), node(1, '', {0: 1}, {0: 1})])
+        self.assertRaises(ValueError, graph.topological_order)
+
     def test_topological_sort_example(self):
         topology = self.graph.topological_sort()
         self.assertCountEqual(topology[0], [0, 1, 2])
@@ -1,5 +1,6 @@
 from tests.strategy import random_well_formed_open_digraph_strategy
 from modules.open_digraph import open_digraph
+from modules.node import node
 import unittest
 import sys
 import os
@@ -63,3 +64,62 @@ class op_compositions_mx_test(unittest.TestCase):
             self.assertEqual(len(new.get_id_node_map()), nodes1 + nodes2 - outputs1)
         else:
             self.assertRaises(ValueError, graph.compose, g)
+
+    @given(random_well_formed_open_digraph_strategy(), random_well_formed_open_digraph_strategy())
+    def test_compositions_keep_graphs(self, graph, g):
+        # The IDs of the graph are kept, and g is neither modified nor
+        # shared, so it can be added several times.
+        nodes = {id: (n.get_label(), dict(n.parents), dict(n.children))
+                 for id, n in g.get_id_node_map().items()}
+        ids = set(graph.get_node_ids())
+        new = graph.copy()
+        new.iparallel([g, g])
+        self.assertTrue(ids <= set(new.get_node_ids()))
+        self.assertTrue(all(id == n.get_id() for id, n in new.get_id_node_map().items()))
+        self.assertTrue(all(id < new.next_id for id in new.get_node_ids()))
+        self.assertTrue(new.is_isomorphic(open_digraph.parallel([graph, g.copy(), g.copy()])))
+        if len(g.get_input_ids()) == len(g.get_output_ids()):
+            new = g.copy()
+            new.icompose(g)
+            new.icompose(g)
+            self.assertTrue(new.is_well_formed())
+            self.assertEqual(3 * len(nodes) - 2 * len(g.get_output_ids()), len(new.get_node_ids()))
+        self.assertEqual(nodes, {id: (n.get_label(), dict(n.parents), dict(n.children))
+                                 for id, n in g.get_id_node_map().items()})
+
+    @given(random_well_formed_open_digraph_strategy())
+    def test_compositions_with_itself(self, g):
+        # A graph added to itself is added as it was before the call.
+        new = g.copy()
+        new.iparallel([new, new])
+        self.assertEqual(3 * len(g.get_input_ids()), len(new.get_input_ids()))
+        self.assertEqual(3 * len(g.get_output_ids()), len(new.get_output_ids()))
+        self.assertTrue(new.is_isomorphic(open_digraph.parallel([g, g, g])))
+        if len(g.get_input_ids()) == len(g.get_output_ids()):
+            new = g.copy()
+            new.icompose(new)
+            self.assertTrue(new.is_well_formed())
+            self.assertTrue(new.is_isomorphic(g.compose(g)))
+
+    def test_compositions_after_set_nodes(self):
+        def graph():
+            g = open_digraph.empty()
+            g.set_nodes([node(4, 'i', {}, {5: 1}), node(5, 'a', {4: 1}, {6: 1}),
+                         node(6, 'o', {5: 1}, {})])
+            g.set_input_ids([4])
+            g.set_output_ids([6])
+            return g
+
+        g = graph()
+        self.assertEqual(7, g.next_id)
+        g.iparallel([graph()])
+        self.assertEqual(6, len(g.get_node_ids()))
+        self.assertEqual(['i', 'a', 'o'], [g.get_node_by_id(id).get_label() for id in [4, 5, 6]])
+        self.assertTrue(g.is_well_formed())
+        g = graph()
+        g.icompose(graph())
+        self.assertEqual(5, len(g.get_node_ids()))
+        self.assertEqual(['i', 'a'], [g.get_node_by_id(id).get_label() for id in [4, 5]])
+        self.assertTrue(g.is_well_formed())
+        g.set_nodes([])
+        self.assertEqual(0, g.next_id)
@@ -43,3 +43,27 @@ class op_connected_components_mx_test(unittest.TestCase):
         self.assertEqual(len(graph.get_id_node_map()), len(graph2.get_id_node_map()))
         self.assertEqual(len(graph.get_input_ids()), len(graph2.get_input_ids()))
         self.assertEqual(len(graph.get_output_ids()), len(graph2.get_output_ids()))
+
+    @given(random_well_formed_open_digraph_strategy())
+    def test_strongly_connected_components_open_digraph(self, graph):
+        n, d = graph.strongly_connected_components()
+        self.assertCountEqual(d.keys(), graph.get_node_ids())
+        self.assertEqual(len(set(d.values())), n)
+        reach = {id: graph.dijkstra(id, direction=1)[0] for id in graph.get_node_ids()}
+        for foo in graph.get_node_ids():
+            for bar in graph.get_node_ids():
+                same = bar in reach[foo] and foo in reach[bar]
+                self.assertEqual(same, d[foo] == d[bar])
+            for child in graph.get_node_by_id(foo).get_children_ids():
+                self.assertLessEqual(d[foo], d[child])
+        self.assertEqual(sum(graph.strongly_connected_component_sizes()), len(graph.get_node_ids()))
+
+    def test_strongly_connected_components_long_cycle_open_digraph(self):
+        graph = open_digraph.empty()
+        ids = [graph.add_node() for _ in range(20000)]
+        for src, tgt in zip(ids, ids[1:] + ids[:1]):
+            graph.add_edge(src, tgt)
+        n, _ = graph.strongly_connected_components()
+        self.assertEqual(n, 1)
+        self.assertEqual(graph.strongly_connected_component_sizes(), [20000])
+        self.assertTrue(graph.is_cyclic())
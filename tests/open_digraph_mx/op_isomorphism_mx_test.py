@@ -0,0 +1,115 @@
+from tests.strategy import random_well_formed_open_digraph_strategy
+from modules.node import node
+from modules.open_digraph import open_digraph
+from modules.bool_circ import bool_circ
+import unittest
+from unittest import mock
+import sys
+import os
+from random import Random
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+def relabel(graph, seed):
+    """
+    Copy a graph, giving random new IDs to its nodes.
+    """
+    ids = graph.get_node_ids()
+    new_ids = list(range(100, 100 + 2 * len(ids)))
+    Random(seed).shuffle(new_ids)
+    perm = dict(zip(ids, new_ids))
+    nodes = [node(perm[n.get_id()], n.get_label(),
+                  {perm[p]: m for p, m in n.parents.items()},
+                  {perm[c]: m for c, m in n.children.items()})
+             for n in graph.get_nodes()]
+    Random(seed).shuffle(nodes)
+    return open_digraph([perm[i] for i in graph.get_input_ids()],
+                        [perm[o] for o in graph.get_output_ids()], nodes), perm
+
+
+class op_isomorphism_mx_test(unittest.TestCase):
+    def setUp(self):
+        # A cycle 0 -> 1 -> 2 -> 0 and a cycle 3 -> 4 -> 3, with the same labels.
+        self.cyclic = open_digraph([], [], [node(0, 'a', {2: 1}, {1: 1}),
+                                            node(1, 'a', {0: 1}, {2: 1}),
+                                            node(2, 'a', {1: 1}, {0: 1}),
+                                            node(3, 'a', {4: 1}, {4: 1}),
+                                            node(4, 'a', {3: 1}, {3: 1})])
+
+    @given(random_well_formed_open_digraph_strategy(), st.integers())
+    def test_relabelled_graphs_are_isomorphic(self, graph, seed):
+        other, _ = relabel(graph, seed)
+        self.assertEqual(graph.canonical_hash(), other.canonical_hash())
+        mapping = graph.isomorphism(other)
+        self.assertIsNotNone(mapping)
+        self.assertEqual(sorted(mapping.values()), sorted(other.get_node_ids()))
+        for id, n in graph.get_id_node_map().items():
+            image = other.get_node_by_id(mapping[id])
+            self.assertEqual(n.get_label(), image.get_label())
+            self.assertEqual({mapping[c]: m for c, m in n.children.items()}, image.children)
+        self.assertEqual([mapping[i] for i in graph.get_input_ids()], other.get_input_ids())
+        self.assertEqual([mapping[o] for o in graph.get_output_ids()], other.get_output_ids())
+
+    def test_cyclic_graphs(self):
+        other, _ = relabel(self.cyclic, 3)
+        self.assertTrue(self.cyclic.is_isomorphic(other))
+        self.assertEqual(self.cyclic.canonical_hash(), other.canonical_hash())
+
+        # Five nodes on a single cycle are not two cycles, although every node
+        # has the same label and degrees: the hashes collide, the matcher
+        # tells them apart.
+        ring = open_digraph([], [], [node(i, 'a', {(i - 1) % 5: 1}, {(i + 1) % 5: 1})
+                                     for i in range(5)])
+        self.assertFalse(self.cyclic.is_isomorphic(ring))
+        self.assertEqual(self.cyclic.canonical_hash(), ring.canonical_hash())
+
+    def test_labels_and_multiplicities(self):
+        graph = open_digraph([0], [3], [node(0, '', {}, {1: 1}),
+                                        node(1, '&', {0: 1}, {2: 2}),
+                                        node(2, '|', {1: 2}, {3: 1}),
+                                        node(3, '', {2: 1}, {})])
+        other = graph.copy()
+        self.assertTrue(graph.is_isomorphic(other))
+        other.get_node_by_id(2).set_label('^')
+        self.assertFalse(graph.is_isomorphic(other))
+        other = graph.copy()
+        other.remove_parallel_edges((1, 2))
+        other.add_edge(1, 2)
+        self.assertFalse(graph.is_isomorphic(other))
+
+    def test_self_loops(self):
+        def graph(loop):
+            return open_digraph([], [], [node(0, 'a', {0: loop, 1: 1}, {0: loop, 1: 1}),
+                                         node(1, 'a', {0: 1, 1: 1}, {0: 1, 1: 1})])
+
+        self.assertTrue(graph(2).is_isomorphic(graph(2)))
+        self.assertFalse(graph(2).is_isomorphic(graph(1)))
+        # The matcher itself compares the loops, even if the colors do not
+        # tell the nodes apart.
+        uniform = lambda g: {id: 0 for id in g.get_node_ids()}
+        with mock.patch.object(open_digraph, 'structural_colors', uniform):
+            self.assertFalse(graph(2).is_isomorphic(graph(1)))
+
+    def test_order_of_inputs_and_outputs(self):
+        circuit = bool_circ.from_formula('(x0)&(~(x1))')
+        other = circuit.copy()
+        other.set_input_ids(list(reversed(other.get_input_ids())))
+        self.assertFalse(circuit.is_isomorphic(other))
+        self.assertNotEqual(circuit.canonical_hash(), other.canonical_hash())
+        other.set_input_ids(list(reversed(other.get_input_ids())))
+        self.assertTrue(circuit.is_isomorphic(other))
+
+    def test_symmetric_graphs(self):
+        # Many interchangeable nodes: the matcher must not get lost.
+        nodes = [node(0, '', {}, {i: 1 for i in range(1, 31)})]
+        nodes += [node(i, 'x', {0: 1}, {31: 1}) for i in range(1, 31)]
+        nodes += [node(31, '', {i: 1 for i in range(1, 31)}, {})]
+        graph = open_digraph([], [], nodes)
+        other, _ = relabel(graph, 0)
+        self.assertTrue(graph.is_isomorphic(other))
+
+
+if __name__ == '__main__':  # the following code is called only when
+    unittest.main()         # precisely this file is run
@@ -128,6 +128,35 @@ class Open_DigraphTest(unittest.TestCase):
     def test_DAGs_are_acyclic_open_digraph(self, graph):
         self.assertFalse(graph.is_cyclic())
 
+    @given(random_well_formed_open_digraph_strategy())
+    def test_condensation_open_digraph(self, graph):
+        condensation, d = graph.condensation()
+        n, _ = graph.strongly_connected_components()
+        self.assertEqual(len(condensation.get_node_ids()), n)
+        self.assertFalse(condensation.is_cyclic())
+        self.assertTrue(condensation.is_well_formed())
+        for id in graph.get_node_ids():
+            node = graph.get_node_by_id(id)
+            for child in node.get_children_ids():
+                if d[id] != d[child]:
+                    self.assertIn(d[child], condensation.get_node_by_id(d[id]).get_children_ids())
+
+    def test_condensation_example_open_digraph(self):
+        graph = open_digraph([], [], [node(0, 'a', {2: 1, 4: 2}, {1: 1}),
+                                      node(1, 'b', {0: 1}, {2: 1}),
+                                      node(2, 'c', {1: 1}, {0: 1, 3: 1}),
+                                      node(3, 'd', {2: 1}, {}),
+                                      node(4, 'e', {}, {0: 2})])
+        condensation, d = graph.condensation()
+        self.assertEqual(len(condensation.get_node_ids()), 3)
+        self.assertEqual(d[0], d[1])
+        self.assertEqual(d[0], d[2])
+        self.assertEqual(condensation.get_node_by_id(d[0]).get_label(), '')
+        self.assertEqual(condensation.get_node_by_id(d[4]).get_label(), 'e')
+        self.assertEqual(condensation.get_node_by_id(d[4]).get_child_multiplicity(d[0]), 2)
+        self.assertEqual(condensation.get_node_by_id(d[3]).get_parent_multiplicity(d[0]), 1)
+        self.assertEqual(graph.strongly_connected_component_sizes()[d[0]], 3)
+
     @given(open_digraph_strategy(), st.integers())
     def test_shift_indices_open_digraph(self, graph, n):
         original = graph.copy()
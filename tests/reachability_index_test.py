@@ -0,0 +1,56 @@
+from tests.strategy import random_well_formed_open_digraph_strategy
+from modules.node import node
+from modules.open_digraph import open_digraph
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class reachability_index_test(unittest.TestCase):
+    def assertIndexEqual(self, graph, index):
+        for foo in graph.get_node_ids():
+            dist, _ = graph.dijkstra(foo, direction=1)
+            self.assertCountEqual(index.descendants(foo), [n for n in dist if n != foo])
+            dist, _ = graph.dijkstra(foo, direction=-1)
+            self.assertCountEqual(index.ancestors(foo), [n for n in dist if n != foo])
+            for bar in graph.get_node_ids():
+                self.assertEqual(index.reaches(foo, bar), bar in index.descendants(foo) or foo == bar)
+
+    @given(random_well_formed_open_digraph_strategy(form='DAG'))
+    def test_reachability_index(self, graph):
+        self.assertIndexEqual(graph, graph.build_reachability_index())
+
+    @given(random_well_formed_open_digraph_strategy(form='DAG', inputs=False, outputs=False),
+           st.lists(st.tuples(st.integers(min_value=0, max_value=20), st.integers(min_value=0, max_value=20))))
+    def test_add_edge(self, graph, edges):
+        index = graph.build_reachability_index()
+        for src, tgt in edges:
+            if src in graph.get_node_ids() and tgt in graph.get_node_ids():
+                if index.reaches(tgt, src):
+                    self.assertRaises(ValueError, index.add_edge, src, tgt)
+                else:
+                    index.add_edge(src, tgt)
+            else:
+                self.assertRaises(ValueError, index.add_edge, src, tgt)
+        self.assertFalse(graph.is_cyclic())
+        self.assertIndexEqual(graph, index)
+
+    def test_add_node(self):
+        graph = open_digraph([], [], [node(0, '', {}, {1: 1}), node(1, '', {0: 1}, {})])
+        index = graph.build_reachability_index()
+        self.assertRaises(ValueError, index.add_node, '', [1], [0])
+        id = index.add_node('', [1], [])
+        index.add_node('', [0], [id])
+        self.assertIndexEqual(graph, index)
+
+    def test_dependency_matrix(self):
+        M = bool_circ.encoder().dependency_matrix()
+        self.assertEqual(M, [[1, 1, 1, 0, 0, 0, 0],
+                             [1, 0, 0, 1, 1, 0, 0],
+                             [0, 1, 0, 1, 0, 1, 0],
+                             [1, 1, 0, 1, 0, 0, 1]])
+        self.assertEqual(bool_circ.adder(0).dependency_matrix(), [[1, 1]] * 3)
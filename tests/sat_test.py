@@ -0,0 +1,124 @@
+from modules.sat import cnf, sat_solver, check_equivalence
+from modules.bdd import bdd
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+from itertools import product
+from hypothesis import given, strategies as st
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+def satisfies(formula, model):
+    true = set(model)
+    return all(any(lit in true for lit in clause) for clause in formula.clauses)
+
+
+def brute_force(formula):
+    for values in product([1, -1], repeat=formula.num_vars):
+        model = [v * s for v, s in zip(range(1, formula.num_vars + 1), values)]
+        if satisfies(formula, model):
+            return True
+    return False
+
+
+class sat_test(unittest.TestCase):
+    def test_dimacs(self):
+        f = cnf(3, [[1, -2], [2, 3, -1], [-3]])
+        text = f.to_dimacs()
+        self.assertEqual("p cnf 3 3\n1 -2 0\n2 3 -1 0\n-3 0\n", text)
+        g = cnf.from_dimacs("c a comment\n" + text)
+        self.assertEqual(f.num_vars, g.num_vars)
+        self.assertEqual(f.clauses, g.clauses)
+        self.assertRaises(ValueError, cnf.from_dimacs, "1 2 0\n")
+        self.assertRaises(ValueError, cnf, 2, [[1, 3]])
+
+    def test_pigeonhole(self):
+        # 5 pigeons in 4 holes: the variable 4 * i + j + 1 puts the pigeon i
+        # in the hole j.
+        pigeons, holes = 5, 4
+        f = cnf(pigeons * holes)
+        for i in range(pigeons):
+            f.add_clause([holes * i + j + 1 for j in range(holes)])
+        for j in range(holes):
+            for i in range(pigeons):
+                for k in range(i + 1, pigeons):
+                    f.add_clause([-(holes * i + j + 1), -(holes * k + j + 1)])
+        self.assertIsNone(sat_solver(f, restart_base=4).solve())
+        f.clauses = [c for c in f.clauses if len(c) == 2 or c[0] != 1]
+        model = sat_solver(f).solve()
+        self.assertTrue(satisfies(f, model))
+
+    @given(st.lists(st.lists(st.integers(min_value=1, max_value=8).flatmap(
+                lambda v: st.sampled_from([v, -v])), min_size=1, max_size=3),
+            max_size=40))
+    def test_random_formulas(self, clauses):
+        f = cnf(8, clauses)
+        solver = sat_solver(f, restart_base=2)
+        model = solver.solve()
+        self.assertEqual(brute_force(f), model is not None)
+        if model is not None:
+            self.assertTrue(satisfies(f, model))
+            self.assertTrue(satisfies(f, solver.solve()))
+
+    def test_tseitin(self):
+        circuit = bool_circ.from_formula("((x0)&(~(x1)))|((x1)^(x2))", "(x0)&((x1)&(x2))")
+        f, inputs, outputs = cnf.from_bool_circ(circuit)
+        for k in range(8):
+            bits = format(k, "03b")
+            g = cnf(f.num_vars, f.clauses)
+            for lit, bit in zip(inputs, bits):
+                g.add_clause([lit if bit == '1' else -lit])
+            model = sat_solver(g).solve()
+            h = circuit.copy()
+            h.set_input_bits(bits)
+            self.assertEqual(h.evaluate(),
+                             "".join('1' if lit in model else '0' for lit in outputs))
+
+    def test_check_equivalence(self):
+        adder = bool_circ.adder(2)
+        rewritten = adder.copy()
+        rewritten.apply_all_rules()
+        self.assertEqual((True, None), check_equivalence(adder, rewritten))
+
+        a = bool_circ.from_formula("((x0)&(x1))|((x0)&(x2))")
+        b = bool_circ.from_formula("(x0)&((x1)|(x2))")
+        self.assertEqual((True, None), check_equivalence(a, b))
+        c = bool_circ.from_formula("(x0)&((x1)^(x2))")
+        equivalent, bits = check_equivalence(a, c)
+        self.assertFalse(equivalent)
+        self.assertEqual("111", bits)
+        self.assertRaises(ValueError, check_equivalence, a, adder)
+
+    def test_check_equivalence_constants(self):
+        # Outputs folded to a constant have no parents.
+        a = bool_circ.from_formula("(1)|(x0)")
+        a.sweep()
+        b = bool_circ.from_formula("(0)&(x0)")
+        b.sweep()
+        self.assertFalse(check_equivalence(a, b)[0])
+        self.assertEqual((True, None), check_equivalence(a, bool_circ.from_formula("(x0)|(~(x0))")))
+
+        formulas = ["((x0)&(0))|(1)", "(1)^(x0)"]
+        g = bool_circ.from_formula(*formulas)
+        g.apply_all_rules()
+        self.assertEqual((True, None), check_equivalence(g, g.copy()))
+        self.assertEqual((True, None), check_equivalence(g, bool_circ.from_formula(*formulas)))
+        equivalent, bits = check_equivalence(g, bool_circ.from_formula("(0)&(x0)", "(1)^(x0)"))
+        self.assertFalse(equivalent)
+        self.assertIn(bits, ["0", "1"])
+
+    def test_check_equivalence_restructured(self):
+        # Beyond exhaustive evaluation: 17 inputs, against the multiplexers
+        # of its BDD.
+        adder = bool_circ.adder(3)
+        m, roots = bdd.from_bool_circ(adder)
+        self.assertEqual((True, None), check_equivalence(adder, m.to_bool_circ(roots)))
+        equivalent, bits = check_equivalence(adder, m.to_bool_circ(roots[:-1] + roots[:1]))
+        self.assertFalse(equivalent)
+        h = adder.copy()
+        h.set_input_bits(bits)
+        g = m.to_bool_circ(roots[:-1] + roots[:1])
+        g.set_input_bits(bits)
+        self.assertNotEqual(h.evaluate(), g.evaluate())
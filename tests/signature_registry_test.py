@@ -0,0 +1,26 @@
+from modules.signature_registry import signature_registry
+from modules.bool_circ import bool_circ
+import unittest
+import sys
+import os
+root = os.path.normpath(os.path.join(__file__, './../..'))
+sys.path.append(root)  # allows us to fetch files from the project root
+
+
+class signature_registry_test(unittest.TestCase):
+    def test_buckets(self):
+        registry = signature_registry()
+        formulas = ["((x0)&(x1))|((x0)&(x2))", "(x0)&((x1)|(x2))",
+                    "(x0)&((x2)|(x1))", "(x0)|((x1)&(x2))", "(x0)^(x1)"]
+        for i, formula in enumerate(formulas):
+            registry.add(bool_circ.from_formula(formula), i)
+        registry.add(bool_circ.from_binary("01101001"), "parity")
+        self.assertEqual(6, len(registry))
+        self.assertEqual(4, len(registry.buckets))
+        self.assertEqual([[0, 1, 2]], [[key for key, _ in bucket]
+                                       for bucket in registry.classes()])
+
+        keys = [key for key, _ in registry.candidates(bool_circ.from_formula("((x2)|(x1))&(x0)"))]
+        self.assertEqual([0, 1, 2], keys)
+        self.assertEqual([], registry.candidates(bool_circ.from_formula("(x0)&(x1)")))
+        self.assertEqual("parity", registry.candidates(bool_circ.from_formula("((x0)^(x1))^(x2)"))[0][0])
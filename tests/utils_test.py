@@ -118,12 +118,36 @@ class UtilsTest(unittest.TestCase):
         T1_KARNAUGH = [[1, 1, 0, 1], [0, 0, 0, 1], [1, 1, 1, 1], [0, 0, 1, 1]]
         self.assertListEqual(M1, T1_KARNAUGH)
 
-    @unittest.skip("bit_string_to_formula utility function is not implemented.")
     def test_bit_string_to_formula_open_digraph(self):
-        self.assertRaises(ValueError, K_map, "1234")
-        self.assertEqual("(x0&x2)",  bit_string_to_formula("1100"))
+        self.assertRaises(ValueError, bit_string_to_formula, "1234")
+        self.assertRaises(ValueError, bit_string_to_formula, "110")
+        self.assertEqual("(~(x0))", bit_string_to_formula("1100"))
+        self.assertEqual("((x0)&(x1))", bit_string_to_formula("0001"))
+        self.assertEqual("(0)", bit_string_to_formula("0000"))
+        self.assertEqual("(1)", bit_string_to_formula("1111"))
 
         OP1 = "1110001000111111"
         F1 = bit_string_to_formula(OP1)
-        F1_EXACT = "(x0&x2)|(x2&~x3)|(x0&x1)|(~x0&~x1&~x2)"
+        F1_EXACT = "((x2)&(~(x3)))|((~(x0))&(~(x1))&(~(x2)))|((x0)&(x2))|((x0)&(x1))"
         self.assertEqual(F1, F1_EXACT)
+
+    def test_quine_mccluskey_minimal(self):
+        # The cover of the odd parity needs all its minterms.
+        self.assertEqual(["001", "010", "100", "111"], quine_mccluskey("01101001"))
+        # The cyclic function has two minimal covers of 3 cubes, among 6
+        # primes none of which is essential.
+        self.assertEqual(3, len(quine_mccluskey("01111110")))
+        self.assertEqual([], quine_mccluskey("00"))
+
+    @given(st.integers(min_value=0, max_value=5).flatmap(
+        lambda n: st.text(alphabet="01", min_size=2 ** n, max_size=2 ** n)))
+    def test_sum_of_products(self, bit_string):
+        n = len(bit_string).bit_length() - 1
+        exact, heuristic = quine_mccluskey(bit_string), espresso(bit_string)
+        for cubes in (exact, heuristic):
+            for i, c in enumerate(bit_string):
+                bits = format(i, f"0{n}b") if n > 0 else ""
+                value = any(all(x == '-' or x == b for x, b in zip(cube, bits))
+                            for cube in cubes)
+                self.assertEqual(c == '1', value)
+        self.assertLessEqual(len(exact), len(heuristic))